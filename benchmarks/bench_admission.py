@@ -0,0 +1,122 @@
+"""
+Gradio queue latency under a login flood, with and without the admission middleware.
+
+A small app serves a protected queue route (`/gradio/gradio_api/queue/join`, 5 ms of waiting and 1 ms
+of synchronous work, standing in for a Gradio event) and `POST /login` (10 ms of waiting for the
+password pool and 5 ms of synchronous work, standing in for form parsing, the rate limiter and the
+session write). Queue clients send requests in a closed loop while a flood of logins arrives at
+once. Without admission control every login is served and queue requests wait behind them; with
+it, logins above `--max-in-flight` are answered with 503 and the queue latency stays close to the
+unloaded one. The last line shows the per-request overhead of the middleware on an unloaded server,
+measured on a route that does no work.
+
+Usage:
+    uv run python benchmarks/bench_admission.py [--queue-clients 20] [--logins 400] [--max-in-flight 32]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from fastapi import FastAPI
+import httpx
+from loguru import logger
+
+from gradioapp.api.middleware.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    initialize_admission_controller,
+)
+
+QUEUE_PATH = "/gradio/gradio_api/queue/join"
+
+
+def build_app(admission: bool) -> FastAPI:
+    app = FastAPI()
+    if admission:
+        app.add_middleware(AdmissionMiddleware)
+
+    @app.post(QUEUE_PATH)
+    async def queue_join() -> dict[str, bool]:
+        await asyncio.sleep(0.005)
+        time.sleep(0.001)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/login")
+    async def login() -> dict[str, bool]:
+        await asyncio.sleep(0.01)
+        time.sleep(0.005)
+        return {"ok": True}
+
+    return app
+
+
+async def run_flood(app: FastAPI, queue_clients: int, logins: int) -> tuple[list[float], dict[int, int]]:
+    """Returns the queue request latencies in milliseconds and the login status code counts."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def queue_client() -> None:
+            while not done.is_set():
+                start_time = time.perf_counter()
+                await client.post(QUEUE_PATH)
+                latencies.append((time.perf_counter() - start_time) * 1000)
+
+        async def login() -> None:
+            response = await client.post("/login")
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        queue_tasks = [asyncio.create_task(queue_client()) for _ in range(queue_clients)]
+        await asyncio.sleep(0.1)
+        await asyncio.gather(*(login() for _ in range(logins)))
+        done.set()
+        await asyncio.gather(*queue_tasks)
+    return latencies, statuses
+
+
+async def run_unloaded(app: FastAPI, requests: int) -> float:
+    """Returns the mean latency in microseconds of sequential requests to a route that does no work."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start_time = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+    return (time.perf_counter() - start_time) / requests * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue-clients", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    logger.remove()
+    print(f"{'admission':<10} {'queue p50 ms':>13} {'queue p95 ms':>13} {'queue max ms':>13}  logins")
+    for admission in (False, True):
+        initialize_admission_controller(AdmissionController(max_in_flight=args.max_in_flight))
+        latencies, statuses = asyncio.run(run_flood(build_app(admission), args.queue_clients, args.logins))
+        p50, p95 = statistics.median(latencies), statistics.quantiles(latencies, n=20)[-1]
+        outcome = ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items()))
+        print(f"{'on' if admission else 'off':<10} {p50:>13.1f} {p95:>13.1f} {max(latencies):>13.1f}  {outcome}")
+
+    initialize_admission_controller(AdmissionController(max_in_flight=args.max_in_flight))
+    baseline = min(asyncio.run(run_unloaded(build_app(False), args.requests)) for _ in range(3))
+    with_admission = min(asyncio.run(run_unloaded(build_app(True), args.requests)) for _ in range(3))
+    print(f"\nunloaded request: {baseline:.0f} us without, {with_admission:.0f} us with admission middleware")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Cold start of the application: what importing `gradioapp.main` costs, and how long start-up takes.
+
+Each variant runs in a fresh interpreter and is timed end to end; interpreter start-up is subtracted.
+"import" is what every test, tool and worker pays for importing the module, which used to include the
+whole start-up. "create_app" adds the app factory (middleware, routes, static files). The start-up
+variants then initialize the session store, the user repository and the Gradio UI: "serial" one after
+the other, as the former import-time code did, and "lifespan" concurrently, as the app lifespan does.
+
+Usage:
+    uv run python benchmarks/bench_cold_start.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT = "import gradioapp.main as main"
+CREATE = f"{IMPORT}; from gradioapp.config import get_settings; app = main.create_app(get_settings())"
+SERIAL = f"""{CREATE}
+import asyncio
+from gradioapp.domain.session.backends.memory import InMemorySessionStore
+from gradioapp.domain.user.repository import create_user_repository
+from gradioapp.ui import create_gradio_app
+
+InMemorySessionStore(ttl=300, cleanup_interval=60).stop_cleanup_thread()
+create_user_repository(get_settings())
+gradio_lifespan = main.mount_gradio(app, create_gradio_app(), main.GRADIO_PATH)
+
+
+async def start():
+    async with gradio_lifespan(app):
+        pass
+
+
+asyncio.run(start())
+"""
+LIFESPAN = f"""{CREATE}
+import asyncio
+
+
+async def start():
+    async with app.router.lifespan_context(app):
+        pass
+
+
+asyncio.run(start())
+"""
+
+VARIANTS = {
+    "import": IMPORT,
+    "import + create_app": CREATE,
+    "start-up, serial": SERIAL,
+    "start-up, lifespan": LIFESPAN,
+}
+
+
+def run(code: str, runs: int) -> float:
+    env = {"JWT_SECRET": "b" * 32, "PROJECTNAME": "bench", "VERSION": "0", **os.environ}
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = run("pass", args.runs)
+    print(f"median of {args.runs} fresh interpreters, interpreter start-up ({baseline:.0f} ms) subtracted")
+    print(f"{'variant':<22} {'ms':>10}")
+    for name, code in VARIANTS.items():
+        print(f"{name:<22} {run(code, args.runs) - baseline:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Bytes on the wire and CPU time per response with CompressionMiddleware: identity vs gzip vs brotli.
+
+Payloads are the real Gradio config of the app's Blocks, the login page shell and a JSON API
+response. Each variant calls the ASGI stack directly, so the CPU time per request is the
+framework plus compression cost; the difference to `identity` is what compression adds.
+
+Usage:
+    uv run python benchmarks/bench_compression.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+os.environ.setdefault("PROJECTNAME", "Benchmark")
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse
+from loguru import logger
+from starlette.types import Message
+
+from gradioapp.api.middleware.compression import CompressionMiddleware
+from gradioapp.api.routes.login import get_login_shell
+from gradioapp.core.http_cache import brotli
+from gradioapp.ui import create_gradio_app
+
+
+def build_app() -> CompressionMiddleware:
+    app = FastAPI()
+    gradio_config = create_gradio_app().get_config_file()
+    login_html = get_login_shell().body.decode("utf-8")
+    api_payload = {"sessions": [{"id": f"session-{index}", "user": "john@test.com", "ttl": 300} for index in range(40)]}
+
+    @app.get("/config")
+    async def config() -> JSONResponse:
+        return JSONResponse(gradio_config)
+
+    @app.get("/login")
+    async def login() -> HTMLResponse:
+        return HTMLResponse(login_html)
+
+    @app.get("/api")
+    async def api() -> JSONResponse:
+        return JSONResponse(api_payload)
+
+    return CompressionMiddleware(app)
+
+
+async def measure(app: CompressionMiddleware, path: str, coding: str, requests: int) -> tuple[int, float]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"accept-encoding", coding.encode())],
+    }
+    size = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    wire_size, size = size, 0
+    start_time = time.process_time()
+    for _ in range(requests):
+        await app(scope, receive, send)
+    return wire_size, (time.process_time() - start_time) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logger.remove()
+
+    app = build_app()
+    codings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    if brotli is None:
+        print("brotli not installed, skipping br")
+
+    print(f"{'payload':<10} {'coding':<10} {'bytes':>8} {'CPU us/req':>11}")
+    for path in ("/config", "/login", "/api"):
+        for coding in codings:
+            wire_size, cpu_us = asyncio.run(measure(app, path, coding, args.requests))
+            print(f"{path:<10} {coding:<10} {wire_size:>8} {cpu_us:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
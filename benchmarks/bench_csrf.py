@@ -0,0 +1,79 @@
+"""
+Per-call cost of CSRF token generation and validation: itsdangerous (before) vs HMAC double submit (after).
+
+The baseline re-creates the former `domain/csrf.py`, a `URLSafeTimedSerializer` that signed the client
+host with a timestamp (only if `itsdangerous` is installed). The current implementation is one
+HMAC-SHA256 of the nonce cookie and a constant-time compare.
+
+Usage:
+    uv run python benchmarks/bench_csrf.py [--number 100000]
+"""
+
+import argparse
+from functools import partial
+import os
+import timeit
+from typing import Callable
+from unittest.mock import MagicMock
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from starlette.requests import HTTPConnection
+
+from gradioapp.domain.csrf import (
+    CSRF_NONCE_COOKIE,
+    generate_csrf_token,
+    new_csrf_nonce,
+    validate_csrf_token,
+)
+
+
+def build_candidates() -> dict[str, tuple[Callable[[], object], Callable[[], object]]]:
+    candidates: dict[str, tuple[Callable[[], object], Callable[[], object]]] = {}
+    request = MagicMock(spec=HTTPConnection)
+    request.client.host = "203.0.113.7"
+
+    try:
+        from itsdangerous import URLSafeTimedSerializer
+    except ImportError:
+        print("itsdangerous not installed, skipping baseline")
+    else:
+        serializer = URLSafeTimedSerializer("secret-key")
+        legacy_token = serializer.dumps(request.client.host, salt="csrf-secret")
+
+        def legacy_validate() -> bool:
+            try:
+                return serializer.loads(legacy_token, salt="csrf-secret", max_age=3600) == request.client.host
+            except Exception:
+                return False
+
+        candidates["itsdangerous (before)"] = (
+            partial(serializer.dumps, request.client.host, salt="csrf-secret"),
+            legacy_validate,
+        )
+
+    nonce = new_csrf_nonce()
+    request.cookies = {CSRF_NONCE_COOKIE: nonce}
+    token = generate_csrf_token(nonce)
+    assert validate_csrf_token(token, request)
+    candidates["HMAC double submit"] = (
+        partial(generate_csrf_token, nonce),
+        partial(validate_csrf_token, token, request),
+    )
+    return candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'implementation':<24} {'generate':>12} {'validate':>12}")
+    for name, (generate, validate) in build_candidates().items():
+        generate_ns = timeit.timeit(generate, number=args.number) / args.number * 1e9
+        validate_ns = timeit.timeit(validate, number=args.number) / args.number * 1e9
+        print(f"{name:<24} {generate_ns:>9.0f} ns {validate_ns:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Import time of `gradioapp.main`, checked against a budget.
+
+The module is imported in fresh interpreters and the median wall time of the import is compared to
+`--budget-ms`; the script exits with status 1 when the budget is exceeded or when a module that must
+only be imported at server start-up (Gradio, uvicorn, Jinja2) is loaded. A breakdown of the import
+time per top-level package, from `python -X importtime`, shows where the time goes.
+
+Usage:
+    uv run python benchmarks/bench_import_time.py [--runs 5] [--budget-ms 1500] [--module gradioapp.main]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that the app defers to server start-up
+DEFERRED_MODULES = ("gradio", "uvicorn", "jinja2")
+
+IMPORT = """
+import sys
+import time
+
+start_time = time.perf_counter()
+import {module}
+print((time.perf_counter() - start_time) * 1000)
+print(",".join(sorted(name for name in {deferred} if name in sys.modules)))
+"""
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = {"JWT_SECRET": "b" * 32, "PROJECTNAME": "bench", "VERSION": "0", **os.environ}
+    return subprocess.run([sys.executable, *options, "-c", code], env=env, check=True, capture_output=True, text=True)
+
+
+def breakdown(module: str) -> dict[str, float]:
+    """Returns the self import time, in milliseconds, per top-level package."""
+    totals: dict[str, float] = {}
+    for line in run(f"import {module}", "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum median import time.")
+    parser.add_argument("--module", default="gradioapp.main")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages in the breakdown.")
+    args = parser.parse_args()
+
+    code = IMPORT.format(module=args.module, deferred=DEFERRED_MODULES)
+    timings = []
+    loaded = ""
+    for _ in range(args.runs):
+        elapsed, loaded = run(code).stdout.splitlines()
+        timings.append(float(elapsed))
+    median = statistics.median(timings)
+
+    print(f"import {args.module}: median {median:.0f} ms of {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print(f"{'package':<24} {'ms':>10}")
+    totals = sorted(breakdown(args.module).items(), key=lambda item: item[1], reverse=True)
+    for package, total in totals[: args.top]:
+        print(f"{package:<24} {total:>10.0f}")
+
+    failed = False
+    if median > args.budget_ms:
+        print(f"FAIL: import time {median:.0f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if loaded:
+        print(f"FAIL: {loaded} imported by {args.module}; import it at server start-up instead")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
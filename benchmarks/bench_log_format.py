@@ -0,0 +1,71 @@
+"""
+CPU time per log record of the text format and of the JSON formats.
+
+"text" is the colored, human-readable format. "json, loguru serialize" is loguru's built-in
+`serialize=True`, which dumps the whole record (file, process and thread objects included) with
+the standard library encoder. "json, orjson" and "json, stdlib" are the `LOG_FORMAT=json` formatter
+of `core/logging.py`, which keeps the fields useful for log search, with orjson (installed) and
+with its standard library fallback. Every record carries a request ID and the five fields the
+gateway logs per request. The records go to a discarding sink, so the numbers show the cost of
+formatting, not of writing.
+
+Usage:
+    uv run python benchmarks/bench_log_format.py [--records 50000]
+"""
+
+import argparse
+import os
+import time
+from unittest.mock import patch
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from loguru import logger
+
+from gradioapp.core import logging as app_logging
+from gradioapp.core.logging import (
+    LOG_FORMAT,
+    _format_json,
+    _format_location,
+    request_id_var,
+)
+
+
+def measure(records: int, **options: object) -> float:
+    """Returns the CPU time per record in microseconds."""
+    logger.remove()
+    logger.add(lambda message: None, level="INFO", filter=_format_location, **options)
+    start_time = time.process_time()
+    for index in range(records):
+        logger.info(
+            "[{method}] {path} | status={status} | user_id={user_id} | {duration_ms:.2f} ms",
+            method="GET",
+            path="/gradio/config",
+            status=200,
+            user_id="bench_user",
+            duration_ms=index / 100,
+        )
+    return (time.process_time() - start_time) / records * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    logger.configure(patcher=app_logging._bind_request_id)
+    request_id_var.set("9f1c2d3e4b5a6978")
+    variants = {
+        "text": lambda: measure(args.records, format=LOG_FORMAT, colorize=True),
+        "json, loguru serialize": lambda: measure(args.records, serialize=True),
+        "json, orjson": lambda: measure(args.records, format=_format_json),
+    }
+    print(f"{'format':<24} {'us/record':>10}")
+    for name, run in variants.items():
+        print(f"{name:<24} {run():>10.2f}")
+    with patch.object(app_logging, "orjson", None):
+        print(f"{'json, stdlib':<24} {measure(args.records, format=_format_json):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time a logging call costs its caller with a slow log target: synchronous sink vs queued sink.
+
+The target sleeps `--write-ms` per write, like a stderr pipe whose reader falls behind. The
+caller logs `--records` INFO records, with `--interval-us` of other work between them, the way
+a request handler does. "sync" writes every record on the caller thread; "queued" puts it on a
+`QueuedSink`, whose writer thread writes batches, with the drop and the block policy. The table
+shows the caller time per record (median and p99), the records dropped and the writes made.
+
+Usage:
+    uv run python benchmarks/bench_log_queue.py [--records 2000] [--write-ms 1] [--interval-us 200] [--queue-size 1000]
+"""
+
+import argparse
+import statistics
+import time
+
+from loguru import logger
+
+from gradioapp.core.log_sinks import QueuedSink
+
+
+class SlowTarget:
+    def __init__(self, write_ms: float) -> None:
+        self.write_s = write_ms / 1000
+        self.writes = 0
+
+    def write(self, text: str) -> None:
+        time.sleep(self.write_s)
+        self.writes += 1
+
+
+def run(variant: str, args: argparse.Namespace) -> tuple[list[float], int, int]:
+    target = SlowTarget(args.write_ms)
+    sink = target
+    if variant != "sync":
+        sink = QueuedSink(target, "bench", max_size=args.queue_size, policy=variant.removeprefix("queued, "))
+    logger.remove()
+    logger.add(sink, level="INFO", format="{time} | {level} | {message}")
+
+    timings = []
+    for index in range(args.records):
+        start_time = time.perf_counter()
+        logger.info("[GET] /gradio/config | status=200 | user_id={} | {:.2f} ms", "bench_user", index / 100)
+        timings.append((time.perf_counter() - start_time) * 1_000_000)
+        deadline = time.perf_counter() + args.interval_us / 1_000_000
+        while time.perf_counter() < deadline:
+            pass
+    logger.remove()  # Stops the queued sink after it has written the queued records
+    return timings, sink.dropped if isinstance(sink, QueuedSink) else 0, target.writes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--write-ms", type=float, default=1.0, help="Time the target takes per write.")
+    parser.add_argument("--interval-us", type=float, default=200.0, help="Work between two records.")
+    parser.add_argument("--queue-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.records} records, {args.write_ms:g} ms per write, {args.interval_us:g} us between records")
+    print(f"{'sink':<16} {'median us':>10} {'p99 us':>10} {'dropped':>8} {'writes':>8}")
+    for variant in ("sync", "queued, drop", "queued, block"):
+        timings, dropped, writes = run(variant, args)
+        p99 = statistics.quantiles(timings, n=100)[98]
+        print(f"{variant:<16} {statistics.median(timings):>10.1f} {p99:>10.1f} {dropped:>8} {writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
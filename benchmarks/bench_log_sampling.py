@@ -0,0 +1,81 @@
+"""
+CPU time per request of the request log at DEBUG level, with and without sampling.
+
+A trivial route behind `GatewayMiddleware` is requested through the ASGI transport, with the request
+log sampled at each `--rates` value. Log lines go through the application's text format into a
+discarding sink, so the difference between the rates is the cost of formatting the lines that
+sampling suppresses. The table shows the CPU time per request and the lines written.
+
+Usage:
+    uv run python benchmarks/bench_log_sampling.py [--requests 3000] [--rates 1 0.1 0.01]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from fastapi import FastAPI
+import httpx
+from loguru import logger
+
+from gradioapp.api.middleware import GatewayMiddleware
+from gradioapp.api.middleware.sampling import (
+    RequestLogSampler,
+    initialize_request_log_sampler,
+)
+from gradioapp.core.logging import LOG_FORMAT, _bind_request_id, _format_location
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/login")
+    async def login() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(GatewayMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    """Returns the CPU time per request in microseconds."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start_time = time.process_time()
+        for _ in range(requests):
+            response = await client.get("/login")
+            assert response.status_code == 200
+        return (time.process_time() - start_time) / requests * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--rates", type=float, nargs="+", default=[1.0, 0.1, 0.01])
+    args = parser.parse_args()
+
+    lines = 0
+
+    def sink(message: str) -> None:
+        nonlocal lines
+        lines += 1
+
+    logger.remove()
+    logger.configure(patcher=_bind_request_id)
+    logger.add(sink, level="DEBUG", format=LOG_FORMAT, filter=_format_location, colorize=True)
+
+    app = build_app()
+    asyncio.run(measure(app, min(200, args.requests)))
+    print(f"{'rate':>6} {'us/request':>11} {'lines':>7}")
+    for rate in args.rates:
+        initialize_request_log_sampler(RequestLogSampler(rate=rate))
+        lines = 0
+        cpu_us = asyncio.run(measure(app, args.requests))
+        print(f"{rate:>6g} {cpu_us:>11.1f} {lines:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Per-request CPU time of the debug logging on the request path, at INFO and DEBUG level.
+
+A request to a session route logs three debug records: the session lookup in
+`InMemorySessionStore.get_session`, the verified access and the request summary in
+`GatewayMiddleware`. "eager" builds them as the former code did, with f-strings and
+`_format_session` evaluated before loguru checks the level; "lazy" passes the values as arguments
+(and the session through a `logger.opt(lazy=True)` logger), as the code does now. The records go to a
+discarding sink, so the numbers show the cost of the calls, not of writing them out.
+
+Usage:
+    uv run python benchmarks/bench_logging.py [--iterations 200000]
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from loguru import logger
+
+from gradioapp.core.logging import _format_location
+from gradioapp.domain.session.types import format_session
+
+SESSION_ID = "9f1c2d3e-4b5a-6978-8a9b-0c1d2e3f4a5b"
+SESSION = {"username": "bench_user", "data": {"theme": "dark", "tab": 1}, "expire_at": time.time() + 300}
+
+
+def eager() -> None:
+    logger.debug(format_session(SESSION_ID, SESSION))
+    logger.debug(f"Access verified (session) for user {SESSION['username']}, session_id {SESSION_ID}")
+    logger.debug(
+        f"[GET] /gradio/config | status=200 | user_id={SESSION['username']} session_id={SESSION_ID} | {1.2345:.2f} ms"
+    )
+
+
+LAZY_LOGGER = logger.opt(lazy=True)
+
+
+def lazy() -> None:
+    LAZY_LOGGER.debug("{}", lambda: format_session(SESSION_ID, SESSION))
+    logger.debug("Access verified ({}) for user {}, session_id {}", "session", SESSION["username"], SESSION_ID)
+    logger.debug(
+        "[{}] {} | status={} | user_id={} session_id={} | {:.2f} ms",
+        "GET",
+        "/gradio/config",
+        200,
+        SESSION["username"],
+        SESSION_ID,
+        1.2345,
+    )
+
+
+def measure(request: Callable[[], None], iterations: int) -> float:
+    """Returns the CPU time per request in microseconds."""
+    for _ in range(min(1000, iterations)):
+        request()
+    start_time = time.process_time()
+    for _ in range(iterations):
+        request()
+    return (time.process_time() - start_time) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'level':<8} {'eager us/req':>14} {'lazy us/req':>14} {'saved us/req':>14}")
+    for level in ("INFO", "DEBUG"):
+        logger.remove()
+        logger.add(lambda message: None, level=level, filter=_format_location, format="{location} - {message}")
+        # Fewer iterations at DEBUG, where every record is formatted and written
+        iterations = args.iterations if level == "INFO" else args.iterations // 10
+        eager_us = measure(eager, iterations)
+        lazy_us = measure(lazy, iterations)
+        print(f"{level:<8} {eager_us:>14.2f} {lazy_us:>14.2f} {eager_us - lazy_us:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
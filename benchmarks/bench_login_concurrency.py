@@ -0,0 +1,112 @@
+"""
+Event-loop latency during concurrent logins: bcrypt on the event loop vs on the bounded password pool.
+
+A probe task sleeps for a short tick in a loop and records how late it wakes up; that lateness is the
+latency every other request (and every open Gradio stream) would see. While the probe runs, a batch
+of concurrent `POST /login` requests is sent to the real login route through an in-process ASGI
+transport. "inline" reproduces the former behaviour by running `authenticate_user` directly on the
+event loop; "pool" uses the `PasswordPool`.
+
+Usage:
+    uv run python benchmarks/bench_login_concurrency.py [--logins 16] [--workers 2] [--max-pending 32]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Callable, TypeVar
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from fastapi import FastAPI
+import httpx
+from loguru import logger
+
+from gradioapp.api.routes import login as login_routes
+from gradioapp.domain.password_pool import PasswordPool
+from gradioapp.domain.session.backends.memory import InMemorySessionStore
+from gradioapp.domain.session.store import initialize_session_store
+
+T = TypeVar("T")
+
+PROBE_TICK = 0.005
+
+
+class InlinePool:
+    """Runs the password check directly on the event loop, like the login route used to."""
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        return func(*args)
+
+
+async def probe(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        await asyncio.sleep(PROBE_TICK)
+        lags.append((time.perf_counter() - start_time - PROBE_TICK) * 1000)
+
+
+async def measure(pool: object, logins: int) -> tuple[list[float], dict[int, int], float]:
+    login_routes.get_password_pool = lambda: pool
+    app = FastAPI()
+    app.include_router(login_routes.router)
+    form = {"username": "john@test.com", "password": "secret", "csrf_token": "bench"}
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe_task = asyncio.ensure_future(probe(stop, lags))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+        start_time = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/login", data=form) for _ in range(logins)))
+        elapsed = time.perf_counter() - start_time
+    stop.set()
+    await probe_task
+
+    statuses: dict[int, int] = {}
+    for response in responses:
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    return lags, statuses, elapsed
+
+
+def report(name: str, lags: list[float], statuses: dict[int, int], elapsed: float) -> None:
+    lags = sorted(lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    codes = " ".join(f"{code}x{count}" for code, count in sorted(statuses.items()))
+    print(
+        f"{name:<8} {len(lags):>7} {statistics.median(lags):>10.2f} {p99:>10.2f} {lags[-1]:>10.2f} "
+        f"{elapsed:>9.2f}  {codes}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=32)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    store = InMemorySessionStore(ttl=300, cleanup_interval=60)
+    initialize_session_store(store)
+    login_routes.validate_csrf_token = lambda csrf_token, request: True
+
+    inline = asyncio.run(measure(InlinePool(), args.logins))
+    pool = PasswordPool(max_workers=args.workers, max_pending=args.max_pending)
+    pooled = asyncio.run(measure(pool, args.logins))
+    pool.shutdown()
+    store.stop_cleanup_thread()
+
+    print(f"{args.logins} concurrent logins, probe tick {PROBE_TICK * 1000:.0f} ms, lag in ms")
+    print(f"{'mode':<8} {'samples':>7} {'p50':>10} {'p99':>10} {'max':>10} {'total s':>9}  statuses")
+    report("inline", *inline)
+    report("pool", *pooled)
+
+
+if __name__ == "__main__":
+    main()
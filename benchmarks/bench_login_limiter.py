@@ -0,0 +1,74 @@
+"""
+Per-attempt cost of login admission control compared with the bcrypt check it protects.
+
+A credential-stuffing run is simulated against `LoginRateLimiter`: one attacker IP hammering a single
+account (rejected after the burst) and a spray over many IPs and usernames (mostly admitted, filling
+the buckets up to the memory bound). Both are compared with one `bcrypt.checkpw` of the bundled
+sample hash, which is what every admitted attempt costs afterwards.
+
+Usage:
+    uv run python benchmarks/bench_login_limiter.py [--number 200000] [--max-keys 100000]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from loguru import logger
+
+from gradioapp.domain.passwords import check_password
+from gradioapp.domain.rate_limit import LoginRateLimiter, TokenBucketLimiter
+from gradioapp.domain.user import DEFAULT_USERS_FILE, InMemoryUserRepository
+
+
+def build_limiter(max_keys: int) -> LoginRateLimiter:
+    return LoginRateLimiter(
+        ip=TokenBucketLimiter(rate=10 / 60, burst=20, max_keys=max_keys),
+        account=TokenBucketLimiter(rate=5 / 60, burst=10, max_keys=max_keys),
+    )
+
+
+def per_call_ns(limiter: LoginRateLimiter, attempts: list[tuple[str, str]]) -> float:
+    start_time = time.perf_counter()
+    for client_ip, username in attempts:
+        limiter.check(client_ip, username)
+    return (time.perf_counter() - start_time) / len(attempts) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    single = [("203.0.113.7", "john@test.com")] * args.number
+    spray = [(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", f"user{i}@test.com") for i in range(args.number)]
+
+    limiter = build_limiter(args.max_keys)
+    single_ns = per_call_ns(limiter, single)
+    single_stats = limiter.stats()
+
+    limiter = build_limiter(args.max_keys)
+    spray_ns = per_call_ns(limiter, spray)
+    spray_stats = limiter.stats()
+
+    user = InMemoryUserRepository.from_file(DEFAULT_USERS_FILE).get_user("john@test.com")
+    start_time = time.perf_counter()
+    check_password("wrong", user.password_hash)
+    bcrypt_ns = (time.perf_counter() - start_time) * 1e9
+
+    print(f"{'scenario':<34} {'per attempt':>14} {'rejected':>10} {'buckets':>10}")
+    print(f"{'one IP, one account':<34} {single_ns:>11.0f} ns {single_stats['ip_rejected']:>10} {'':>10}")
+    print(
+        f"{'spray over IPs and accounts':<34} {spray_ns:>11.0f} ns {spray_stats['ip_rejected']:>10} "
+        f"{spray_stats['ip_buckets'] + spray_stats['account_buckets']:>10}"
+    )
+    print(f"{'bcrypt.checkpw (admitted attempt)':<34} {bcrypt_ns:>11.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
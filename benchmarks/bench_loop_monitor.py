@@ -0,0 +1,88 @@
+"""
+Overhead of the event loop lag monitor, and how fast it reports a blocking call.
+
+The first part runs a batch of small coroutines, each yielding to the loop a few times, without
+the monitor and with it at several intervals, and reports the wall time per batch. The second part
+blocks the loop with a synchronous `time.sleep` (standing in for a bcrypt call or a blocking write)
+and reports the lag recorded by the monitor and whether the watchdog logged the blocking stack.
+
+Usage:
+    uv run python benchmarks/bench_loop_monitor.py [--tasks 20000] [--rounds 5] [--block-ms 300]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from loguru import logger
+
+from gradioapp.core.loop_monitor import LoopLagMonitor
+
+
+async def _yielding_task() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def run_batch(tasks: int) -> float:
+    """Returns the wall time in milliseconds to run `tasks` yielding coroutines."""
+    start_time = time.perf_counter()
+    await asyncio.gather(*(_yielding_task() for _ in range(tasks)))
+    return (time.perf_counter() - start_time) * 1000
+
+
+async def measure_overhead(tasks: int, rounds: int, interval: float | None) -> float:
+    """Returns the best batch time in milliseconds, with the monitor at `interval` or without it."""
+    monitor = None
+    if interval is not None:
+        monitor = LoopLagMonitor(interval=interval, threshold=0.1)
+        monitor.start()
+    try:
+        return min([await run_batch(tasks) for _ in range(rounds)])
+    finally:
+        if monitor is not None:
+            await monitor.stop()
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def measure_detection(block_ms: float) -> tuple[int, float]:
+    """Blocks the loop for `block_ms` and returns the episodes detected and the largest lag in milliseconds."""
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    _blocking_call(block_ms / 1000)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    lines = monitor.render()
+    lag_sum = float(next(line for line in lines if line.startswith("event_loop_lag_seconds_sum")).split()[1])
+    return monitor.blocked, lag_sum * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--block-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    logger.remove()
+    print(f"{'monitor':<20} {'ms/batch':>10}")
+    for name, interval in (("off", None), ("interval 0.5 s", 0.5), ("interval 0.01 s", 0.01)):
+        elapsed = asyncio.run(measure_overhead(args.tasks, args.rounds, interval))
+        print(f"{name:<20} {elapsed:>10.2f}")
+
+    messages: list[str] = []
+    logger.add(messages.append, level="WARNING", format="{message}")
+    blocked, lag_ms = asyncio.run(measure_detection(args.block_ms))
+    stack_logged = any("_blocking_call" in message for message in messages)
+    print(f"\nblocked {args.block_ms:.0f} ms: episodes={blocked} lag_sum={lag_ms:.0f} ms stack_logged={stack_logged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Requests/second on a trivial authenticated route: legacy BaseHTTPMiddleware stack vs GatewayMiddleware.
+
+The legacy stack re-creates the former `SessionMiddleware`, `AuthMiddleware` and `LoggingMiddleware`
+layers (three `BaseHTTPMiddleware` subclasses doing the same work). Both variants authenticate the
+same cookie against the same in-memory session store.
+
+Usage:
+    uv run python benchmarks/bench_middleware.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+import os
+import sys
+import time
+from typing import Awaitable, Callable
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from fastapi import FastAPI, Request, Response
+import httpx
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from gradioapp.api.middleware import GatewayMiddleware
+from gradioapp.api.middleware.utils import create_unauthorized_response, is_path_allowed
+from gradioapp.domain.auth import create_session_token, verify_token
+from gradioapp.domain.session.backends.memory import InMemorySessionStore
+from gradioapp.domain.session.store import get_session_store, initialize_session_store
+
+CallNext = Callable[[Request], Awaitable[Response]]
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: CallNext) -> Response:
+        if is_path_allowed(request.url.path):
+            return await call_next(request)
+        payload = verify_token(request.cookies.get("access_token", ""))
+        if not payload:
+            return create_unauthorized_response(request, "Invalid or expired token")
+        request.state.user_id = payload.get("sub")
+        request.state.session_id = payload.get("session_id")
+        return await call_next(request)
+
+
+class LegacySessionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: CallNext) -> Response:
+        if is_path_allowed(request.url.path):
+            return await call_next(request)
+        session_id = getattr(request.state, "session_id", None)
+        if not session_id or not get_session_store().get_session(session_id):
+            return create_unauthorized_response(request, "Session expired or not found")
+        return await call_next(request)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: CallNext) -> Response:
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration = (time.perf_counter() - start_time) * 1000
+        logger.debug(f"[{request.method}] {request.url.path} | status={response.status_code} | {duration:.2f} ms")
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    if legacy:
+        app.add_middleware(LegacySessionMiddleware)
+        app.add_middleware(LegacyAuthMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    else:
+        app.add_middleware(GatewayMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, token: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", cookies={"access_token": token}
+    ) as client:
+        for _ in range(min(200, requests)):
+            await client.get("/ping")
+        start_time = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/ping")
+            assert response.status_code == 200
+        return requests / (time.perf_counter() - start_time)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    store = InMemorySessionStore(ttl=300, cleanup_interval=60)
+    initialize_session_store(store)
+    token, session_id = create_session_token("bench_user", expires_delta=timedelta(minutes=30))
+    store.create_session(session_id=session_id, username="bench_user", data={})
+
+    legacy = asyncio.run(measure(build_app(legacy=True), token, args.requests))
+    gateway = asyncio.run(measure(build_app(legacy=False), token, args.requests))
+    store.stop_cleanup_thread()
+
+    print(f"{'stack':<34} {'req/s':>10}")
+    print(f"{'3x BaseHTTPMiddleware (before)':<34} {legacy:>10.0f}")
+    print(f"{'GatewayMiddleware (after)':<34} {gateway:>10.0f}")
+    print(f"speedup: {gateway / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-call cost of route classification for hit and miss paths.
+
+Compares the former `pathspec` gitwildmatch matching (baseline, only if `pathspec` is installed)
+with the compiled `PathMatcher`, both uncached and behind the `RouteClassifier` LRU cache.
+
+Usage:
+    uv run python benchmarks/bench_path_matching.py [--number 200000]
+"""
+
+import argparse
+from functools import partial
+import os
+import timeit
+from typing import Callable
+
+os.environ.setdefault("JWT_SECRET", "b" * 32)
+
+from gradioapp.api.middleware.utils import (
+    ALLOWED_PATHS,
+    TOKEN_ONLY_PATHS,
+    PathMatcher,
+    RouteClassifier,
+)
+
+PATHS = {
+    "hit exact": "/login",
+    "hit prefix": "/static/css/style.css",
+    "miss": "/gradio/gradio_api/queue/join",
+}
+
+
+def build_candidates() -> dict[str, Callable[[str], object]]:
+    public = PathMatcher(ALLOWED_PATHS)
+    token = PathMatcher(TOKEN_ONLY_PATHS)
+    classifier = RouteClassifier(ALLOWED_PATHS, TOKEN_ONLY_PATHS)
+
+    def compiled(path: str) -> bool:
+        return public.matches(path) or token.matches(path)
+
+    candidates: dict[str, Callable[[str], object]] = {}
+    try:
+        import pathspec
+    except ImportError:
+        print("pathspec not installed, skipping baseline")
+    else:
+        public_spec = pathspec.PathSpec.from_lines("gitwildmatch", ALLOWED_PATHS)
+        token_spec = pathspec.PathSpec.from_lines("gitwildmatch", TOKEN_ONLY_PATHS)
+
+        def gitwildmatch(path: str) -> bool:
+            return public_spec.match_file(path) or token_spec.match_file(path)
+
+        candidates["pathspec (before)"] = gitwildmatch
+    candidates["PathMatcher"] = compiled
+    candidates["RouteClassifier + LRU"] = classifier.classify
+    return candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    candidates = build_candidates()
+    print(f"{'matcher':<24}" + "".join(f"{label:>16}" for label in PATHS))
+    for name, match in candidates.items():
+        cells = []
+        for path in PATHS.values():
+            seconds = timeit.timeit(partial(match, path), number=args.number)
+            cells.append(f"{seconds / args.number * 1e9:>13.0f} ns")
+        print(f"{name:<24}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
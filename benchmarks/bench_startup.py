@@ -0,0 +1,58 @@
+"""
+Process start-up cost of the user database: hashing at import (before) vs precomputed hashes (after).
+
+Each variant runs in a fresh interpreter and is timed end to end, so module import, settings loading
+and user database set-up are all included. "before" reproduces the former `init_user_db()` that ran at
+import time by hashing the sample passwords with a fresh salt; "after" imports the module and loads
+the precomputed credentials file on the first login, which is timed separately.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs 5] [--users 2]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_USER = "import gradioapp.domain.user as user"
+HASH_USERS = "from gradioapp.domain.passwords import hash_password; [hash_password('secret') for _ in range({users})]"
+FIRST_LOGIN = "user.authenticate_user('john@test.com', 'wrong')"
+IMPORT_MAIN = "import gradioapp.main; import gradioapp.domain.user as user"
+
+VARIANTS = {
+    "domain.user import, before": f"{IMPORT_USER}; {HASH_USERS}",
+    "domain.user import, after": IMPORT_USER,
+    "app import, before": f"{IMPORT_MAIN}; {HASH_USERS}",
+    "app import, after": IMPORT_MAIN,
+    "first login (lazy load + check)": f"{IMPORT_USER}; {FIRST_LOGIN}",
+}
+
+
+def run(code: str, runs: int) -> float:
+    env = {"JWT_SECRET": "b" * 32, "PROJECTNAME": "bench", "VERSION": "0", **os.environ}
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--users", type=int, default=2, help="Number of users hashed by the 'before' variants.")
+    args = parser.parse_args()
+
+    baseline = run("pass", args.runs)
+    print(f"median of {args.runs} fresh interpreters, interpreter start-up ({baseline:.0f} ms) subtracted")
+    print(f"{'variant':<34} {'ms':>10}")
+    for name, code in VARIANTS.items():
+        print(f"{name:<34} {run(code.format(users=args.users), args.runs) - baseline:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
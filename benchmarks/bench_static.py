@@ -0,0 +1,101 @@
+"""
+Requests/second and bytes per response for static files: FileResponse from disk (before) vs in-memory (after).
+
+The baseline re-creates the former `/manifest.json` route, which built a new `FileResponse` on every
+request, and the former stock `StaticFiles` mount. Each route is measured for a first visit
+(`Accept-Encoding: gzip, br`) and for a revalidation (`If-None-Match` with the ETag of the first visit).
+
+Usage:
+    uv run python benchmarks/bench_static.py [--requests 3000] [--size 20000]
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import tempfile
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse, Response
+import httpx
+from loguru import logger
+from starlette.staticfiles import StaticFiles
+
+from gradioapp.core.http_cache import PrecompressedBody
+from gradioapp.core.static_files import CachedStaticFiles
+
+
+def build_app(static_dir: Path, cached: bool) -> FastAPI:
+    app = FastAPI()
+    manifest_path = static_dir / "manifest.json"
+    if cached:
+        manifest = PrecompressedBody.from_file(manifest_path)
+
+        @app.get("/manifest.json")
+        async def cached_manifest(request: Request) -> Response:
+            return manifest.response(request.headers)
+
+        app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
+    else:
+
+        @app.get("/manifest.json")
+        async def disk_manifest() -> FileResponse:
+            return FileResponse(str(manifest_path))
+
+        app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int, revalidate: bool) -> tuple[float, int]:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": "gzip, br"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        first = await client.get(path)
+        if revalidate:
+            client.headers["If-None-Match"] = first.headers["etag"]
+        for _ in range(min(200, requests)):
+            await client.get(path)
+        start_time = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path)
+        return requests / (time.perf_counter() - start_time), response.status_code
+
+
+async def wire_size(app: FastAPI, path: str, etag: str | None = None) -> tuple[int, str]:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": "gzip, br"} | ({"If-None-Match": etag} if etag else {})
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async with client.stream("GET", path, headers=headers) as response:
+            body = b"".join([chunk async for chunk in response.aiter_raw()])
+            return len(body), response.headers["etag"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--size", type=int, default=20_000, help="Size of the generated JS asset in bytes")
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as directory:
+        static_dir = Path(directory)
+        manifest = (Path(__file__).parent.parent / "src" / "gradioapp" / "static" / "manifest.json").read_bytes()
+        (static_dir / "manifest.json").write_bytes(manifest)
+        line = b"export function render(node) { node.textContent = 'gradio-session'; }\n"
+        (static_dir / "app.0123abcd.js").write_bytes((line * (args.size // len(line) + 1))[: args.size])
+
+        print(f"{'route':<24} {'variant':<34} {'req/s':>8} {'status':>7} {'bytes':>7}")
+        for path in ("/manifest.json", "/static/app.0123abcd.js"):
+            for cached in (False, True):
+                app = build_app(static_dir, cached)
+                label = "in-memory (after)" if cached else "FileResponse (before)"
+                size, etag = asyncio.run(wire_size(app, path))
+                rate, status = asyncio.run(measure(app, path, args.requests, revalidate=False))
+                print(f"{path:<24} {label:<34} {rate:>8.0f} {status:>7} {size:>7}")
+                size, _ = asyncio.run(wire_size(app, path, etag))
+                rate, status = asyncio.run(measure(app, path, args.requests, revalidate=True))
+                print(f"{path:<24} {label + ', revalidate':<34} {rate:>8.0f} {status:>7} {size:>7}")
+
+
+if __name__ == "__main__":
+    main()
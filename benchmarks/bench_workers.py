@@ -0,0 +1,126 @@
+"""
+Memory and throughput of the server with the worker in process and with a recycled prefork worker.
+
+Each run starts the real application in a subprocess the way `main()` does: the app and the Gradio UI
+are preloaded, then `run_server` serves them. With `MAX_REQUESTS=0` the app is served by that process;
+with `MAX_REQUESTS` set, the prefork master calls `gc.freeze()` and forks the worker, and replaces it
+every `MAX_REQUESTS` requests. The benchmark waits until the server answers, then sends requests for a
+fixed time from a pool of concurrent keep-alive connections. The memory of the serving process (the
+worker, or the process itself) is read from `/proc` after the load: RSS counts all pages it maps, PSS
+splits shared pages among the processes sharing them, so the gap between the two shows how much of the
+preloaded app stays shared copy-on-write with the master. Throughput is bounded by the CPUs of the
+machine, which the load generator shares.
+
+Usage:
+    uv run python benchmarks/bench_workers.py [--max-requests 0 5000] [--duration 10] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+START_SERVER = "from gradioapp.main import main; main()"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not answer {url} within {timeout:.0f} s")
+
+
+def child_pids(pid: int) -> list[int]:
+    return [int(child) for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()]
+
+
+def memory_kib(pid: int) -> tuple[int, int]:
+    """Returns the RSS and PSS of a process in KiB."""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, rest = line.partition(":")
+        if name in ("Rss", "Pss"):
+            values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+async def load(url: str, duration: float, concurrency: int) -> int:
+    completed = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal completed
+        while time.monotonic() < deadline:
+            response = await client.get(url)
+            response.raise_for_status()
+            completed += 1
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return completed
+
+
+def run(max_requests: int, duration: float, concurrency: int, path: str) -> tuple[float, tuple[int, int]]:
+    port = free_port()
+    env = {
+        "JWT_SECRET": "b" * 32,
+        "PROJECTNAME": "bench",
+        "VERSION": "0",
+        **os.environ,
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "LOG_LEVEL": "WARNING",
+        "MAX_REQUESTS": str(max_requests),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-c", START_SERVER], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        wait_ready(url)
+        start_time = time.perf_counter()
+        completed = asyncio.run(load(url, duration, concurrency))
+        throughput = completed / (time.perf_counter() - start_time)
+        workers = child_pids(server.pid)
+        return throughput, memory_kib(workers[0] if workers else server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-requests", type=int, nargs="+", default=[0, 5000], help="0 serves in process.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per run.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent client connections.")
+    parser.add_argument("--path", default="/healthz", help="Public path requested.")
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.concurrency} connections, {args.duration:.0f} s per run, {os.cpu_count()} CPUs")
+    print(f"{'mode':<24} {'req/s':>10} {'RSS MiB':>10} {'PSS MiB':>10}")
+    for max_requests in args.max_requests:
+        throughput, (rss, pss) = run(max_requests, args.duration, args.concurrency, args.path)
+        mode = f"prefork, recycled /{max_requests}" if max_requests else "in process"
+        print(f"{mode:<24} {throughput:>10.0f} {rss / 1024:>10.1f} {pss / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
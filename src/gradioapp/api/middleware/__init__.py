@@ -1,5 +1,5 @@
-from .auth import AuthMiddleware
-from .logging import LoggingMiddleware
-from .session import SessionMiddleware
+from .admission import AdmissionMiddleware
+from .compression import CompressionMiddleware
+from .gateway import GatewayMiddleware
 
-__all__ = ["AuthMiddleware", "SessionMiddleware", "LoggingMiddleware"]
+__all__ = ["AdmissionMiddleware", "CompressionMiddleware", "GatewayMiddleware"]
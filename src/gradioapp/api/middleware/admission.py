@@ -0,0 +1,256 @@
+import threading
+from typing import Callable
+
+from loguru import logger
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ...config import get_settings
+from ...core.loop_monitor import get_loop_monitor
+from .utils import is_browser_request, is_stream_request
+
+# Route classes tracked by the admission controller
+LOGIN = "login"
+UPLOAD = "upload"
+SESSION_DUMP = "session_dump"
+QUEUE = "queue"
+STREAM = "stream"
+OTHER = "other"
+
+# Low-priority route classes, shed first when the server is overloaded
+LOW_PRIORITY = frozenset({LOGIN, UPLOAD, SESSION_DUMP})
+
+# Path suffixes of Gradio file uploads and of the (non-stream) Gradio queue endpoints
+UPLOAD_PATH_SUFFIXES = ("/gradio_api/upload",)
+QUEUE_PATH_MARKER = "/gradio_api/queue/"
+
+# Overload reasons, used as metric label values
+REASON_IN_FLIGHT = "in_flight"
+REASON_LAG = "lag"
+
+
+class AdmissionController:
+    """
+    Decides whether the server is overloaded and which work it sheds.
+
+    The controller counts requests in flight per route class and reads the event loop lag last
+    measured by the `LoopLagMonitor`. The server is overloaded when `max_in_flight` requests are in
+    flight (open streams excepted, they idle most of the time) or when the lag reaches
+    `lag_threshold_ms`. Only low-priority work is shed: new logins, Gradio file uploads and session
+    dumps. Gradio queue traffic, streams and other requests are always admitted, so users already
+    working in the UI keep being served while new work waits.
+
+    In-flight counters are updated on the event loop thread only and take no lock; shed counters
+    take one, as session dumps are checked from Gradio's worker threads.
+
+    Attributes:
+        max_in_flight (int): Requests in flight from which low-priority work is shed (0 disables).
+        lag_threshold_ms (float): Event loop lag in milliseconds from which low-priority work is shed (0 disables).
+        retry_after (int): Seconds clients are asked to wait before retrying shed work.
+    """
+
+    def __init__(self, max_in_flight: int = 0, lag_threshold_ms: float = 0.0, retry_after: int = 2) -> None:
+        self.max_in_flight = max_in_flight
+        self.lag_threshold_ms = lag_threshold_ms
+        self.retry_after = retry_after
+        # Route class -> requests in flight
+        self._in_flight: dict[str, int] = {}
+        # Requests in flight, streams excepted
+        self._active = 0
+        # (route class, reason) -> shed requests
+        self._shed: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def classify(connection: HTTPConnection) -> str:
+        """
+        Returns the route class of a request.
+
+        Args:
+            connection (HTTPConnection): The incoming HTTP request or websocket connection.
+
+        Returns:
+            str: `LOGIN`, `UPLOAD`, `QUEUE`, `STREAM` or `OTHER`.
+        """
+        scope = connection.scope
+        path = scope["path"]
+        if is_stream_request(connection):
+            return STREAM
+        if scope["method"] == "POST":
+            if path == "/login":
+                return LOGIN
+            if path.endswith(UPLOAD_PATH_SUFFIXES):
+                return UPLOAD
+        if QUEUE_PATH_MARKER in path:
+            return QUEUE
+        return OTHER
+
+    def overload(self) -> str | None:
+        """
+        Checks whether the server is overloaded.
+
+        Returns:
+            str | None: `REASON_IN_FLIGHT` or `REASON_LAG` if the server is overloaded, None otherwise.
+        """
+        if 0 < self.max_in_flight <= self._active:
+            return REASON_IN_FLIGHT
+        if self.lag_threshold_ms > 0:
+            monitor = get_loop_monitor()
+            if monitor is not None and monitor.lag * 1000 >= self.lag_threshold_ms:
+                return REASON_LAG
+        return None
+
+    def shed(self, route_class: str) -> str | None:
+        """
+        Decides whether work of a route class is shed, and counts it if so.
+
+        Args:
+            route_class (str): The route class of the work.
+
+        Returns:
+            str | None: The overload reason if the work is shed, None if it is admitted.
+        """
+        if route_class not in LOW_PRIORITY:
+            return None
+        reason = self.overload()
+        if reason is not None:
+            with self._lock:
+                self._shed[route_class, reason] = self._shed.get((route_class, reason), 0) + 1
+        return reason
+
+    def enter(self, route_class: str) -> None:
+        """
+        Counts an admitted request of a route class as in flight.
+
+        Args:
+            route_class (str): The route class of the request.
+        """
+        self._in_flight[route_class] = self._in_flight.get(route_class, 0) + 1
+        if route_class != STREAM:
+            self._active += 1
+
+    def leave(self, route_class: str) -> None:
+        """
+        Counts a request of a route class as completed.
+
+        Args:
+            route_class (str): The route class of the request.
+        """
+        self._in_flight[route_class] -= 1
+        if route_class != STREAM:
+            self._active -= 1
+
+    def in_flight(self) -> dict[str, int]:
+        """
+        Returns the requests in flight per route class.
+
+        Returns:
+            dict[str, int]: Route class -> requests in flight.
+        """
+        return self._in_flight.copy()
+
+    def stats(self) -> dict[tuple[str, str], int]:
+        """
+        Returns the shed work per route class and overload reason.
+
+        Returns:
+            dict[tuple[str, str], int]: (route class, reason) -> shed requests.
+        """
+        with self._lock:
+            return self._shed.copy()
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware that rejects low-priority requests while the server is overloaded.
+
+    Every HTTP request and websocket connection is classified and counted in flight by the
+    `AdmissionController`. Low-priority requests arriving while the server is overloaded are
+    answered with 503 and a `Retry-After` header before authentication, routing or any handler
+    runs, so they add as little load as possible. Logins from a browser form get the page built by
+    `login_page`, like logins rejected by a busy password pool; other requests get JSON.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application.
+        login_page (Callable[..., Response] | None): Renders the login page with an error, called as
+            `login_page(request, error, status_code=..., headers=...)`; None answers browser logins with JSON too.
+    """
+
+    def __init__(self, app: ASGIApp, login_page: Callable[..., Response] | None = None) -> None:
+        self.app = app
+        self.login_page = login_page
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        route_class = STREAM if scope["type"] == "websocket" else controller.classify(HTTPConnection(scope))
+        reason = controller.shed(route_class)
+        if reason is not None:
+            logger.debug("Shed [{}] {} ({}): overloaded ({})", scope["method"], scope["path"], route_class, reason)
+            response = self.shed_response(scope, route_class, controller.retry_after)
+            await response(scope, receive, send)
+            return
+
+        controller.enter(route_class)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.leave(route_class)
+
+    def shed_response(self, scope: Scope, route_class: str, retry_after: int) -> Response:
+        """
+        Builds the 503 response for shed work.
+
+        Args:
+            scope (Scope): The ASGI scope of the shed request.
+            route_class (str): The route class of the request.
+            retry_after (int): Seconds the client is asked to wait before retrying.
+
+        Returns:
+            Response: The login page with an error for browser logins, a JSON error otherwise.
+        """
+        message = "Server is busy, please try again"
+        headers = {"Retry-After": str(retry_after)}
+        if route_class == LOGIN and self.login_page is not None:
+            request = Request(scope)
+            if is_browser_request(request):
+                return self.login_page(request, message, status_code=503, headers=headers)
+        return JSONResponse({"detail": message}, status_code=503, headers=headers)
+
+
+# Singleton
+_admission_controller: AdmissionController | None = None
+
+
+def initialize_admission_controller(controller: AdmissionController | None) -> None:
+    """
+    Initializes the global admission controller.
+
+    Args:
+        controller (AdmissionController | None): The controller to use, or None to build it from the settings on
+            next use.
+    """
+    global _admission_controller
+    _admission_controller = controller
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    Retrieve the process-wide admission controller, creating it from settings on first use.
+
+    Returns:
+        AdmissionController: The admission controller instance.
+    """
+    global _admission_controller
+    if _admission_controller is None:
+        settings = get_settings()
+        _admission_controller = AdmissionController(
+            max_in_flight=settings.admission_max_in_flight,
+            lag_threshold_ms=settings.admission_lag_threshold_ms,
+            retry_after=settings.admission_retry_after,
+        )
+    return _admission_controller
@@ -0,0 +1,181 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...core.http_cache import accepts_encoding, brotli
+
+# Bodies smaller than this gain less from compression than the headers and CPU cost
+DEFAULT_MINIMUM_SIZE = 500
+
+# Per-request compression levels: fast settings, unlike the precompressed static files
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+# Media types worth compressing (prefix match); images, archives and fonts are already compressed
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/manifest+json",
+    "image/svg+xml",
+)
+
+# Streams whose events must reach the client immediately (Gradio's SSE queue)
+EXCLUDED_MEDIA_TYPES = ("text/event-stream",)
+
+
+class _GzipEncoder:
+    """Incremental gzip encoder that flushes after every chunk."""
+
+    __slots__ = ("_compressor",)
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        """
+        Compresses a chunk and flushes it, so the client can decode everything sent so far.
+
+        Args:
+            data (bytes): The next chunk of the body.
+            final (bool): Whether this is the last chunk; the stream is then terminated.
+
+        Returns:
+            bytes: The compressed bytes to send.
+        """
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    """Incremental brotli encoder that flushes after every chunk."""
+
+    __slots__ = ("_compressor",)
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        """
+        Compresses a chunk and flushes it, so the client can decode everything sent so far.
+
+        Args:
+            data (bytes): The next chunk of the body.
+            final (bool): Whether this is the last chunk; the stream is then terminated.
+
+        Returns:
+            bytes: The compressed bytes to send.
+        """
+        return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses HTTP responses with brotli or gzip, as negotiated.
+
+    Unlike Starlette's `GZipMiddleware` it never holds back streamed output: each chunk of a streaming response is
+    compressed and flushed as it is sent. Server-sent events, websockets, HEAD requests, bodies that are already
+    encoded, partial (range) responses, `no-transform` responses and media types that do not compress well are passed
+    through untouched. Single-chunk bodies smaller than `minimum_size` are also sent as they are.
+
+    Brotli is preferred when the client accepts it and the optional `brotli` package is installed.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application.
+        minimum_size (int): Smallest complete body, in bytes, that is compressed.
+        gzip_level (int): zlib compression level.
+        brotli_quality (int): Brotli quality.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        coding = None
+        if scope["type"] == "http" and scope["method"] != "HEAD":
+            accept_encoding = Headers(scope=scope).get("accept-encoding")
+            if brotli is not None and accepts_encoding(accept_encoding, "br"):
+                coding = "br"
+            elif accepts_encoding(accept_encoding, "gzip"):
+                coding = "gzip"
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Replaced by the `http.response.start` message before any body message is sent
+        start_message: Message = {}
+        encoder: _GzipEncoder | _BrotliEncoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if self._is_compressible(message):
+                    # Hold the headers back until the first body chunk shows whether compression pays off
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if message["type"] != "http.response.body" or (not more_body and len(body) < self.minimum_size):
+                    # E.g. `http.response.pathsend`, or a body too small to compress
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                encoder = _BrotliEncoder(self.brotli_quality) if coding == "br" else _GzipEncoder(self.gzip_level)
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+                # The encoded bytes are not those the (strong) validator was computed for
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                compressed = encoder.encode(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(compressed))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+                return
+
+            compressed = encoder.encode(body, final=not more_body)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _is_compressible(start_message: Message) -> bool:
+        """
+        Checks the status and headers of a response for whether its body may be compressed.
+        """
+        if start_message["status"] < 200 or start_message["status"] in (204, 206, 304):
+            return False
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers or "content-range" in headers:
+            # Already encoded, or a byte range whose Content-Range refers to the unencoded body
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        if content_type.startswith(EXCLUDED_MEDIA_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
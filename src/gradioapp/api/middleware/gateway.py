@@ -0,0 +1,396 @@
+import asyncio
+from contextlib import suppress
+import time
+
+from loguru import logger
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...core.logging import REQUEST_ID_HEADER, new_request_id, request_id_var
+from ...core.metrics import get_request_metrics
+from ...domain.auth import verify_token
+from ...domain.csrf import CSRF_HEADER, UNSAFE_METHODS, validate_csrf_token
+from ...domain.session.revocation import get_revocation_hub
+from ...domain.session.scoped import RequestSession
+from ...domain.session.store import get_session_store
+from .sampling import get_request_log_sampler
+from .utils import (
+    RouteAccess,
+    classify_route,
+    create_unauthorized_response,
+    is_stream_request,
+    route_template,
+)
+
+# Close code sent to websocket clients that fail authentication (RFC 6455: policy violation)
+WS_POLICY_VIOLATION = 1008
+
+# Default interval in seconds between session re-validations of open streams
+DEFAULT_STREAM_REVALIDATE_INTERVAL = 30.0
+
+# Close code of a websocket ended by a server error (RFC 6455: internal error)
+WS_INTERNAL_ERROR = 1011
+
+_REQUEST_ID_HEADER = REQUEST_ID_HEADER.lower().encode("latin-1")
+
+# Request log line; values are passed as keyword arguments, so they are separate fields in JSON logs
+REQUEST_LOG_MESSAGE = (
+    "[{method}] {path} | status={status} | user_id={user_id} session_id={session_id} | {duration_ms:.2f} ms"
+)
+
+
+class GatewayMiddleware:
+    """
+    Pure ASGI middleware that authenticates, resolves the session and logs every request in one pass.
+
+    It replaces the former `AuthMiddleware`, `SessionMiddleware` and `LoggingMiddleware` stack, which
+    were built on `BaseHTTPMiddleware`. Running as a plain ASGI callable avoids the per-layer task
+    group and response-body wrapping, leaves streaming (SSE) responses untouched and applies to
+    websocket connections as well as HTTP requests.
+
+    For every `http` and `websocket` scope the middleware classifies the path with `classify_route`:
+    - Skips authentication for public paths.
+    - Verifies the "access_token" cookie using `verify_token`.
+    - For full (session) routes, checks that the session referenced by the token exists in the
+      session store. Token-only routes, such as immutable Gradio assets, skip the store lookup.
+    - Attaches the user ID and session ID to the connection state (`request.state`). For session
+      routes the resolved session is attached as a `RequestSession` (`request.state.session`), so
+      handlers reuse it without another store round trip; its pending writes are flushed once
+      when the request completes successfully.
+    - Assigns a request ID, taken from a valid `X-Request-ID` header or generated, stores it in
+      `request_id_var` (so every log record of the request carries it), in the connection state
+      (`request.state.request_id`) and echoes it in the `X-Request-ID` response header.
+    - Logs method, path, status code, user ID, session ID and duration, including exceptions; the
+      values are passed as keyword arguments, so they are separate fields in JSON logs. Successful
+      requests are sampled per route by the `RequestLogSampler`; errors and slow requests are
+      always logged.
+    - Records the status code and duration of HTTP requests per route template in the request
+      metrics (`core/metrics.py`), which are served at `/metrics`.
+
+    Unauthenticated HTTP requests receive `create_unauthorized_response`; unauthenticated websocket
+    handshakes are closed with code 1008, which the server turns into a 403 response.
+
+    Long-lived streams (websockets and SSE, see `is_stream_request`) are authenticated once when they
+    open; the identity stays cached in the connection state. While the stream is open the session is
+    re-validated every `stream_revalidate_interval` seconds, and immediately when the session is
+    revoked through the `SessionRevocationHub`. A revoked or expired session closes the stream.
+
+    Authenticated POST/PUT/PATCH/DELETE requests under `csrf_protected_prefixes` must also carry an
+    `X-CSRF-Token` header matching the CSRF nonce cookie (see `domain/csrf.py`); otherwise they are
+    rejected with 403.
+
+    Attributes:
+        app (ASGIApp): The wrapped ASGI application.
+        stream_revalidate_interval (float): Seconds between session re-validations of open streams.
+        csrf_protected_prefixes (tuple[str, ...]): Path prefixes whose unsafe requests require a CSRF token.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        stream_revalidate_interval: float = DEFAULT_STREAM_REVALIDATE_INTERVAL,
+        csrf_protected_prefixes: tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.stream_revalidate_interval = stream_revalidate_interval
+        self.csrf_protected_prefixes = csrf_protected_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        connection = HTTPConnection(scope)
+        method = scope.get("method", "WS")
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        status_code = 101 if scope["type"] == "websocket" else 500
+        response_started = False
+        response_finished = False
+        request_id = new_request_id(connection.headers.get(REQUEST_ID_HEADER))
+        connection.state.request_id = request_id
+        request_id_token = request_id_var.set(request_id)
+        request_id_header = (_REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        stream = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started, response_finished
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            elif message["type"] == "http.response.body":
+                response_finished = not message.get("more_body", False)
+            elif message["type"] == "websocket.accept":
+                response_started = True
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+            elif message["type"] == "websocket.close":
+                status_code = message.get("code", 1000)
+                response_finished = True
+            await send(message)
+
+        try:
+            access = classify_route(path)
+            error_message = None if access is RouteAccess.PUBLIC else self._authenticate(connection, access)
+            if error_message:
+                await self._reject(connection, error_message, receive, send_wrapper)
+            elif not self._check_csrf_token(connection):
+                response = JSONResponse({"detail": "CSRF token missing or invalid"}, status_code=403)
+                await response(scope, receive, send_wrapper)
+            elif stream := access is RouteAccess.SESSION and is_stream_request(connection):
+                revoked = await self._run_stream(connection, receive, send_wrapper)
+                if revoked and not response_finished:
+                    await self._close_stream(connection, response_started, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+            request_session = getattr(connection.state, "session", None)
+            if request_session is not None:
+                request_session.close()
+        except Exception:
+            # Catching generic Exception is intentional here for logging middleware:
+            # - Must catch ALL exceptions to log them with context before re-raising
+            # - Cannot use specific exceptions as we don't know what exceptions handlers may raise
+            # - Re-raises the exception after logging to maintain normal error propagation
+            duration = (time.perf_counter() - start_time) * 1000
+            self._record_metrics(scope, root_path, status_code, duration)
+            user_id = getattr(connection.state, "user_id", "anonymous")
+            session_id = getattr(connection.state, "session_id", "n/a")
+            logger.exception(
+                "[{method}] {path} | user_id={user_id} session_id={session_id} | Exception after {duration_ms:.2f} ms",
+                method=method,
+                path=path,
+                user_id=user_id,
+                session_id=session_id,
+                duration_ms=duration,
+            )
+            raise
+        else:
+            duration = (time.perf_counter() - start_time) * 1000
+            self._record_metrics(scope, root_path, status_code, duration)
+            self._log_request(connection, root_path, status_code, duration, stream)
+        finally:
+            request_id_var.reset(request_id_token)
+
+    @staticmethod
+    def _log_request(
+        connection: HTTPConnection, root_path: str, status_code: int, duration: float, stream: bool
+    ) -> None:
+        """
+        Logs a completed request, unless the request log sampler suppresses it.
+
+        Server errors and slow requests (streams excepted, they are long by design) are logged as
+        warnings, client errors and rejected websockets always at debug level. Other requests are
+        sampled per route template; the decision is taken before any message is formatted.
+
+        Args:
+            connection (HTTPConnection): The completed HTTP request or websocket connection.
+            root_path (str): The `root_path` of the scope before routing.
+            status_code (int): The HTTP status, or the websocket close code.
+            duration (float): The request duration in milliseconds.
+            stream (bool): Whether the request was a long-lived stream (SSE or websocket).
+        """
+        scope = connection.scope
+        if scope["type"] == "websocket":
+            client_error = status_code not in (101, 1000, 1001)
+            server_error = status_code == WS_INTERNAL_ERROR
+        else:
+            client_error = 400 <= status_code < 500
+            server_error = status_code >= 500
+        sampler = get_request_log_sampler()
+        message = REQUEST_LOG_MESSAGE
+        suppressed = 0
+        if server_error:
+            log = logger.warning
+        elif not stream and sampler.is_slow(duration):
+            log = logger.warning
+            message += " | slow"
+        elif client_error:
+            log = logger.debug
+        else:
+            suppressed = sampler.sample(route_template(scope, root_path))
+            if suppressed is None:
+                return
+            log = logger.debug
+            if suppressed:
+                message += " | {suppressed} similar request(s) not logged"
+        log(
+            message,
+            method=scope.get("method", "WS"),
+            path=scope["path"],
+            status=status_code,
+            user_id=getattr(connection.state, "user_id", "anonymous"),
+            session_id=getattr(connection.state, "session_id", "n/a"),
+            duration_ms=duration,
+            suppressed=suppressed,
+        )
+
+    @staticmethod
+    def _record_metrics(scope: Scope, root_path: str, status_code: int, duration: float) -> None:
+        """
+        Feeds the status and duration (in milliseconds) of an HTTP request into the request metrics.
+        """
+        if scope["type"] == "http":
+            get_request_metrics().observe(
+                scope["method"], route_template(scope, root_path), status_code, duration / 1000
+            )
+
+    def _check_csrf_token(self, connection: HTTPConnection) -> bool:
+        """
+        Checks the `X-CSRF-Token` header of unsafe HTTP requests under a CSRF-protected prefix.
+
+        Args:
+            connection (HTTPConnection): The authenticated HTTP request or websocket connection.
+
+        Returns:
+            bool: False if the request needs a CSRF token and does not carry a valid one, True otherwise.
+        """
+        scope = connection.scope
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in UNSAFE_METHODS
+            or not scope["path"].startswith(self.csrf_protected_prefixes)
+        ):
+            return True
+        if validate_csrf_token(connection.headers.get(CSRF_HEADER), connection):
+            return True
+        logger.warning(f"CSRF token missing or invalid for [{scope['method']}] {scope['path']}")
+        return False
+
+    def _authenticate(self, connection: HTTPConnection, access: RouteAccess) -> str | None:
+        """
+        Verifies the access token and session of a connection and stores the identity in its state.
+
+        Args:
+            connection (HTTPConnection): The incoming HTTP request or websocket connection.
+            access (RouteAccess): The access tier of the path; the session store is only
+                consulted for `RouteAccess.SESSION`.
+
+        Returns:
+            str | None: An error message if authentication fails, None otherwise.
+        """
+        token = connection.cookies.get("access_token")
+        if not token:
+            logger.warning("No access token found. Redirecting to /login.")
+            return "Missing access token"
+
+        payload = verify_token(token)
+        if not payload:
+            logger.warning("Invalid access token. Redirecting to /login.")
+            return "Invalid or expired token"
+
+        session_id = payload.get("session_id")
+        if not session_id:
+            logger.warning("Session ID not found in access token.")
+            return "Missing session ID"
+
+        if access is RouteAccess.SESSION:
+            session = get_session_store().get_session(session_id)
+            if not session:
+                logger.warning(f"Session data not found for session ID: {session_id}")
+                return "Session expired or not found"
+            connection.state.session = RequestSession(session_id, session)
+
+        connection.state.user_id = payload.get("sub")
+        connection.state.session_id = session_id
+        logger.debug(
+            "Access verified ({}) for user {}, session_id {}", access.value, connection.state.user_id, session_id
+        )
+        return None
+
+    async def _reject(self, connection: HTTPConnection, error_message: str, receive: Receive, send: Send) -> None:
+        """
+        Sends the unauthorized response appropriate for the connection type.
+
+        Args:
+            connection (HTTPConnection): The rejected HTTP request or websocket connection.
+            error_message (str): The reason for the rejection.
+            receive (Receive): The ASGI receive callable.
+            send (Send): The ASGI send callable.
+        """
+        if connection.scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": WS_POLICY_VIOLATION, "reason": error_message})
+            return
+        response = create_unauthorized_response(connection, error_message)
+        await response(connection.scope, receive, send)
+
+    async def _run_stream(self, connection: HTTPConnection, receive: Receive, send: Send) -> bool:
+        """
+        Runs a long-lived stream while watching its session for revocation or expiry.
+
+        Args:
+            connection (HTTPConnection): The authenticated stream connection.
+            receive (Receive): The ASGI receive callable.
+            send (Send): The ASGI send callable.
+
+        Returns:
+            bool: True if the stream was stopped because its session is no longer valid,
+                False if the application finished the stream on its own.
+        """
+        session_id = connection.state.session_id
+        loop = asyncio.get_running_loop()
+        revoked = asyncio.Event()
+
+        def on_revoke() -> None:
+            loop.call_soon_threadsafe(revoked.set)
+
+        hub = get_revocation_hub()
+        hub.subscribe(session_id, on_revoke)
+        app_task = asyncio.ensure_future(self.app(connection.scope, receive, send))
+        watcher_task = asyncio.ensure_future(self._watch_session(session_id, revoked))
+        try:
+            done, _ = await asyncio.wait({app_task, watcher_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            hub.unsubscribe(session_id, on_revoke)
+            watcher_task.cancel()
+            if not app_task.done():
+                app_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await app_task
+
+        if app_task in done:
+            app_task.result()
+            return False
+        logger.info(f"Stream {connection.scope['path']} closed: session {session_id} revoked or expired")
+        return True
+
+    async def _watch_session(self, session_id: str, revoked: asyncio.Event) -> None:
+        """
+        Waits until the session is revoked or found invalid on periodic re-validation.
+
+        Args:
+            session_id (str): The session ID to watch.
+            revoked (asyncio.Event): Event set when a revocation is published for the session.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(revoked.wait(), timeout=self.stream_revalidate_interval)
+                return
+            except TimeoutError:
+                if not get_session_store().get_session(session_id):
+                    return
+
+    async def _close_stream(
+        self,
+        connection: HTTPConnection,
+        response_started: bool,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """
+        Terminates a stream whose session is no longer valid.
+
+        Args:
+            connection (HTTPConnection): The stream connection.
+            response_started (bool): Whether the response (or websocket handshake) was already sent.
+            receive (Receive): The ASGI receive callable.
+            send (Send): The ASGI send callable.
+        """
+        if connection.scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": WS_POLICY_VIOLATION, "reason": "Session revoked"})
+            return
+        if not response_started:
+            await self._reject(connection, "Session expired or not found", receive, send)
+            return
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
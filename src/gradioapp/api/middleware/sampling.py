@@ -0,0 +1,114 @@
+from typing import Mapping
+
+from ...config import get_settings
+
+
+class RequestLogSampler:
+    """
+    Decides which completed requests get a request log line.
+
+    Requests are sampled per route template: a route with rate 0.1 logs one request in ten. The
+    choice is deterministic: the first request of a route is logged, then one whenever the
+    accumulated rate reaches a whole request, so a route's log lines are evenly spread. A rate of
+    1 logs every request, 0 none. The number of requests suppressed since the last logged one is
+    returned with the decision, and the totals per route are kept for the metrics.
+
+    Errors and slow requests are not sampled; `GatewayMiddleware` logs them before asking the
+    sampler. Sampling runs on the event loop thread, so the counters take no lock.
+
+    Attributes:
+        rate (float): Fraction of the requests logged, for routes without their own rate.
+        route_rates (Mapping[str, float]): Rates of specific route templates, e.g. `/gradio/gradio_api/queue/data`.
+        slow_threshold_ms (float): Duration in milliseconds from which a request is always logged (0 disables).
+    """
+
+    def __init__(
+        self, rate: float = 1.0, route_rates: Mapping[str, float] | None = None, slow_threshold_ms: float = 0.0
+    ) -> None:
+        self.rate = rate
+        self.route_rates = dict(route_rates or {})
+        self.slow_threshold_ms = slow_threshold_ms
+        # Route -> accumulated rate since the last logged request
+        self._credits: dict[str, float] = {}
+        # Route -> requests suppressed since the last logged request
+        self._pending: dict[str, int] = {}
+        # Route -> requests suppressed in total
+        self._suppressed: dict[str, int] = {}
+
+    def is_slow(self, duration_ms: float) -> bool:
+        """
+        Checks whether a request took at least `slow_threshold_ms`.
+
+        Args:
+            duration_ms (float): The request duration in milliseconds.
+
+        Returns:
+            bool: True if the request is slow and must be logged.
+        """
+        return 0 < self.slow_threshold_ms <= duration_ms
+
+    def sample(self, route: str) -> int | None:
+        """
+        Decides whether a successful request to a route is logged.
+
+        Args:
+            route (str): The route template of the request.
+
+        Returns:
+            int | None: None if the request is not logged, otherwise the number of requests to the
+                route suppressed since the last logged one.
+        """
+        rate = self.route_rates.get(route, self.rate)
+        if rate >= 1.0:
+            return 0
+        if rate > 0.0:
+            credit = self._credits.get(route, 1.0 - rate) + rate
+            if credit >= 1.0:
+                self._credits[route] = credit - 1.0
+                return self._pending.pop(route, 0)
+            self._credits[route] = credit
+        self._pending[route] = self._pending.get(route, 0) + 1
+        self._suppressed[route] = self._suppressed.get(route, 0) + 1
+        return None
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the number of suppressed request log lines per route template.
+
+        Returns:
+            dict[str, int]: Route template -> suppressed requests.
+        """
+        return self._suppressed.copy()
+
+
+# Singleton
+_request_log_sampler: RequestLogSampler | None = None
+
+
+def initialize_request_log_sampler(sampler: RequestLogSampler | None) -> None:
+    """
+    Initializes the global request log sampler.
+
+    Args:
+        sampler (RequestLogSampler | None): The sampler to use, or None to build it from the settings on next use.
+    """
+    global _request_log_sampler
+    _request_log_sampler = sampler
+
+
+def get_request_log_sampler() -> RequestLogSampler:
+    """
+    Retrieve the process-wide request log sampler, creating it from settings on first use.
+
+    Returns:
+        RequestLogSampler: The request log sampler instance.
+    """
+    global _request_log_sampler
+    if _request_log_sampler is None:
+        settings = get_settings()
+        _request_log_sampler = RequestLogSampler(
+            rate=settings.log_sample_rate,
+            route_rates=dict(settings.log_sample_routes),
+            slow_threshold_ms=settings.log_slow_request_ms,
+        )
+    return _request_log_sampler
@@ -1,48 +1,195 @@
-from fastapi import Request
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable
+
 from fastapi.responses import JSONResponse, RedirectResponse, Response
-from loguru import logger
-import pathspec
+from starlette.requests import HTTPConnection
+from starlette.types import Scope
+
+from ...config import Settings, get_settings
+from ...core.metrics import UNMATCHED_ROUTE
 
+# Public paths: no authentication at all.
+# Patterns are exact paths or prefixes ending with `*`; override with the ALLOWED_PATHS setting.
 ALLOWED_PATHS = [
     "/login",
     "/logout",
     "/healthz",
+    "/readyz",
+    "/metrics",
     "/favicon.ico",
     "/static/*",
     "/manifest.json",
 ]
 
-# Cache for PathSpec instance
-_pathspec_cache: pathspec.PathSpec | None = None
+# Token-only paths: a valid JWT is required, but the session store is not consulted.
+# Immutable Gradio assets (JS/CSS/fonts/icons) and the UI config fetched on every page load.
+# Override with the TOKEN_ONLY_PATHS setting.
+TOKEN_ONLY_PATHS = [
+    "/gradio/assets/*",
+    "/gradio/static/*",
+    "/gradio/svelte/*",
+    "/gradio/favicon.ico",
+    "/gradio/theme.css",
+    "/gradio/robots.txt",
+    "/gradio/manifest.json",
+    "/gradio/pwa_icon*",
+    "/gradio/config",
+]
+
+# Path suffixes of long-lived Gradio queue streams (Server-Sent Events)
+STREAM_PATH_SUFFIXES = ("/queue/data",)
+
+
+class RouteAccess(Enum):
+    """
+    Access tier of a route.
+
+    Attributes:
+        PUBLIC: No authentication.
+        TOKEN: JWT verified, no session store lookup.
+        SESSION: JWT verified and live session required.
+    """
+
+    PUBLIC = "public"
+    TOKEN = "token"
+    SESSION = "session"
+
+
+class PathMatcher:
+    """
+    Compiled matcher for exact paths and prefix patterns.
+
+    Patterns ending with `*` match every path starting with the text before the `*`
+    (e.g. `/static/*` matches `/static/css/style.css`); all other patterns match exactly.
+    Exact paths are kept in a frozen set and prefixes in a sorted tuple, so a match is a set
+    lookup plus a single `str.startswith` call.
+
+    Attributes:
+        _exact (frozenset[str]): Exact paths.
+        _prefixes (tuple[str, ...]): Sorted path prefixes.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        exact = set()
+        prefixes = set()
+        for pattern in patterns:
+            if "*" in pattern[:-1]:
+                raise ValueError(f"Unsupported path pattern {pattern!r}: '*' is only allowed at the end")
+            if pattern.endswith("*"):
+                prefixes.add(pattern[:-1])
+            else:
+                exact.add(pattern)
+        self._exact = frozenset(exact)
+        self._prefixes = tuple(sorted(prefixes))
+
+    def matches(self, path: str) -> bool:
+        """
+        Checks if the path matches any exact path or prefix.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            bool: True if the path matches, False otherwise.
+        """
+        return path in self._exact or path.startswith(self._prefixes)
+
+
+class RouteClassifier:
+    """
+    Classifies request paths into access tiers using compiled path matchers.
+
+    Public patterns take precedence over token-only patterns; any other path requires a full
+    JWT plus live session check. Results for recently seen paths are kept in a bounded LRU cache.
+
+    Attributes:
+        _public (PathMatcher): Compiled public path patterns.
+        _token (PathMatcher): Compiled token-only path patterns.
+        _cached_classify (Callable[[str], RouteAccess]): LRU-cached classification function.
+    """
+
+    def __init__(self, public_patterns: Iterable[str], token_patterns: Iterable[str], cache_size: int = 1024) -> None:
+        self._public = PathMatcher(public_patterns)
+        self._token = PathMatcher(token_patterns)
+        self._cached_classify = lru_cache(maxsize=cache_size)(self._match)
+
+    def classify(self, path: str) -> RouteAccess:
+        """
+        Returns the access tier of the given path.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            RouteAccess: The access tier of the path.
+        """
+        return self._cached_classify(path)
+
+    def _match(self, path: str) -> RouteAccess:
+        if self._public.matches(path):
+            return RouteAccess.PUBLIC
+        if self._token.matches(path):
+            return RouteAccess.TOKEN
+        return RouteAccess.SESSION
+
+
+def build_route_classifier(settings: Settings) -> RouteClassifier:
+    """
+    Builds a route classifier from settings, falling back to the built-in path lists.
+
+    Args:
+        settings (Settings): Application settings; `allowed_paths` and `token_only_paths`
+            replace `ALLOWED_PATHS` and `TOKEN_ONLY_PATHS` when not empty.
+
+    Returns:
+        RouteClassifier: The compiled route classifier.
+    """
+    return RouteClassifier(
+        settings.allowed_paths or ALLOWED_PATHS,
+        settings.token_only_paths or TOKEN_ONLY_PATHS,
+    )
+
+
+# Cache for RouteClassifier instance
+_route_classifier: RouteClassifier | None = None
+
+
+def classify_route(path: str) -> RouteAccess:
+    """
+    Classifies the given path using the allowlists configured in settings.
+
+    Args:
+        path (str): The request path.
+
+    Returns:
+        RouteAccess: The access tier of the path.
+    """
+    global _route_classifier
+    if _route_classifier is None:
+        _route_classifier = build_route_classifier(get_settings())
+    return _route_classifier.classify(path)
 
 
 def is_path_allowed(path: str) -> bool:
     """
-    Checks if the given path matches any of the allowed path patterns.
+    Checks if the given path matches any of the allowed (public) path patterns.
 
     Args:
         path (str): The file path to check against the allowed patterns.
 
     Returns:
         bool: True if the path matches any allowed pattern, False otherwise.
-
-    Logs:
-        Logs the result of the pattern matching at the trace level.
     """
-    global _pathspec_cache
-    if _pathspec_cache is None:
-        _pathspec_cache = pathspec.PathSpec.from_lines("gitwildmatch", ALLOWED_PATHS)
-    match = _pathspec_cache.match_file(path)
-    logger.trace(f"Checking if path {path} matches allowed patterns: {match}")
-    return match
+    return classify_route(path) is RouteAccess.PUBLIC
 
 
-def is_browser_request(request: Request) -> bool:
+def is_browser_request(request: HTTPConnection) -> bool:
     """
     Checks if the request is from a browser (HTML request) or API.
 
     Args:
-        request (Request): The incoming HTTP request.
+        request (HTTPConnection): The incoming HTTP request.
 
     Returns:
         bool: True if the request is from a browser (Accept: text/html), False otherwise.
@@ -51,7 +198,50 @@ def is_browser_request(request: Request) -> bool:
     return "text/html" in accept_header
 
 
-def create_unauthorized_response(request: Request, error_message: str, redirect_url: str = "/login") -> Response:
+def is_stream_request(connection: HTTPConnection) -> bool:
+    """
+    Checks if the connection is a long-lived stream (websocket or Server-Sent Events).
+
+    Args:
+        connection (HTTPConnection): The incoming HTTP request or websocket connection.
+
+    Returns:
+        bool: True for websockets, SSE requests (Accept: text/event-stream) and Gradio queue streams.
+    """
+    if connection.scope["type"] == "websocket":
+        return True
+    if connection.scope["path"].endswith(STREAM_PATH_SUFFIXES):
+        return True
+    return "text/event-stream" in connection.headers.get("accept", "")
+
+
+def route_template(scope: Scope, root_path: str = "") -> str:
+    """
+    Returns the route template a request was dispatched to, for use as a low-cardinality metric label.
+
+    FastAPI stores the matched route in the scope, including routes of mounted apps such as Gradio,
+    whose `root_path` then carries the mount prefix. Mounts without routes (e.g. static files) are
+    labeled with their prefix and `/*`.
+
+    Args:
+        scope (Scope): The ASGI scope after the request was handled.
+        root_path (str): The `root_path` of the scope before routing.
+
+    Returns:
+        str: The template, e.g. `/login`, `/gradio/config` or `/static/*`, or `UNMATCHED_ROUTE` if the
+            request reached no route (unknown paths, requests rejected by the gateway).
+    """
+    mount_path = scope.get("root_path", "")[len(root_path) :]
+    route = scope.get("route")
+    route_path = getattr(route, "path", None)
+    if route_path is not None:
+        return mount_path + route_path
+    if mount_path:
+        return f"{mount_path}/*"
+    return UNMATCHED_ROUTE
+
+
+def create_unauthorized_response(request: HTTPConnection, error_message: str, redirect_url: str = "/login") -> Response:
     """
     Creates an appropriate unauthorized response based on the request type.
 
@@ -59,7 +249,7 @@ def create_unauthorized_response(request: Request, error_message: str, redirect_
     For API requests, returns a JSONResponse with error details.
 
     Args:
-        request (Request): The incoming HTTP request.
+        request (HTTPConnection): The incoming HTTP request.
         error_message (str): The error message to include in the response.
         redirect_url (str): The URL to redirect to for browser requests. Defaults to "/login".
 
@@ -1,11 +1,13 @@
 from .health import router as health_router
 from .home import router as home_router
 from .login import router as login_router
+from .metrics import router as metrics_router
 from .static import router as static_router
 
 __all__ = [
     "health_router",
     "home_router",
     "login_router",
+    "metrics_router",
     "static_router",
 ]
@@ -1,7 +1,31 @@
-from fastapi import APIRouter
+import asyncio
+import time
+from typing import Any
+import uuid
+
+import anyio.to_thread
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+from loguru import logger
+
+from ...config import get_settings
+from ...core.cache import TTLCache
+from ...core.loop_monitor import get_loop_monitor
+from ...domain.password_pool import get_password_pool
+from ...domain.rate_limit import get_login_rate_limiter
+from ...domain.session.store import get_session_store
 
 router = APIRouter()
 
+# Probe outcomes, from best to worst
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_FAIL = "fail"
+_SEVERITY = {STATUS_OK: 0, STATUS_DEGRADED: 1, STATUS_FAIL: 2}
+
+# Last readiness result, shared by all pollers until it expires
+_readiness_cache: TTLCache[str, dict[str, Any]] | None = None
+
 
 @router.get("/healthz", tags=["Health"])
 async def health_check() -> dict[str, str]:
@@ -12,3 +36,183 @@ async def health_check() -> dict[str, str]:
         dict: A dictionary indicating the service status.
     """
     return {"status": "ok"}
+
+
+@router.get("/healthz/login-limiter", tags=["Health"])
+async def login_limiter_stats() -> dict[str, int]:
+    """
+    Login rate limiter counters (requires an authenticated session).
+
+    Returns:
+        dict: Allowed, rejected and evicted counts and the number of tracked buckets, per IP and per account.
+    """
+    return get_login_rate_limiter().stats()
+
+
+def get_readiness_cache() -> TTLCache[str, dict[str, Any]]:
+    """
+    Retrieve the cache of the last readiness result, creating it on first use.
+
+    Returns:
+        TTLCache[str, dict[str, Any]]: A single-entry cache expiring after `READYZ_CACHE_TTL` seconds.
+    """
+    global _readiness_cache
+    if _readiness_cache is None:
+        _readiness_cache = TTLCache(maxsize=1, ttl=get_settings().readyz_cache_ttl)
+    return _readiness_cache
+
+
+def get_readiness_lock(app: FastAPI) -> asyncio.Lock:
+    """
+    Retrieve the lock that lets concurrent pollers share one probe run, creating it on first use.
+
+    The lock lives in the app state rather than in the module: an asyncio lock belongs to the event
+    loop it was first used on, and an app can be served by several loops (a restarted server, test
+    clients). The lifespan replaces it on every start.
+
+    Args:
+        app (FastAPI): The application.
+
+    Returns:
+        asyncio.Lock: The readiness lock of the app.
+    """
+    lock = getattr(app.state, "readiness_lock", None)
+    if lock is None:
+        lock = app.state.readiness_lock = asyncio.Lock()
+    return lock
+
+
+def _threshold_status(value: float, limit: float) -> str:
+    return STATUS_DEGRADED if value > limit else STATUS_OK
+
+
+def probe_session_store() -> dict[str, Any]:
+    """
+    Creates, reads back and deletes a throwaway session, timing the round trip.
+
+    Returns:
+        dict[str, Any]: The probe status and `latency_ms`; "fail" if the store raises or loses the session.
+    """
+    session_id = f"readyz-{uuid.uuid4().hex}"
+    store = get_session_store()
+    start_time = time.perf_counter()
+    try:
+        store.create_session(session_id=session_id, username="readyz", data={})
+        found = store.get_session(session_id) is not None
+        store.delete_session(session_id)
+    except Exception as error:  # Any store failure means the instance cannot serve sessions
+        logger.error(f"Readiness: session store probe failed: {error}")
+        return {"status": STATUS_FAIL, "error": str(error)}
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    if not found:
+        return {"status": STATUS_FAIL, "error": "session not found after create"}
+    return {
+        "status": _threshold_status(latency_ms, get_settings().readyz_session_store_max_ms),
+        "latency_ms": round(latency_ms, 3),
+    }
+
+
+def probe_gradio(app: FastAPI) -> dict[str, Any]:
+    """
+    Checks that the Gradio Blocks are mounted and their startup events (queue, limiter) have run.
+
+    Args:
+        app (FastAPI): The application; `main.py` stores the mounted Blocks in `app.state.gradio_blocks`.
+
+    Returns:
+        dict[str, Any]: The probe status; "fail" if the Blocks are missing, not started or their queue stopped.
+    """
+    blocks = getattr(app.state, "gradio_blocks", None)
+    if blocks is None:
+        return {"status": STATUS_FAIL, "error": "Gradio app not mounted"}
+    if not blocks.is_running:
+        return {"status": STATUS_FAIL, "error": "Gradio app not started"}
+    queue = getattr(blocks, "_queue", None)
+    if queue is not None and queue.stopped:
+        return {"status": STATUS_FAIL, "error": "Gradio queue stopped"}
+    return {"status": STATUS_OK}
+
+
+def probe_event_loop() -> dict[str, Any]:
+    """
+    Reports the event loop lag last measured by the `LoopLagMonitor`.
+
+    The probe runs on the event loop itself, so timing anything here would only show that the loop
+    is free right now; the monitor's timer also catches the stalls that ended before this request.
+
+    Returns:
+        dict[str, Any]: The probe status and `lag_ms`; "ok" with `lag_ms` None if the monitor is disabled.
+    """
+    monitor = get_loop_monitor()
+    if monitor is None:
+        return {"status": STATUS_OK, "lag_ms": None}
+    lag_ms = monitor.lag * 1000
+    return {"status": _threshold_status(lag_ms, get_settings().readyz_loop_lag_max_ms), "lag_ms": round(lag_ms, 3)}
+
+
+def probe_thread_pools() -> dict[str, Any]:
+    """
+    Reports the utilization of the worker thread pools: AnyIO's (sync endpoints, Starlette file I/O)
+    and the password pool.
+
+    Returns:
+        dict[str, Any]: The probe status, `utilization` and `password_pool_utilization` (0-1).
+    """
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    utilization = statistics.borrowed_tokens / statistics.total_tokens
+    password_pool = get_password_pool()
+    password_pool_utilization = password_pool.pending / password_pool.max_pending
+    limit = get_settings().readyz_thread_pool_max_ratio
+    return {
+        "status": _threshold_status(max(utilization, password_pool_utilization), limit),
+        "utilization": round(utilization, 3),
+        "password_pool_utilization": round(password_pool_utilization, 3),
+    }
+
+
+async def check_readiness(app: FastAPI) -> dict[str, Any]:
+    """
+    Runs all readiness probes.
+
+    Args:
+        app (FastAPI): The application.
+
+    Returns:
+        dict[str, Any]: The overall `status` (the worst probe status) and the result of every probe in `checks`.
+    """
+    checks = {
+        "session_store": probe_session_store(),
+        "gradio": probe_gradio(app),
+        "event_loop": probe_event_loop(),
+        "thread_pools": probe_thread_pools(),
+    }
+    status = max((check["status"] for check in checks.values()), key=_SEVERITY.__getitem__)
+    if status != STATUS_OK:
+        logger.warning(f"Readiness {status}: {checks}")
+    return {"status": status, "checks": checks}
+
+
+@router.get("/readyz", tags=["Health"])
+async def readiness_check(request: Request) -> JSONResponse:
+    """
+    Readiness endpoint probing the session store, the Gradio app, the event loop and the thread pools.
+
+    Results are cached for `READYZ_CACHE_TTL` seconds and concurrent pollers share one probe run, so
+    frequent load balancer polling adds no load. A "degraded" instance (a probe above its threshold)
+    still answers 200; a "fail" answers 503 so the load balancer stops routing to it.
+
+    Args:
+        request (Request): The incoming HTTP request object.
+
+    Returns:
+        JSONResponse: The readiness result, with status 200 or 503.
+    """
+    cache = get_readiness_cache()
+    result = cache.get("readiness")
+    if result is None:
+        async with get_readiness_lock(request.app):
+            result = cache.get("readiness")
+            if result is None:
+                result = await check_readiness(request.app)
+                cache.set("readiness", result)
+    return JSONResponse(result, status_code=503 if result["status"] == STATUS_FAIL else 200)
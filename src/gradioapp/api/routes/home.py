@@ -1,13 +1,9 @@
-from pathlib import Path
-
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
-router = APIRouter()
+from ..templates import get_templates
 
-BASE_DIR = Path(__file__).parent.parent.parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+router = APIRouter()
 
 
 @router.get("/", name="home", response_class=HTMLResponse)
@@ -21,4 +17,4 @@ async def home_page(request: Request) -> HTMLResponse:
     Returns:
         HTMLResponse: The rendered HTML response for the home page.
     """
-    return templates.TemplateResponse(request, "home.html")
+    return get_templates().TemplateResponse(request, "home.html")
@@ -1,27 +1,46 @@
 from datetime import timedelta
-from pathlib import Path
 
 from fastapi import APIRouter, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from loguru import logger
 from starlette.datastructures import URL
 
+from ...core.http_cache import PrecompressedBody
 from ...domain.auth import create_session_token, verify_token
-from ...domain.csrf import generate_csrf_token, validate_csrf_token
+from ...domain.csrf import (
+    CSRF_NONCE_COOKIE,
+    CSRF_TOKEN_COOKIE,
+    ensure_csrf_cookies,
+    generate_csrf_token,
+    new_csrf_nonce,
+    set_csrf_cookies,
+    validate_csrf_token,
+)
+from ...domain.password_pool import PasswordPoolBusyError, get_password_pool
+from ...domain.rate_limit import get_login_rate_limiter
+from ...domain.session.revocation import get_revocation_hub
 from ...domain.session.store import get_session_store
 from ...domain.user import authenticate_user
+from ..templates import get_templates
 
 router = APIRouter()
 
-BASE_DIR = Path(__file__).parent.parent.parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-
 # Validation constants
 MAX_USERNAME_LENGTH = 255
 MAX_PASSWORD_LENGTH = 255
 MIN_FIELD_LENGTH = 1
 
+# Seconds a client is asked to wait when the password pool is saturated
+BUSY_RETRY_AFTER = 1
+
+# Messages the login page shows for the `error` query parameter; other values are ignored, so
+# a crafted link cannot put its own text on the page
+LOGIN_ERROR_CSRF = "csrf"
+LOGIN_ERRORS = {LOGIN_ERROR_CSRF: "Invalid CSRF token"}
+
+# Login page without a token or an error, rendered once; see `get_login_shell`
+_login_shell: PrecompressedBody | None = None
+
 
 def validate_login_form(username: str, password: str, csrf_token: str) -> str | None:
     """
@@ -48,19 +67,99 @@ def validate_login_form(username: str, password: str, csrf_token: str) -> str |
     return None
 
 
+def get_login_shell(request: Request) -> PrecompressedBody:
+    """
+    Returns the static login page, rendering and compressing it on first use.
+
+    The shell contains neither the CSRF token nor an error message; its script reads the token from
+    the `csrf_token` cookie and maps the `error` query parameter to one of the fixed `LOGIN_ERRORS`
+    messages. The body is therefore the same for every visitor, can be revalidated with its ETag and
+    is answered with 304 by clients that already have it. `url_for` renders paths rather than absolute
+    URLs here, so the Host header of the first visitor does not end up in the shared page.
+
+    Args:
+        request (Request): The request the page is first rendered for.
+
+    Returns:
+        PrecompressedBody: The login page in identity and gzip form.
+    """
+    global _login_shell
+    if _login_shell is None:
+        root_path = request.scope.get("root_path", "")
+        template = get_templates().get_template("login.html")
+        html = template.render(
+            url_for=lambda name, **path_params: root_path + request.app.url_path_for(name, **path_params),
+            error=None,
+            login_errors=LOGIN_ERRORS,
+            csrf_token="",
+            csrf_token_cookie=CSRF_TOKEN_COOKIE,
+        )
+        _login_shell = PrecompressedBody(html.encode("utf-8"), media_type="text/html; charset=utf-8")
+    return _login_shell
+
+
+def render_login_page(
+    request: Request,
+    error: str | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> HTMLResponse:
+    """
+    Renders the login page with an error and a CSRF token bound to the request's nonce cookie.
+
+    Used for failed login attempts, so the form works even without JavaScript. A new nonce (and its
+    cookies) is issued only if the request does not carry one yet.
+
+    Args:
+        request (Request): The incoming HTTP request object.
+        error (str | None): Error message to display. Defaults to None.
+        status_code (int): The response status code. Defaults to 200.
+        headers (dict[str, str] | None): Additional response headers. Defaults to None.
+
+    Returns:
+        HTMLResponse: The rendered login page.
+    """
+    nonce = request.cookies.get(CSRF_NONCE_COOKIE)
+    new_nonce = None
+    if not nonce:
+        nonce = new_nonce = new_csrf_nonce()
+    csrf_token = generate_csrf_token(nonce)
+    response = get_templates().TemplateResponse(
+        request,
+        "login.html",
+        {
+            "error": error,
+            "login_errors": LOGIN_ERRORS,
+            "csrf_token": csrf_token,
+            "csrf_token_cookie": CSRF_TOKEN_COOKIE,
+        },
+        status_code=status_code,
+        headers=headers,
+    )
+    if new_nonce:
+        set_csrf_cookies(response, new_nonce)
+    return response
+
+
 @router.get("/login", name="login", response_class=HTMLResponse, response_model=None)
-async def login_page(request: Request, error: str | None = None) -> HTMLResponse:
+async def login_page(request: Request) -> Response:
     """
-    Renders the login page with a CSRF token.
+    Serves the static login page and issues the CSRF cookies if the client does not have them yet.
+
+    The page carries a strong ETag, so repeated visits (e.g. every tab of an expired session being
+    redirected here) are answered with an empty 304. Responses that set cookies are marked private
+    so that shared caches never store them.
 
     Args:
         request (Request): The incoming HTTP request object.
 
     Returns:
-        HTMLResponse: The rendered login page with a CSRF token included in the context.
+        Response: The login page, or 304 Not Modified if the client's copy is current.
     """
-    csrf_token = generate_csrf_token(request)
-    return templates.TemplateResponse(request, "login.html", {"error": error, "csrf_token": csrf_token})
+    response = get_login_shell(request).response(request.headers)
+    if ensure_csrf_cookies(request, response):
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @router.post("/login", response_model=None)
@@ -84,6 +183,10 @@ async def login(
             - If CSRF token is invalid, returns a rendered login template with an error message.
             - If authentication fails, returns a rendered login template with an error message.
             - If validation fails, returns a rendered login template with an error message.
+            - If the client IP or the username exceeded its login rate, returns the login template
+              with status 429 and a `Retry-After` header, without verifying the password.
+            - If the password pool is saturated, returns the login template with status 503
+              and a `Retry-After` header.
         RedirectResponse:
             - If authentication is successful, creates a session, sets an access token cookie,
               and redirects to '/gradio'.
@@ -92,13 +195,31 @@ async def login(
     validation_error = validate_login_form(username, password, csrf_token)
     if validation_error:
         logger.warning(f"Login form validation failed: {validation_error}")
-        return templates.TemplateResponse(request, "login.html", {"error": validation_error})
+        return render_login_page(request, validation_error)
 
     if not validate_csrf_token(csrf_token, request):
-        url = URL("/login").include_query_params(error="Invalid CSRF token")
+        url = URL("/login").include_query_params(error=LOGIN_ERROR_CSRF)
         return RedirectResponse(url, status_code=303)
 
-    user = authenticate_user(username, password)
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = get_login_rate_limiter().check(client_ip, username)
+    if retry_after:
+        return render_login_page(
+            request,
+            "Too many login attempts, please try again later",
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    try:
+        user = await get_password_pool().run(authenticate_user, username, password)
+    except PasswordPoolBusyError:
+        return render_login_page(
+            request,
+            "Server is busy, please try again",
+            status_code=503,
+            headers={"Retry-After": str(BUSY_RETRY_AFTER)},
+        )
     if user:
         access_token, session_id = create_session_token(username, expires_delta=timedelta(minutes=30))
         get_session_store().create_session(session_id=session_id, username=user.username, data={})
@@ -110,17 +231,21 @@ async def login(
             secure=True,
             samesite="lax",
         )
+        # Start the authenticated session with a fresh CSRF nonce
+        set_csrf_cookies(response, new_csrf_nonce())
         logger.info(f"Login: user={user.username} successfully logged in, session_id={session_id}")
 
         return response
 
-    return templates.TemplateResponse(request, "login.html", {"error": "Invalid credentials"})
+    return render_login_page(request, "Invalid credentials")
 
 
 def _invalidate_session_if_token_valid(request: Request) -> None:
     """
     Invalidates session if valid token is present in request cookies.
 
+    Open streams (SSE/websockets) of the session are notified through the revocation hub and closed.
+
     Args:
         request (Request): The incoming HTTP request containing cookies.
     """
@@ -137,6 +262,7 @@ def _invalidate_session_if_token_valid(request: Request) -> None:
         return
 
     get_session_store().delete_session(session_id)
+    get_revocation_hub().revoke(session_id)
     logger.info(f"Logout: session {session_id} for the user {payload.get('sub')} invalidated")
 
 
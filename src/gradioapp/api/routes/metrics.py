@@ -0,0 +1,118 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ...core.logging import get_queued_sinks
+from ...core.loop_monitor import get_loop_monitor
+from ...core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    get_request_metrics,
+    process_metrics,
+    render_metric,
+)
+from ...domain.password_pool import get_password_pool
+from ...domain.rate_limit import get_login_rate_limiter
+from ...domain.session.store import get_session_store
+from ..middleware.admission import get_admission_controller
+from ..middleware.sampling import get_request_log_sampler
+
+router = APIRouter()
+
+
+def application_metrics() -> list[str]:
+    """
+    Renders the gauges and counters of the session store, the password pool, the login limiter, the
+    admission controller and logging.
+
+    Returns:
+        list[str]: The metrics in the Prometheus text format.
+    """
+    lines = render_metric(
+        "sessions_stored",
+        "gauge",
+        "Sessions in the session store.",
+        [({}, get_session_store().count_sessions())],
+    )
+    lines += render_metric(
+        "password_checks_pending",
+        "gauge",
+        "Password checks running or queued on the password pool.",
+        [({}, get_password_pool().pending)],
+    )
+    stats = get_login_rate_limiter().stats()
+    limiters = ("ip", "account")
+    lines += render_metric(
+        "login_limiter_attempts_total",
+        "counter",
+        "Login attempts checked by the rate limiter.",
+        [
+            ({"limiter": limiter, "result": result}, stats[f"{limiter}_{result}"])
+            for limiter in limiters
+            for result in ("allowed", "rejected")
+        ],
+    )
+    lines += render_metric(
+        "login_limiter_buckets",
+        "gauge",
+        "Token buckets tracked by the rate limiter.",
+        [({"limiter": limiter}, stats[f"{limiter}_buckets"]) for limiter in limiters],
+    )
+    admission = get_admission_controller()
+    lines += render_metric(
+        "admission_requests_in_flight",
+        "gauge",
+        "Requests in flight per route class.",
+        [({"class": route_class}, count) for route_class, count in sorted(admission.in_flight().items())],
+    )
+    lines += render_metric(
+        "admission_requests_shed_total",
+        "counter",
+        "Low-priority requests rejected with 503 because the server was overloaded.",
+        [
+            ({"class": route_class, "reason": reason}, count)
+            for (route_class, reason), count in sorted(admission.stats().items())
+        ],
+    )
+    lines += render_metric(
+        "log_requests_suppressed_total",
+        "counter",
+        "Requests whose log line was suppressed by the request log sampler.",
+        [({"route": route}, count) for route, count in sorted(get_request_log_sampler().stats().items())],
+    )
+    sinks = get_queued_sinks()
+    lines += render_metric(
+        "log_messages_queued",
+        "gauge",
+        "Log messages waiting for the background writer.",
+        [({"sink": sink.name}, sink.queued) for sink in sinks],
+    )
+    lines += render_metric(
+        "log_messages_written_total",
+        "counter",
+        "Log messages written by the background writer.",
+        [({"sink": sink.name}, sink.written) for sink in sinks],
+    )
+    lines += render_metric(
+        "log_messages_dropped_total",
+        "counter",
+        "Log messages dropped because the log queue was full or the sink failed.",
+        [({"sink": sink.name}, sink.dropped) for sink in sinks],
+    )
+    return lines
+
+
+@router.get("/metrics", tags=["Health"])
+async def metrics() -> Response:
+    """
+    Metrics endpoint in the Prometheus text exposition format.
+
+    Serves per-route request counters and latency histograms, process statistics, the event loop
+    lag histogram (while the loop monitor runs) and the gauges of `application_metrics`.
+
+    Returns:
+        Response: The metrics as `text/plain; version=0.0.4`.
+    """
+    lines = get_request_metrics().render() + process_metrics() + application_metrics()
+    loop_monitor = get_loop_monitor()
+    if loop_monitor is not None:
+        lines += loop_monitor.render()
+    return Response("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,20 +1,41 @@
 from pathlib import Path
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from ...core.http_cache import PrecompressedBody
 
 router = APIRouter()
 
 BASE_DIR = Path(__file__).parent.parent.parent
+MANIFEST_PATH = BASE_DIR / "static" / "manifest.json"
+
+# manifest.json loaded and compressed once; see `get_manifest`
+_manifest: PrecompressedBody | None = None
+
+
+def get_manifest() -> PrecompressedBody:
+    """
+    Returns the web app manifest, loading it into memory on first use.
+
+    Returns:
+        PrecompressedBody: The contents of 'static/manifest.json' and their compressed variants.
+    """
+    global _manifest
+    if _manifest is None:
+        _manifest = PrecompressedBody.from_file(MANIFEST_PATH)
+    return _manifest
 
 
 @router.get("/manifest.json")
-async def manifest() -> FileResponse:
+async def manifest(request: Request) -> Response:
     """
-    Asynchronously serves the manifest.json file from the static directory.
+    Serves the manifest.json file from memory.
+
+    Args:
+        request (Request): The incoming HTTP request object.
 
     Returns:
-        FileResponse: A response object that sends the 'static/manifest.json' file to the client.
+        Response: The manifest, or 304 Not Modified if the client's copy is current.
     """
-    manifest_path = BASE_DIR / "static" / "manifest.json"
-    return FileResponse(str(manifest_path))
+    return get_manifest().response(request.headers)
@@ -0,0 +1,28 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+
+# Singleton
+_templates: "Jinja2Templates | None" = None
+
+
+def get_templates() -> "Jinja2Templates":
+    """
+    Retrieve the Jinja2 templates of the HTML pages, creating them on first use.
+
+    Jinja2 is imported here rather than at module import, so importing the routes does not load it.
+
+    Returns:
+        Jinja2Templates: The templates in `src/gradioapp/templates`.
+    """
+    global _templates
+    if _templates is None:
+        # Deferred so importing the routes does not load Jinja2
+        from fastapi.templating import Jinja2Templates  # pylint: disable=import-outside-toplevel
+
+        _templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+    return _templates
@@ -0,0 +1,218 @@
+import argparse
+from getpass import getpass
+import json
+from pathlib import Path
+import sys
+from typing import Iterable
+
+from .domain.passwords import (
+    CALIBRATION_ROUNDS,
+    DEFAULT_ROUNDS,
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    calibrate_rounds,
+    hash_password,
+    measure_hash_ms,
+)
+
+
+def read_credentials_stdin(lines: Iterable[str]) -> dict[str, str]:
+    """
+    Parse `username:password` lines. Blank lines and lines starting with `#` are skipped.
+
+    Args:
+        lines (Iterable[str]): The input lines.
+
+    Returns:
+        dict[str, str]: Plain text passwords keyed by username.
+
+    Raises:
+        ValueError: If a line has no `:` separator or an empty username.
+    """
+    credentials = {}
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip("\n")
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        username, separator, password = line.partition(":")
+        if not separator or not username.strip():
+            raise ValueError(f"Line {number}: expected 'username:password'")
+        credentials[username.strip()] = password
+    return credentials
+
+
+def prompt_credentials(usernames: list[str]) -> dict[str, str]:
+    """
+    Prompt for the password of each user without echoing it.
+
+    Args:
+        usernames (list[str]): The usernames to prompt for.
+
+    Returns:
+        dict[str, str]: Plain text passwords keyed by username.
+
+    Raises:
+        ValueError: If a password is empty or the confirmation does not match.
+    """
+    credentials = {}
+    for username in usernames:
+        password = getpass(f"Password for {username}: ")
+        if not password:
+            raise ValueError(f"Empty password for {username}")
+        if getpass(f"Repeat password for {username}: ") != password:
+            raise ValueError(f"Passwords for {username} do not match")
+        credentials[username] = password
+    return credentials
+
+
+def hash_passwords(args: argparse.Namespace) -> int:
+    """
+    Hashes passwords and merges them into a credentials file.
+
+    Existing users in the output file are kept; users given on the command line are added or replaced.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of the `hash-passwords` subcommand.
+
+    Returns:
+        int: The process exit code.
+    """
+    try:
+        if args.stdin:
+            credentials = read_credentials_stdin(sys.stdin)
+        elif args.usernames:
+            credentials = prompt_credentials(args.usernames)
+        else:
+            print("error: give usernames to prompt for, or --stdin", file=sys.stderr)
+            return 2
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    output: Path = args.output
+    users = json.loads(output.read_text(encoding="utf-8")) if output.exists() else {}
+    for username, password in credentials.items():
+        users[username] = hash_password(password, args.rounds)
+    output.write_text(json.dumps(users, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Wrote {len(credentials)} password hash(es) to {output} ({len(users)} users in total)")
+    return 0
+
+
+def calibrate_bcrypt(args: argparse.Namespace) -> int:
+    """
+    Prints the estimated verification latency per bcrypt cost on this host and the calibrated cost.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of the `calibrate-bcrypt` subcommand.
+
+    Returns:
+        int: The process exit code.
+    """
+    base_ms = measure_hash_ms(CALIBRATION_ROUNDS)
+    print(f"{'rounds':>6} {'ms':>10}")
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        print(f"{rounds:>6} {base_ms * 2 ** (rounds - CALIBRATION_ROUNDS):>10.1f}")
+    rounds = calibrate_rounds(args.target_ms)
+    print(f"Calibrated cost for a {args.target_ms:g} ms target: BCRYPT_ROUNDS={rounds}")
+    return 0
+
+
+def import_users(args: argparse.Namespace) -> int:
+    """
+    Imports a credentials file into the SQLite user database.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of the `import-users` subcommand.
+
+    Returns:
+        int: The process exit code.
+    """
+    # Imported here so `hash-passwords` keeps working without the application settings (JWT_SECRET)
+    from .domain.user import InMemoryUserRepository, SQLiteUserRepository  # pylint: disable=import-outside-toplevel
+
+    source = InMemoryUserRepository.from_file(args.credentials)
+    repository = SQLiteUserRepository(args.db)
+    try:
+        users = (source.get_user(username) for username in source.usernames())
+        written = repository.add_users(user for user in users if user is not None)
+        print(f"Imported {written} user(s) into {args.db} ({repository.count_users()} users in total)")
+    finally:
+        repository.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser of the `gradioapp-admin` command.
+
+    Returns:
+        argparse.ArgumentParser: The configured parser.
+    """
+    parser = argparse.ArgumentParser(prog="gradioapp-admin", description="Administrative tasks for gradioapp.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    hash_parser = subparsers.add_parser(
+        "hash-passwords",
+        help="Hash passwords offline into a credentials file (see USERS_FILE).",
+    )
+    hash_parser.add_argument("usernames", nargs="*", help="Usernames to prompt a password for.")
+    hash_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("users.json"),
+        help="Credentials file to update (default: users.json).",
+    )
+    hash_parser.add_argument(
+        "--stdin", action="store_true", help="Read 'username:password' lines from standard input instead of prompting."
+    )
+    hash_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=DEFAULT_ROUNDS,
+        choices=range(4, 32),
+        metavar="{4..31}",
+        help=f"bcrypt cost factor (default: {DEFAULT_ROUNDS}); the server rehashes to its own cost on login.",
+    )
+    hash_parser.set_defaults(handler=hash_passwords)
+
+    calibrate_parser = subparsers.add_parser(
+        "calibrate-bcrypt",
+        help="Measure bcrypt on this host and print the cost that meets a target latency.",
+    )
+    calibrate_parser.add_argument(
+        "--target-ms", type=float, default=250.0, help="Target verification latency (default: 250)."
+    )
+    calibrate_parser.set_defaults(handler=calibrate_bcrypt)
+
+    import_parser = subparsers.add_parser(
+        "import-users",
+        help="Import a credentials file into the SQLite user database (USER_BACKEND=sqlite).",
+    )
+    import_parser.add_argument("credentials", type=Path, help="Credentials file written by hash-passwords.")
+    import_parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path("users.db"),
+        help="SQLite database to create or update (default: users.db).",
+    )
+    import_parser.set_defaults(handler=import_users)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the `gradioapp-admin` command.
+
+    Args:
+        argv (list[str] | None): Command line arguments; defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
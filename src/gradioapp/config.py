@@ -3,11 +3,13 @@ import os
 
 from dotenv import load_dotenv
 
-load_dotenv()
+# Log levels accepted by LOG_LEVEL (the loguru built-in levels)
+LOG_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
 
 
+# One flat field per environment variable, so that every setting is documented and loaded in one place
 @dataclass(frozen=True)
-class Settings:
+class Settings:  # pylint: disable=too-many-instance-attributes
     """
     Application settings loaded from environment variables.
 
@@ -16,30 +18,175 @@ class Settings:
         projectname: Project name string.
         reload: Enable auto-reload in development mode.
         home_as_html: Serve home page as HTML.
+        log_level: Minimum level of the log records written, e.g. "DEBUG" or "INFO".
+        log_format: Log line format, "text" (colored, human-readable) or "json" (one object per line).
+        log_sample_rate: Fraction (0-1) of successful requests that get a request log line.
+        log_sample_routes: Sampling rates of specific route templates, overriding `log_sample_rate`.
+        log_slow_request_ms: Duration in milliseconds from which a request is always logged, as a warning (0 disables).
+        log_queue_size: Log messages queued per sink for the background writer; 0 writes synchronously.
+        log_queue_policy: What a full log queue does with a new message, "drop" (count it) or "block" (wait).
+        log_file: Log file written in addition to stderr; empty disables it.
+        log_file_max_bytes: Size in bytes at which the log file is rotated (0 never rotates).
+        log_file_backups: Number of rotated log files kept.
+        log_file_compress: Gzip-compress rotated log files.
         jwt_secret: Secret key for JWT token signing (minimum 32 characters).
         secret_key: Secret key for general use.
-        csrf_secret: Secret key for CSRF token generation.
+        csrf_secret: Secret key for CSRF token generation (falls back to `jwt_secret` when empty).
+        csrf_protect_gradio: Require an `X-CSRF-Token` header on authenticated POST/PUT/PATCH/DELETE requests to Gradio.
+        stream_revalidate_interval: Seconds between session re-validations of open SSE/websocket streams.
+        allowed_paths: Public path patterns; empty means the built-in `ALLOWED_PATHS`.
+        token_only_paths: Token-only path patterns; empty means the built-in `TOKEN_ONLY_PATHS`.
+        user_backend: User repository backend, "memory" (credentials file) or "sqlite".
+        users_file: Path of the JSON credentials file (username to bcrypt hash); empty means the bundled sample users.
+        user_db_path: SQLite database file of the "sqlite" user backend.
+        user_cache_size: Maximum number of users cached in process by the "sqlite" user backend.
+        user_cache_ttl: Seconds a cached user lookup of the "sqlite" user backend stays valid.
+        bcrypt_rounds: bcrypt cost factor for password hashes (4-31); 0 calibrates it against `bcrypt_target_ms`.
+        bcrypt_target_ms: Target password verification latency in milliseconds used for calibration.
+        password_pool_workers: Number of threads verifying passwords off the event loop.
+        password_pool_max_pending: Maximum number of password checks running or queued before logins get a 503.
+        login_ip_rate: Login attempts per minute refilled into each client IP bucket.
+        login_ip_burst: Login attempts a client IP may make in a burst.
+        login_account_rate: Login attempts per minute refilled into each username bucket.
+        login_account_burst: Login attempts against one username allowed in a burst.
+        login_limiter_max_keys: Maximum number of tracked IPs (and, separately, usernames) of the login limiter.
+        compression_minimum_size: Smallest response body in bytes that is gzip/brotli compressed.
+        readyz_cache_ttl: Seconds a `/readyz` result is reused before the dependencies are probed again.
+        readyz_session_store_max_ms: Session store round trip in milliseconds above which `/readyz` is degraded.
+        readyz_loop_lag_max_ms: Event loop lag in milliseconds above which `/readyz` is degraded.
+        readyz_thread_pool_max_ratio: Thread pool utilization (0-1) above which `/readyz` is degraded.
+        loop_monitor_interval: Seconds between two event loop lag measurements (0 disables the monitor).
+        loop_block_threshold_ms: Event loop blocking in milliseconds after which the blocking stack is logged.
+        admission_max_in_flight: Requests in flight, streams excepted, from which low-priority work is shed (0 off).
+        admission_lag_threshold_ms: Event loop lag in milliseconds from which low-priority work is shed (0 disables).
+        admission_retry_after: Seconds sent in the `Retry-After` header of shed requests.
+        host: Interface the server binds to.
+        port: Port the server listens on.
+        workers: Number of server processes; must be 1, as sessions and the Gradio queue live in process memory.
+        keep_alive: Seconds an idle HTTP keep-alive connection is kept open.
+        max_requests: Requests after which the worker is forked anew from the preloaded app (0 never recycles it).
+        max_requests_jitter: Upper bound of a random number of requests added to `max_requests`.
+        server_loop: Event loop implementation, "auto" (uvloop when installed), "asyncio" or "uvloop".
+        server_http: HTTP protocol implementation, "auto" (httptools when installed), "h11" or "httptools".
     """
 
     version: str
     projectname: str
     reload: bool = False
     home_as_html: bool = False
+    log_level: str = "DEBUG"
+    log_format: str = "text"
+    log_sample_rate: float = 1.0
+    log_sample_routes: tuple[tuple[str, float], ...] = ()
+    log_slow_request_ms: float = 1000.0
+    log_queue_size: int = 10_000
+    log_queue_policy: str = "drop"
+    log_file: str = ""
+    log_file_max_bytes: int = 10 * 1024 * 1024
+    log_file_backups: int = 5
+    log_file_compress: bool = True
     jwt_secret: str = ""
     secret_key: str = ""
     csrf_secret: str = ""
+    csrf_protect_gradio: bool = False
+    stream_revalidate_interval: float = 30.0
+    allowed_paths: tuple[str, ...] = ()
+    token_only_paths: tuple[str, ...] = ()
+    user_backend: str = "memory"
+    users_file: str = ""
+    user_db_path: str = "users.db"
+    user_cache_size: int = 1024
+    user_cache_ttl: float = 300.0
+    bcrypt_rounds: int = 0
+    bcrypt_target_ms: float = 250.0
+    password_pool_workers: int = 2
+    password_pool_max_pending: int = 32
+    login_ip_rate: float = 10.0
+    login_ip_burst: int = 20
+    login_account_rate: float = 5.0
+    login_account_burst: int = 10
+    login_limiter_max_keys: int = 100_000
+    compression_minimum_size: int = 500
+    readyz_cache_ttl: float = 2.0
+    readyz_session_store_max_ms: float = 50.0
+    readyz_loop_lag_max_ms: float = 100.0
+    readyz_thread_pool_max_ratio: float = 0.9
+    loop_monitor_interval: float = 0.5
+    loop_block_threshold_ms: float = 100.0
+    admission_max_in_flight: int = 200
+    admission_lag_threshold_ms: float = 250.0
+    admission_retry_after: int = 2
+    host: str = "0.0.0.0"
+    port: int = 8080
+    workers: int = 1
+    keep_alive: int = 5
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+    server_loop: str = "auto"
+    server_http: str = "auto"
 
     def __post_init__(self) -> None:
         """
         Validate settings after initialization.
 
         Raises:
-            ValueError: If JWT_SECRET is missing or too short.
+            ValueError: If JWT_SECRET is missing or too short, BCRYPT_ROUNDS is out of range, WORKERS is not 1,
+                LOG_LEVEL is not a log level, LOG_FORMAT is not "text" or "json", a log sampling rate is
+                outside 0-1 or LOG_QUEUE_POLICY is not "drop" or "block".
         """
         if not self.jwt_secret:
             raise ValueError("JWT_SECRET environment variable is required")
         if len(self.jwt_secret) < 32:
             raise ValueError("JWT_SECRET must be at least 32 characters long for security reasons")
+        if self.bcrypt_rounds and not 4 <= self.bcrypt_rounds <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31, or 0 to calibrate")
+        if self.workers != 1:
+            # Sessions, the login limiter and the Gradio queue are kept in process memory: a second worker
+            # would not know the sessions of the first one, and Gradio streams must reach their own queue
+            raise ValueError("WORKERS must be 1: run one process per container behind a load balancer instead")
+        if self.log_level not in LOG_LEVELS:
+            raise ValueError(f"LOG_LEVEL must be one of {', '.join(LOG_LEVELS)}")
+        if self.log_format not in ("text", "json"):
+            raise ValueError('LOG_FORMAT must be "text" or "json"')
+        if not all(0 <= rate <= 1 for rate in (self.log_sample_rate, *dict(self.log_sample_routes).values())):
+            raise ValueError("LOG_SAMPLE_RATE and the rates of LOG_SAMPLE_ROUTES must be between 0 and 1")
+        if self.log_queue_policy not in ("drop", "block"):
+            raise ValueError('LOG_QUEUE_POLICY must be "drop" or "block"')
+
+
+def _split_list(value: str) -> tuple[str, ...]:
+    """
+    Split a comma-separated environment value into a tuple of non-empty, stripped items.
+
+    Args:
+        value (str): The raw environment value.
+
+    Returns:
+        tuple[str, ...]: The list items.
+    """
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _split_rates(value: str) -> tuple[tuple[str, float], ...]:
+    """
+    Split a comma-separated list of `route=rate` pairs, e.g. `/gradio/gradio_api/queue/data=0.01,/healthz=0`.
+
+    Args:
+        value (str): The raw environment value.
+
+    Returns:
+        tuple[tuple[str, float], ...]: The (route, rate) pairs.
+
+    Raises:
+        ValueError: If an item is not a `route=rate` pair.
+    """
+    pairs = []
+    for item in _split_list(value):
+        route, separator, rate = item.rpartition("=")
+        if not separator or not route:
+            raise ValueError(f"LOG_SAMPLE_ROUTES items must be route=rate pairs, got {item!r}")
+        pairs.append((route.strip(), float(rate)))
+    return tuple(pairs)
 
 
 def load_settings() -> Settings:
@@ -57,21 +204,72 @@ def load_settings() -> Settings:
         projectname=os.getenv("PROJECTNAME", ""),
         reload=os.getenv("RELOAD", "False").lower() == "true",
         home_as_html=os.getenv("HOME_AS_HTML", "False").lower() == "true",
+        log_level=os.getenv("LOG_LEVEL", "DEBUG").upper(),
+        log_format=os.getenv("LOG_FORMAT", "text").lower(),
+        log_sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1")),
+        log_sample_routes=_split_rates(os.getenv("LOG_SAMPLE_ROUTES", "")),
+        log_slow_request_ms=float(os.getenv("LOG_SLOW_REQUEST_MS", "1000")),
+        log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        log_queue_policy=os.getenv("LOG_QUEUE_POLICY", "drop").lower(),
+        log_file=os.getenv("LOG_FILE", ""),
+        log_file_max_bytes=int(os.getenv("LOG_FILE_MAX_BYTES", "10485760")),
+        log_file_backups=int(os.getenv("LOG_FILE_BACKUPS", "5")),
+        log_file_compress=os.getenv("LOG_FILE_COMPRESS", "True").lower() == "true",
         jwt_secret=os.getenv("JWT_SECRET", ""),
         secret_key=os.getenv("SECRET_KEY", ""),
         csrf_secret=os.getenv("CSRF_SECRET", ""),
+        csrf_protect_gradio=os.getenv("CSRF_PROTECT_GRADIO", "False").lower() == "true",
+        stream_revalidate_interval=float(os.getenv("STREAM_REVALIDATE_INTERVAL", "30")),
+        allowed_paths=_split_list(os.getenv("ALLOWED_PATHS", "")),
+        token_only_paths=_split_list(os.getenv("TOKEN_ONLY_PATHS", "")),
+        user_backend=os.getenv("USER_BACKEND", "memory").lower(),
+        users_file=os.getenv("USERS_FILE", ""),
+        user_db_path=os.getenv("USER_DB_PATH", "users.db"),
+        user_cache_size=int(os.getenv("USER_CACHE_SIZE", "1024")),
+        user_cache_ttl=float(os.getenv("USER_CACHE_TTL", "300")),
+        bcrypt_rounds=int(os.getenv("BCRYPT_ROUNDS", "0")),
+        bcrypt_target_ms=float(os.getenv("BCRYPT_TARGET_MS", "250")),
+        password_pool_workers=int(os.getenv("PASSWORD_POOL_WORKERS", "2")),
+        password_pool_max_pending=int(os.getenv("PASSWORD_POOL_MAX_PENDING", "32")),
+        login_ip_rate=float(os.getenv("LOGIN_IP_RATE", "10")),
+        login_ip_burst=int(os.getenv("LOGIN_IP_BURST", "20")),
+        login_account_rate=float(os.getenv("LOGIN_ACCOUNT_RATE", "5")),
+        login_account_burst=int(os.getenv("LOGIN_ACCOUNT_BURST", "10")),
+        login_limiter_max_keys=int(os.getenv("LOGIN_LIMITER_MAX_KEYS", "100000")),
+        compression_minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500")),
+        readyz_cache_ttl=float(os.getenv("READYZ_CACHE_TTL", "2")),
+        readyz_session_store_max_ms=float(os.getenv("READYZ_SESSION_STORE_MAX_MS", "50")),
+        readyz_loop_lag_max_ms=float(os.getenv("READYZ_LOOP_LAG_MAX_MS", "100")),
+        readyz_thread_pool_max_ratio=float(os.getenv("READYZ_THREAD_POOL_MAX_RATIO", "0.9")),
+        loop_monitor_interval=float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5")),
+        loop_block_threshold_ms=float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100")),
+        admission_max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "200")),
+        admission_lag_threshold_ms=float(os.getenv("ADMISSION_LAG_THRESHOLD_MS", "250")),
+        admission_retry_after=int(os.getenv("ADMISSION_RETRY_AFTER", "2")),
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8080")),
+        workers=int(os.getenv("WORKERS", "1")),
+        keep_alive=int(os.getenv("KEEP_ALIVE", "5")),
+        max_requests=int(os.getenv("MAX_REQUESTS", "0")),
+        max_requests_jitter=int(os.getenv("MAX_REQUESTS_JITTER", "0")),
+        server_loop=os.getenv("SERVER_LOOP", "auto").lower(),
+        server_http=os.getenv("SERVER_HTTP", "auto").lower(),
     )
 
 
-# Create settings instance
-_settings = load_settings()
+# Singleton
+_settings: Settings | None = None
 
 
 def get_settings() -> Settings:
     """
-    Get the application settings instance.
+    Get the application settings instance, loading `.env` and the environment on first use.
 
     Returns:
         Settings: The configured settings instance.
     """
+    global _settings
+    if _settings is None:
+        load_dotenv()
+        _settings = load_settings()
     return _settings
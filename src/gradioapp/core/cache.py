@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import threading
+import time
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe least-recently-used cache whose entries also expire after a fixed time-to-live.
+
+    Lookups, inserts and removals are O(1). When the cache is full the least recently used entry is
+    evicted; expired entries are dropped lazily when they are looked up.
+
+    Attributes:
+        maxsize (int): Maximum number of entries.
+        ttl (float): Seconds an entry stays valid after it was stored.
+        _entries (OrderedDict[K, tuple[float, V]]): Expiry time and value per key, least recently used first.
+        _lock (threading.Lock): Lock protecting `_entries`.
+        _clock (Callable[[], float]): Monotonic time source.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Returns a cached value and marks it as recently used.
+
+        Args:
+            key (K): The cache key.
+            default (V | None): Value returned when the key is missing or expired. Defaults to None.
+
+        Returns:
+            V | None: The cached value or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (K): The cache key.
+            value (V): The value to store.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """
+        Removes a key from the cache. Missing keys are ignored.
+
+        Args:
+            key (K): The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Mapping
+
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Optional dependency: `pip install gradioapp[brotli]`
+    brotli = None
+
+# Compression levels for bodies compressed once and served many times
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Computes a strong ETag from the bytes of a response body.
+
+    Args:
+        body (bytes): The exact bytes sent to the client (after any content encoding).
+
+    Returns:
+        str: The quoted entity tag, e.g. `"3f2a..."`.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks an `If-None-Match` request header against an entity tag.
+
+    `If-None-Match` uses the weak comparison, so `W/` prefixes are ignored.
+
+    Args:
+        if_none_match (str | None): The header value: `*` or a comma-separated list of entity tags.
+        etag (str): The current entity tag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent, False otherwise.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def accepts_encoding(accept_encoding: str | None, coding: str) -> bool:
+    """
+    Checks whether an `Accept-Encoding` request header allows a content coding.
+
+    Args:
+        accept_encoding (str | None): The header value, e.g. `gzip, deflate, br;q=0.5`.
+        coding (str): The content coding to look for, e.g. `gzip`.
+
+    Returns:
+        bool: True if the coding (or `*`) is listed with a non-zero quality, False otherwise.
+    """
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() not in (coding, "*"):
+            continue
+        quality = params.strip().removeprefix("q=").strip() if params else ""
+        try:
+            return not quality or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class PrecompressedBody:
+    """
+    A response body that never changes while the process runs, kept in memory in identity and compressed form.
+
+    The gzip variant (and the brotli variant if the `brotli` package is installed) is built once, each
+    representation with its own strong ETag, so serving the body costs a header comparison and, for
+    clients that already have it, ends with an empty 304 response. Clients accepting brotli get it in
+    preference to gzip.
+
+    Attributes:
+        media_type (str): The `Content-Type` of the body.
+        cache_control (str): The `Cache-Control` header sent with every response.
+        body (bytes): The identity representation.
+        etag (str): Entity tag of `body`.
+        encoded (dict[str, tuple[bytes, str]]): Content coding -> (body, ETag), in order of preference.
+            Codings that do not make the body smaller are left out.
+    """
+
+    __slots__ = ("media_type", "cache_control", "body", "etag", "encoded")
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = "no-cache") -> None:
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.body = body
+        self.etag = make_etag(body)
+        self.encoded: dict[str, tuple[bytes, str]] = {}
+        candidates = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            candidates = {"br": brotli.compress(body, quality=BROTLI_QUALITY)} | candidates
+        for coding, compressed in candidates.items():
+            if len(compressed) < len(body):
+                self.encoded[coding] = (compressed, make_etag(compressed))
+
+    @classmethod
+    def from_file(cls, path: Path, cache_control: str = "no-cache") -> "PrecompressedBody":
+        """
+        Loads a file into memory, guessing its media type from the file name.
+
+        Args:
+            path (Path): The file to load.
+            cache_control (str): The `Cache-Control` header. Defaults to "no-cache".
+
+        Returns:
+            PrecompressedBody: The file contents and their compressed variants.
+        """
+        media_type, _ = mimetypes.guess_type(path.name)
+        return cls(path.read_bytes(), media_type or "application/octet-stream", cache_control)
+
+    def response(self, request_headers: Mapping[str, str], headers: Mapping[str, str] | None = None) -> Response:
+        """
+        Builds the response for a request: the best accepted representation, or 304 if the client has it.
+
+        Args:
+            request_headers (Mapping[str, str]): The request headers (`Accept-Encoding`, `If-None-Match`).
+            headers (Mapping[str, str] | None): Additional response headers. Defaults to None.
+
+        Returns:
+            Response: A 200 response with the body, or an empty 304 response.
+        """
+        accept_encoding = request_headers.get("accept-encoding")
+        coding = next((name for name in self.encoded if accepts_encoding(accept_encoding, name)), None)
+        body, etag = self.encoded[coding] if coding else (self.body, self.etag)
+        response_headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        response_headers.update(headers or {})
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=response_headers)
+        if coding:
+            response_headers["Content-Encoding"] = coding
+        return Response(body, headers=response_headers, media_type=self.media_type)
@@ -0,0 +1,260 @@
+import functools
+import gzip
+import os
+from pathlib import Path
+import queue
+import shutil
+import threading
+from typing import BinaryIO, Protocol
+import weakref
+
+# What a queued sink does when its queue is full
+POLICY_DROP = "drop"
+POLICY_BLOCK = "block"
+QUEUE_POLICIES = (POLICY_DROP, POLICY_BLOCK)
+
+# Default maximum number of messages a queued sink writes with one call
+DEFAULT_BATCH_SIZE = 256
+
+# Queued by `QueuedSink.stop` to end the writer thread
+_STOP = None
+
+
+class Writable(Protocol):
+    """
+    Protocol for the target of a queued sink: a text stream, optionally with `flush`, `isatty` and `stop`.
+    """
+
+    def write(self, text: str, /) -> object: ...
+
+
+def _call_if_alive(method_ref: weakref.WeakMethod) -> None:
+    """Calls a weakly referenced bound method, unless its object was garbage-collected."""
+    method = method_ref()
+    if method is not None:
+        method()
+
+
+class RotatingFile:
+    """
+    Log file that is rotated when it reaches a size limit, optionally compressing the rotated files.
+
+    On rotation `app.log` becomes `app.log.1` (or `app.log.1.gz`), older files move up by one and
+    the file beyond `backups` is deleted. Sizes are counted in UTF-8 encoded bytes, as the file is
+    written in binary. It is a loguru stream sink: loguru calls `write` and
+    `flush` for every message, and `stop` when the sink is removed. Behind a `QueuedSink`, writes
+    and flushes happen once per batch, in the writer thread, which also does the compression.
+
+    Attributes:
+        path (Path): The log file.
+        max_bytes (int): Size in bytes at which the file is rotated (0 never rotates).
+        backups (int): Number of rotated files kept.
+        compress (bool): Whether rotated files are gzip-compressed.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 0, backups: int = 5, compress: bool = True) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._open()
+        self._size = self._file.tell()
+
+    def write(self, message: str) -> None:
+        """
+        Appends text to the file, rotating it first if the encoded text would exceed `max_bytes`.
+
+        Args:
+            message (str): One or more formatted log messages.
+        """
+        data = message.encode("utf-8")
+        if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def stop(self) -> None:
+        self._file.close()
+
+    def _open(self) -> BinaryIO:
+        # Kept open for the life of the sink and closed by `stop` or `_rotate`, so no `with` block
+        return self.path.open("ab")  # pylint: disable=consider-using-with
+
+    def _rotated_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}{'.gz' if self.compress else ''}")
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backups:
+            self._rotated_path(self.backups).unlink(missing_ok=True)
+            for index in range(self.backups - 1, 0, -1):
+                if self._rotated_path(index).exists():
+                    self._rotated_path(index).rename(self._rotated_path(index + 1))
+            if self.compress:
+                with self.path.open("rb") as source, gzip.open(self._rotated_path(1), "wb") as target:
+                    shutil.copyfileobj(source, target)
+                self.path.unlink()
+            else:
+                self.path.rename(self._rotated_path(1))
+        else:
+            self.path.unlink()
+        self._file = self._open()
+        self._size = 0
+
+
+# Holds its settings, the metric counters and the writer thread state; splitting them would not make it simpler
+class QueuedSink:  # pylint: disable=too-many-instance-attributes
+    """
+    Loguru stream sink that hands messages to a background writer thread through a bounded queue.
+
+    A logging call only formats its message and puts it on the queue, so a slow stderr pipe or disk
+    never stalls the event loop. The writer thread takes up to `batch_size` queued messages at a
+    time, writes them to `target` with one call and flushes once per batch.
+
+    When the queue is full, the "drop" policy discards the message and counts it in `dropped`;
+    the "block" policy makes the logging thread wait for room, so no message is lost but a slow
+    target slows the callers down.
+
+    Prefork workers inherit the sink without its writer thread; it is restarted in the child with
+    an empty queue (see `server.PreforkServer`).
+
+    Attributes:
+        target (Writable): Where the messages are written, e.g. `sys.stderr` or a `RotatingFile`.
+        name (str): Name of the sink in the metrics, e.g. "stderr" or "file".
+        max_size (int): Maximum number of queued messages.
+        batch_size (int): Maximum number of messages written with one call.
+        policy (str): "drop" or "block".
+        dropped (int): Messages discarded because the queue was full or the target failed.
+        written (int): Messages written to the target.
+    """
+
+    def __init__(
+        self,
+        target: Writable,
+        name: str,
+        max_size: int = 10_000,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        policy: str = POLICY_DROP,
+    ) -> None:
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.target = target
+        self.name = name
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.policy = policy
+        self.dropped = 0
+        self.written = 0
+        self._drop_lock = threading.Lock()
+        self._stopped = False
+        self._start()
+        os.register_at_fork(
+            after_in_child=functools.partial(_call_if_alive, weakref.WeakMethod(self._restart_after_fork))
+        )
+
+    @property
+    def queued(self) -> int:
+        """Number of messages waiting for the writer thread."""
+        return self._queue.qsize()
+
+    def write(self, message: str) -> None:
+        """
+        Queues a formatted message; called by loguru for every record the sink accepts.
+
+        Args:
+            message (str): The formatted message.
+        """
+        if self.policy == POLICY_BLOCK:
+            self._queue.put(message)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def isatty(self) -> bool:
+        """Lets loguru colorize the messages when the target is a terminal."""
+        isatty = getattr(self.target, "isatty", None)
+        return bool(isatty and isatty())
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+        Waits until every queued message has been written.
+
+        Args:
+            timeout (float | None): Maximum time to wait in seconds; None waits indefinitely.
+
+        Returns:
+            bool: True if the queue was drained, False on timeout.
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """
+        Writes the queued messages, stops the writer thread and stops the target if it can be stopped.
+
+        Loguru calls it when the sink is removed, including by `logger.remove()` at exit.
+
+        Args:
+            timeout (float | None): Maximum time to wait for the writer thread in seconds.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        stop = getattr(self.target, "stop", None)
+        if callable(stop):
+            stop()
+
+    def _start(self) -> None:
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=self.max_size)
+        self._thread = threading.Thread(target=self._run, name=f"log-writer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Writer thread: writes the queued messages in batches until `_STOP` is dequeued.
+        """
+        flush = getattr(self.target, "flush", None)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = _STOP in batch
+            messages: list[str] = [message for message in batch if message is not None]
+            try:
+                if messages:
+                    self.target.write("".join(messages))
+                    if callable(flush):
+                        flush()
+                self.written += len(messages)
+            except Exception:  # A failing target must not kill the writer; its messages are counted as dropped
+                with self._drop_lock:
+                    self.dropped += len(messages)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def _restart_after_fork(self) -> None:
+        """
+        Recreates the queue, the lock and the writer thread in a forked child process.
+
+        Only the forking thread survives `fork()`: the child has no writer thread, and the queue and
+        lock may have been copied while the writer held them. Messages queued in the parent are
+        written by the parent. A stopped sink stays stopped.
+        """
+        self._drop_lock = threading.Lock()
+        if not self._stopped:
+            self._start()
@@ -1,27 +1,161 @@
+from contextvars import ContextVar
+import functools
+import json
+import re
+import secrets
 import sys
-from typing import Any
+import traceback
+from typing import Any, TextIO
 
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # Optional: JSON logs fall back to the standard library encoder
+    orjson = None
+
+from .log_sinks import (
+    DEFAULT_BATCH_SIZE,
+    POLICY_DROP,
+    QueuedSink,
+    RotatingFile,
+)
+
 MAX_LOC_LENGTH = 40
 
+DEFAULT_LOG_LEVEL = "DEBUG"
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+    "<level>{level:<8}</level> | "
+    "{extra[request_id]:<16} | "
+    "<cyan>{location}</cyan> - <level>{message}</level>"
+)
+
+# Log formats accepted by `setup_logging`
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+
+# Header carrying the request ID, accepted from the client and echoed in the response
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Request IDs accepted from clients; anything else is replaced, so that it cannot forge log lines
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+# Request ID of the request being handled, bound to every log record (see `_bind_request_id`)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Queued sinks of the current logging setup, for the metrics
+_queued_sinks: list[QueuedSink] = []
 
-def setup_logging():
+
+def setup_logging(
+    level: str = DEFAULT_LOG_LEVEL,
+    *,
+    queue_size: int = 0,
+    queue_policy: str = POLICY_DROP,
+    log_file: str = "",
+    log_file_max_bytes: int = 0,
+    log_file_backups: int = 5,
+    log_file_compress: bool = True,
+    log_format: str = LOG_FORMAT_TEXT,
+):
     """
     Sets up Loguru logging with a custom format and location handler.
+
+    Loguru drops a record below `level` before its message is formatted. Debug calls on hot paths
+    therefore pass their values as arguments (`logger.debug("Session {}", session_id)`) instead of
+    building an f-string, and use `logger.opt(lazy=True)` when computing a value is itself costly,
+    so that they cost no more than a function call at INFO level.
+
+    Every record carries the ID of the request it was logged for in `extra["request_id"]` ("-"
+    outside requests). The "json" format writes one JSON object per line with the record fields,
+    the request ID and the values passed as keyword arguments, e.g. `logger.info("...", user_id=...)`.
+
+    With a `queue_size`, every sink is wrapped in a `QueuedSink`: the logging thread only formats
+    the message and queues it, and a background thread writes the messages in batches.
+
+    Args:
+        level (str): The minimum level of the records written, e.g. "DEBUG" or "INFO".
+        queue_size (int): Maximum number of messages queued per sink; 0 writes synchronously.
+        queue_policy (str): "drop" or "block", what a full queue does with a new message.
+        log_file (str): Path of a log file written in addition to stderr; empty disables it.
+        log_file_max_bytes (int): Size in bytes at which the log file is rotated (0 never rotates).
+        log_file_backups (int): Number of rotated log files kept.
+        log_file_compress (bool): Whether rotated log files are gzip-compressed.
+        log_format (str): "text" (colored, human-readable) or "json" (one object per line).
     """
-    logger.remove()  # Remove default handler
-    logger.add(
-        sys.stderr,
-        level="DEBUG",
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-        "<level>{level:<8}</level> | "
-        "<cyan>{location}</cyan> - <level>{message}</level>",
-        filter=_format_location,
-    )
+    logger.remove()  # Remove default handler (and stop the queued sinks of a previous setup)
+    _queued_sinks.clear()
+    logger.configure(patcher=_bind_request_id)
+    log_format_option = _format_json if log_format == LOG_FORMAT_JSON else LOG_FORMAT
+
+    targets: list[tuple[str, TextIO | RotatingFile]] = [("stderr", sys.stderr)]
+    if log_file:
+        targets.append(("file", RotatingFile(log_file, log_file_max_bytes, log_file_backups, log_file_compress)))
+    for name, target in targets:
+        sink: TextIO | RotatingFile | QueuedSink = target
+        if queue_size:
+            sink = QueuedSink(target, name, max_size=queue_size, batch_size=DEFAULT_BATCH_SIZE, policy=queue_policy)
+            _queued_sinks.append(sink)
+        logger.add(sink, level=level.upper(), format=log_format_option, filter=_format_location)
     logger.info("Logging initialized with custom format and location handler")
 
 
+def new_request_id(incoming: str | None = None) -> str:
+    """
+    Returns the request ID of a new request: the client's, if it sent a valid one, or a random one.
+
+    Args:
+        incoming (str | None): The value of the client's `X-Request-ID` header, if any.
+
+    Returns:
+        str: The request ID.
+    """
+    if incoming and _REQUEST_ID_PATTERN.fullmatch(incoming):
+        return incoming
+    return secrets.token_hex(8)
+
+
+def get_request_id() -> str:
+    """
+    Returns the ID of the request being handled, or "-" outside requests.
+
+    Returns:
+        str: The request ID.
+    """
+    return request_id_var.get()
+
+
+def get_queued_sinks() -> list[QueuedSink]:
+    """
+    Returns the queued sinks of the current logging setup.
+
+    Returns:
+        list[QueuedSink]: The sinks, empty when logging is synchronous.
+    """
+    return list(_queued_sinks)
+
+
+def drain_logging(timeout: float | None = None) -> None:
+    """
+    Waits until the queued sinks have written their messages, e.g. before a process exits with `os._exit`.
+
+    Args:
+        timeout (float | None): Maximum time to wait per sink in seconds; None waits indefinitely.
+    """
+    for sink in get_queued_sinks():
+        sink.drain(timeout)
+
+
+@functools.lru_cache(maxsize=1024)
+def _location(name: str, function: str, line: int) -> str:
+    location = f"{name}:{function}:{line}"
+    if len(location) > MAX_LOC_LENGTH:
+        return location[-MAX_LOC_LENGTH:]
+    return location.ljust(MAX_LOC_LENGTH)
+
+
 def _format_location(record: Any) -> bool:
     """
     Formats the 'location' field in a log record dictionary by combining the record's
@@ -30,6 +164,8 @@ def _format_location(record: Any) -> bool:
     maximum allowed length (MAX_LOC_LENGTH). The formatted location is stored back in
     the record under the 'location' key.
 
+    A program logs from a bounded set of call sites, so the formatted locations are cached.
+
     Args:
         record (dict): A dictionary representing a log record, expected to contain
             'name', 'function', and 'line' keys.
@@ -37,10 +173,44 @@ def _format_location(record: Any) -> bool:
     Returns:
         bool: Always returns True after formatting the location.
     """
-    location = f"{record['name']}:{record['function']}:{record['line']}"
-    if len(location) > MAX_LOC_LENGTH:
-        location = location[-MAX_LOC_LENGTH:]
-    else:
-        location = location.ljust(MAX_LOC_LENGTH)
-    record["location"] = location
+    record["location"] = _location(record["name"], record["function"], record["line"])
     return True
+
+
+def _bind_request_id(record: Any) -> None:
+    record["extra"].setdefault("request_id", request_id_var.get())
+
+
+def _dumps(value: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode()
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _format_json(record: Any) -> str:
+    """
+    Serializes a log record to one line of JSON.
+
+    Loguru's `serialize=True` dumps the whole record, including file, process and thread objects;
+    this keeps the fields useful for log search and encodes them with orjson when it is installed.
+
+    Args:
+        record (dict): The log record.
+
+    Returns:
+        str: The format template, which makes loguru write the serialized record.
+    """
+    extra = record["extra"]
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        **{key: value for key, value in extra.items() if key != "json"},
+    }
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    extra["json"] = _dumps(entry)
+    return "{extra[json]}\n"
@@ -0,0 +1,173 @@
+import asyncio
+from bisect import bisect_left
+import sys
+import threading
+import time
+import traceback
+
+from loguru import logger
+
+from .metrics import render_histogram_samples, render_metric
+
+# Upper bounds, in seconds, of the event loop lag histogram buckets
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Frames of the blocking call stack written to the log
+STACK_LIMIT = 25
+
+
+# The timer task and the watchdog thread share their state through the instance
+class LoopLagMonitor:  # pylint: disable=too-many-instance-attributes
+    """
+    Measures the lag of the event loop and reports what blocks it.
+
+    A timer task sleeps `interval` seconds in a loop; the time it wakes up late is the lag, recorded
+    in a histogram. Each wake-up is also a heartbeat. A watchdog thread checks the heartbeat every
+    half `threshold`: when it is more than `threshold` overdue, the loop is blocked right now, and
+    the watchdog logs the stack of the event loop thread, i.e. the code blocking it (a synchronous
+    bcrypt call, a slow lock, a blocking write), once per blocking episode.
+
+    The cost is one timer callback per `interval` on the loop and a thread waking up a few times
+    per `threshold`, so the monitor can stay enabled in production.
+
+    Attributes:
+        interval (float): Seconds between two lag measurements.
+        threshold (float): Seconds of blocking after which the stack of the loop is logged.
+        blocked (int): Blocking episodes detected by the watchdog.
+        lag (float): The last lag measured, in seconds.
+    """
+
+    def __init__(self, interval: float = 0.5, threshold: float = 0.1) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0
+        self.lag = 0.0
+        # Count per bucket, count above the last bucket, sum of the lags
+        self._lags = [0.0] * (len(LAG_BUCKETS) + 2)
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Starts the timer task on the running event loop and the watchdog thread.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stops the timer task and the watchdog thread.
+        """
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    def observe(self, lag: float) -> None:
+        """
+        Records one lag measurement.
+
+        Args:
+            lag (float): How late the timer woke up, in seconds.
+        """
+        self.lag = lag
+        self._lags[bisect_left(LAG_BUCKETS, lag)] += 1
+        self._lags[-1] += lag
+
+    def render(self) -> list[str]:
+        """
+        Renders the lag histogram and the blocking episodes.
+
+        Returns:
+            list[str]: `event_loop_lag_seconds` and `event_loop_blocked_total` in the Prometheus text format.
+        """
+        lines = [
+            "# HELP event_loop_lag_seconds Delay of the event loop in running a due timer.",
+            "# TYPE event_loop_lag_seconds histogram",
+        ]
+        lines += render_histogram_samples("event_loop_lag_seconds", {}, LAG_BUCKETS, list(self._lags))
+        lines += render_metric(
+            "event_loop_blocked_total",
+            "counter",
+            "Times the event loop was blocked for longer than the threshold.",
+            [({}, self.blocked)],
+        )
+        return lines
+
+    async def _measure(self) -> None:
+        """
+        Timer task: sleeps `interval` seconds in a loop, records the lag and beats the heartbeat.
+
+        A lag above `threshold` is logged with its total duration, after the watchdog logged the stack.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            self._heartbeat = time.monotonic()
+            start_time = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start_time - self.interval)
+            self.observe(lag)
+            if lag >= self.threshold:
+                logger.warning("Event loop lag of {lag_ms:.0f} ms", lag_ms=lag * 1000)
+
+    def _watch(self) -> None:
+        """
+        Watchdog thread: logs the stack of the event loop thread when the heartbeat is overdue.
+        """
+        loop_thread_id = self._loop_thread_id
+        if loop_thread_id is None:
+            # Not started from the event loop thread, there is no stack to report
+            return
+        reported_heartbeat = None
+        while not self._stop.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            self.blocked += 1
+            # The only way to get the stack of another thread; CPython and PyPy both provide it
+            frame = sys._current_frames().get(loop_thread_id)  # pylint: disable=protected-access
+            stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT)) if frame else "  (unavailable)\n"
+            logger.warning(
+                "Event loop blocked for {blocked_ms:.0f} ms so far, running:\n{stack}",
+                blocked_ms=blocked * 1000,
+                stack=stack.rstrip("\n"),
+            )
+
+
+# Singleton
+_loop_monitor: LoopLagMonitor | None = None
+
+
+def initialize_loop_monitor(monitor: LoopLagMonitor | None) -> None:
+    """
+    Initializes the global event loop monitor.
+
+    Args:
+        monitor (LoopLagMonitor | None): The running monitor, or None when the monitor is disabled or stopped.
+    """
+    global _loop_monitor
+    _loop_monitor = monitor
+
+
+def get_loop_monitor() -> LoopLagMonitor | None:
+    """
+    Retrieve the event loop monitor of the process.
+
+    Returns:
+        LoopLagMonitor | None: The monitor, or None if it is not running.
+    """
+    return _loop_monitor
@@ -0,0 +1,252 @@
+from bisect import bisect_left
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Iterable, Mapping
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label of requests that matched no route (e.g. scanners probing random paths), to bound cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+_PROCESS_START_TIME = time.time()
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Mapping[str, str]) -> str:
+    """
+    Formats a label set for the Prometheus text format.
+
+    Args:
+        labels (Mapping[str, str]): Label names and values.
+
+    Returns:
+        str: The label set in braces, e.g. `{method="GET",route="/login"}`, or "" if there are no labels.
+    """
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_metric(
+    name: str,
+    metric_type: str,
+    help_text: str,
+    samples: Iterable[tuple[Mapping[str, str], float]],
+) -> list[str]:
+    """
+    Renders one metric family with its HELP and TYPE lines.
+
+    Args:
+        name (str): The metric name.
+        metric_type (str): "counter", "gauge" or "histogram".
+        help_text (str): The description.
+        samples (Iterable[tuple[Mapping[str, str], float]]): Label sets and values.
+
+    Returns:
+        list[str]: The exposition lines.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    lines.extend(f"{name}{format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return lines
+
+
+def render_histogram_samples(
+    name: str, labels: Mapping[str, str], buckets: tuple[float, ...], values: list[float]
+) -> list[str]:
+    """
+    Renders the bucket, sum and count samples of one histogram series (without HELP and TYPE lines).
+
+    Args:
+        name (str): The metric name.
+        labels (Mapping[str, str]): The labels of the series.
+        buckets (tuple[float, ...]): Upper bounds of the buckets.
+        values (list[float]): Count per bucket, count above the last bucket, then the sum of the observations.
+
+    Returns:
+        list[str]: The exposition lines, with cumulative bucket counts.
+    """
+    lines = []
+    cumulative = 0.0
+    for bound, count in zip((*buckets, float("inf")), values):
+        cumulative += count
+        bucket_labels = format_labels({**labels, "le": "+Inf" if bound == float("inf") else f"{bound:g}"})
+        lines.append(f"{name}_bucket{bucket_labels} {_format_value(cumulative)}")
+    lines.append(f"{name}_sum{format_labels(labels)} {_format_value(values[-1])}")
+    lines.append(f"{name}_count{format_labels(labels)} {_format_value(cumulative)}")
+    return lines
+
+
+class _Shard:
+    """Counters of the requests recorded by one thread."""
+
+    __slots__ = ("requests", "latencies")
+
+    def __init__(self) -> None:
+        # (method, route, status) -> request count
+        self.requests: dict[tuple[str, str, str], int] = {}
+        # (method, route) -> [count per bucket..., count above the last bucket, sum of durations]
+        self.latencies: dict[tuple[str, str], list[float]] = {}
+
+
+class RequestMetrics:
+    """
+    Request counters and latency histograms per HTTP method and route template.
+
+    Each thread records into its own shard, so `observe` takes no lock: it is a few dict and list
+    updates on data no other thread writes. Shards are merged when the metrics are scraped. Only the
+    creation of a thread's shard is locked.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the latency buckets in seconds.
+        _local (threading.local): The shard of the current thread.
+        _shards (list[_Shard]): All shards, for merging.
+        _lock (threading.Lock): Lock protecting `_shards`.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, method: str, route: str, status_code: int, duration: float) -> None:
+        """
+        Records one completed request.
+
+        Args:
+            method (str): The HTTP method.
+            route (str): The route template, e.g. `/gradio/config` or `/static/*`.
+            status_code (int): The response status code.
+            duration (float): The request duration in seconds.
+        """
+        shard = self._shard()
+        request_key = (method, route, str(status_code))
+        shard.requests[request_key] = shard.requests.get(request_key, 0) + 1
+
+        latency = shard.latencies.get((method, route))
+        if latency is None:
+            latency = shard.latencies[(method, route)] = [0.0] * (len(self.buckets) + 2)
+        latency[bisect_left(self.buckets, duration)] += 1
+        latency[-1] += duration
+
+    def render(self) -> list[str]:
+        """
+        Merges the shards and renders the counters and histograms.
+
+        Returns:
+            list[str]: `http_requests_total` and `http_request_duration_seconds` in the Prometheus text format.
+        """
+        with self._lock:
+            shards = list(self._shards)
+        requests: dict[tuple[str, str, str], int] = {}
+        latencies: dict[tuple[str, str], list[float]] = {}
+        for shard in shards:
+            # Copies are atomic under the GIL, so the recording thread never has to stop
+            for key, count in shard.requests.copy().items():
+                requests[key] = requests.get(key, 0) + count
+            for key, values in shard.latencies.copy().items():
+                merged = latencies.setdefault(key, [0.0] * len(values))
+                for index, value in enumerate(list(values)):
+                    merged[index] += value
+
+        lines = render_metric(
+            "http_requests_total",
+            "counter",
+            "Completed HTTP requests.",
+            (
+                ({"method": method, "route": route, "status": status}, count)
+                for (method, route, status), count in sorted(requests.items())
+            ),
+        )
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), values in sorted(latencies.items()):
+            lines += render_histogram_samples(
+                "http_request_duration_seconds", {"method": method, "route": route}, self.buckets, values
+            )
+        return lines
+
+
+def process_metrics() -> list[str]:
+    """
+    Renders CPU, memory, file descriptor and thread statistics of the current process.
+
+    Returns:
+        list[str]: The `process_*` and `python_*` metrics in the Prometheus text format.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    lines = render_metric(
+        "process_cpu_seconds_total",
+        "counter",
+        "Total user and system CPU time spent in seconds.",
+        [({}, usage.ru_utime + usage.ru_stime)],
+    )
+    lines += render_metric(
+        "process_start_time_seconds",
+        "gauge",
+        "Start time of the process since the Unix epoch in seconds.",
+        [({}, _PROCESS_START_TIME)],
+    )
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    lines += render_metric(
+        "process_max_resident_memory_bytes",
+        "gauge",
+        "Peak resident memory size in bytes.",
+        [({}, max_rss)],
+    )
+    if os.path.isdir("/proc/self/fd"):
+        lines += render_metric(
+            "process_open_fds",
+            "gauge",
+            "Number of open file descriptors.",
+            [({}, len(os.listdir("/proc/self/fd")))],
+        )
+    lines += render_metric(
+        "python_threads",
+        "gauge",
+        "Number of live Python threads.",
+        [({}, threading.active_count())],
+    )
+    return lines
+
+
+# Singleton
+_request_metrics: RequestMetrics | None = None
+
+
+def get_request_metrics() -> RequestMetrics:
+    """
+    Retrieve the process-wide request metrics, creating them on first use.
+
+    Returns:
+        RequestMetrics: The request metrics instance.
+    """
+    global _request_metrics
+    if _request_metrics is None:
+        _request_metrics = RequestMetrics()
+    return _request_metrics
@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+import re
+
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from .http_cache import PrecompressedBody
+
+# Files up to this size are loaded into memory at startup
+DEFAULT_MAX_CACHED_SIZE = 256 * 1024
+
+# Fingerprinted file names (`name.<hex hash>.ext` or `name-<hex hash>.ext`) never change content.
+# The hash needs at least one letter, so dates and version numbers (`report-20240101.js`) do not match.
+FINGERPRINT_PATTERN = re.compile(r"[.-](?=[0-9]*[a-f])[0-9a-f]{8,}\.\w+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def is_fingerprinted(path: str) -> bool:
+    """
+    Checks whether a file name carries a content hash, so its content can be cached forever.
+
+    Args:
+        path (str): The file name or path.
+
+    Returns:
+        bool: True if the name matches `FINGERPRINT_PATTERN`, False otherwise.
+    """
+    return FINGERPRINT_PATTERN.search(path) is not None
+
+
+class SendfileResponse(FileResponse):
+    """
+    `FileResponse` that hands the file to the server for zero-copy sending when the server supports it.
+
+    Servers advertising the ASGI `http.response.pathsend` extension (e.g. Granian) send the file with
+    `sendfile` instead of the application reading it in chunks. Range and HEAD requests, and servers
+    without the extension (e.g. uvicorn), use the regular `FileResponse` path.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        if (
+            "http.response.pathsend" not in extensions
+            or scope["method"].upper() != "GET"
+            or self.stat_result is None
+            or "range" in Headers(scope=scope)
+        ):
+            await super().__call__(scope, receive, send)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.pathsend", "path": os.fspath(self.path)})
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    `StaticFiles` that serves small files from memory, precompressed and with strong ETags.
+
+    Files up to `max_cached_size` bytes are read once when the app is created and served through
+    `PrecompressedBody`, which negotiates brotli/gzip and answers `If-None-Match` with 304. Larger files
+    are served from disk with `SendfileResponse`. Fingerprinted files (see `FINGERPRINT_PATTERN`) are
+    sent with `Cache-Control: immutable`; all other files must be revalidated, which is cheap thanks to
+    the ETags. Cached files are never reloaded: a file changed after startup keeps being served as it
+    was at startup until the app is restarted. Files added after startup are served from disk.
+
+    Attributes:
+        max_cached_size (int): Largest file size, in bytes, that is kept in memory.
+        _cache (dict[str, PrecompressedBody]): Cached files, keyed by their normalized relative path.
+    """
+
+    def __init__(self, *, directory: PathLike, max_cached_size: int = DEFAULT_MAX_CACHED_SIZE, **kwargs) -> None:
+        super().__init__(directory=directory, **kwargs)
+        self.max_cached_size = max_cached_size
+        self._cache: dict[str, PrecompressedBody] = {}
+        self._load(Path(directory))
+
+    def _load(self, root: Path) -> None:
+        """
+        Loads every regular file of at most `max_cached_size` bytes below `root` into the cache.
+        """
+        for path in sorted(root.rglob("*")):
+            if path.is_symlink() or not path.is_file() or path.stat().st_size > self.max_cached_size:
+                continue
+            relative_path = os.path.normpath(path.relative_to(root))
+            cache_control = IMMUTABLE_CACHE_CONTROL if is_fingerprinted(path.name) else REVALIDATE_CACHE_CONTROL
+            self._cache[relative_path] = PrecompressedBody.from_file(path, cache_control)
+        logger.debug(f"Static files: {len(self._cache)} files from {root} cached in memory")
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """
+        Returns the cached file for GET/HEAD requests, or falls back to `StaticFiles`.
+
+        Args:
+            path (str): The normalized path relative to the static directory.
+            scope (Scope): The ASGI scope.
+
+        Returns:
+            Response: The file, a 304, or the error response of `StaticFiles`.
+        """
+        cached = self._cache.get(path)
+        if cached is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        return cached.response(Headers(scope=scope))
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """
+        Serves a file from disk with `SendfileResponse`, marking fingerprinted files as immutable.
+
+        Args:
+            full_path (PathLike): The absolute file path.
+            stat_result (os.stat_result): The result of `os.stat` on the file.
+            scope (Scope): The ASGI scope.
+            status_code (int): The response status code. Defaults to 200.
+
+        Returns:
+            Response: The file response, or 304 Not Modified if the client's copy is current.
+        """
+        response = SendfileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if is_fingerprinted(os.fspath(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
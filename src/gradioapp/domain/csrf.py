@@ -1,46 +1,110 @@
-from fastapi import Request
-from itsdangerous import URLSafeTimedSerializer
+import base64
+import functools
+import hashlib
+import hmac
+import secrets
+
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
 
 from ..config import get_settings
 
-settings = get_settings()
-serializer = URLSafeTimedSerializer(settings.secret_key)
+# HttpOnly cookie holding the random pre-session nonce the token is bound to
+CSRF_NONCE_COOKIE = "csrf_nonce"
+
+# Script-readable cookie holding the token, for the form and for the Gradio fetch interceptor
+CSRF_TOKEN_COOKIE = "csrf_token"
+
+# Header carrying the token on API requests (e.g. Gradio POSTs)
+CSRF_HEADER = "x-csrf-token"
+
+# Methods that must carry a valid token
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+@functools.cache
+def _csrf_key() -> bytes:
+    settings = get_settings()
+    return (settings.csrf_secret or settings.jwt_secret).encode("utf-8")
+
+
+def new_csrf_nonce() -> str:
+    """
+    Generates a random pre-session nonce.
+
+    Returns:
+        str: A URL-safe nonce with 128 bits of entropy.
+    """
+    return secrets.token_urlsafe(16)
 
 
-def generate_csrf_token(request: Request) -> str:
+def generate_csrf_token(nonce: str) -> str:
     """
-    Generates a CSRF token for the given request.
+    Generates the CSRF token bound to a nonce.
 
-    The token is created by serializing the client's host address using a secret salt.
+    The token is the HMAC-SHA256 of the nonce under `CSRF_SECRET` (or `JWT_SECRET` if it is not set).
+    A cross-site attacker can neither read the nonce cookie nor compute its HMAC, so a request that
+    carries a token matching its own nonce cookie was issued by a page of this site (double submit).
 
     Args:
-        request (Request): The incoming HTTP request object.
+        nonce (str): The pre-session nonce from the `csrf_nonce` cookie.
 
     Returns:
-        str: A CSRF token string unique to the client's host.
+        str: The URL-safe base64 encoded token.
     """
-    host = request.client.host if request.client else "unknown"
-    return serializer.dumps(host, salt=settings.csrf_secret)
+    digest = hmac.new(_csrf_key(), nonce.encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
 
 
-def validate_csrf_token(token: str, request: Request) -> bool:
+def validate_csrf_token(token: str | None, request: HTTPConnection) -> bool:
     """
-    Validates a CSRF token by deserializing it and comparing its data to the client's host.
+    Validates a submitted CSRF token against the nonce cookie of the request.
 
     Args:
-        token (str): The CSRF token to validate.
-        request (Request): The incoming HTTP request object.
+        token (str | None): The token submitted in the form or the `X-CSRF-Token` header.
+        request (HTTPConnection): The incoming request carrying the `csrf_nonce` cookie.
 
     Returns:
-        bool: True if the token is valid and matches the client's host, False otherwise.
-    """
-    try:
-        data = serializer.loads(token, salt=settings.csrf_secret, max_age=3600)  # Token valid for 1 hour
-        host = request.client.host if request.client else "unknown"
-        return data == host
-    except Exception:
-        # Catching generic Exception is intentional here for security reasons:
-        # - Prevents information leakage about specific failure types (BadSignature, SignatureExpired, etc.)
-        # - Returns False for any validation failure, maintaining consistent security posture
-        # - Protects against timing attacks by not revealing why validation failed
+        bool: True if the token matches the HMAC of the request's nonce, False otherwise.
+    """
+    nonce = request.cookies.get(CSRF_NONCE_COOKIE)
+    if not nonce or not token:
+        return False
+    return hmac.compare_digest(generate_csrf_token(nonce).encode("ascii"), token.encode("utf-8"))
+
+
+def set_csrf_cookies(response: Response, nonce: str) -> str:
+    """
+    Sets the nonce and token cookies on a response.
+
+    Args:
+        response (Response): The outgoing response.
+        nonce (str): The nonce to bind the token to.
+
+    Returns:
+        str: The token.
+    """
+    token = generate_csrf_token(nonce)
+    response.set_cookie(CSRF_NONCE_COOKIE, nonce, httponly=True, secure=True, samesite="lax")
+    response.set_cookie(CSRF_TOKEN_COOKIE, token, httponly=False, secure=True, samesite="lax")
+    return token
+
+
+def ensure_csrf_cookies(request: HTTPConnection, response: Response) -> bool:
+    """
+    Issues the CSRF cookies on a response unless the request already carries a valid pair.
+
+    The request's nonce is kept if it has one; only a missing or mismatching token cookie is replaced.
+
+    Args:
+        request (HTTPConnection): The incoming request.
+        response (Response): The outgoing response.
+
+    Returns:
+        bool: True if cookies were set on the response, False otherwise.
+    """
+    nonce = request.cookies.get(CSRF_NONCE_COOKIE)
+    if nonce and validate_csrf_token(request.cookies.get(CSRF_TOKEN_COOKIE), request):
         return False
+    set_csrf_cookies(response, nonce or new_csrf_nonce())
+    return True
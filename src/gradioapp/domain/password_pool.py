@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Callable, TypeVar
+
+from loguru import logger
+
+from ..config import get_settings
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusyError(Exception):
+    """Raised when the password verification queue is full."""
+
+
+class PasswordPool:
+    """
+    Bounded worker pool for password hashing and verification.
+
+    bcrypt is deliberately slow (100-300 ms per check) and releases the GIL while it runs, so checks
+    are executed on a small dedicated thread pool instead of the event loop. The number of checks
+    that may be running or waiting is capped; when the cap is reached new checks are rejected at once
+    with `PasswordPoolBusyError` so callers can answer with a fast 503 instead of queueing forever.
+
+    The pending counter is only touched from the event loop thread and therefore needs no lock.
+
+    Attributes:
+        max_workers (int): Number of worker threads.
+        max_pending (int): Maximum number of checks running or queued at once.
+        _pending (int): Number of checks currently running or queued.
+        _executor (ThreadPoolExecutor): The worker thread pool.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+
+    @property
+    def pending(self) -> int:
+        """int: Number of checks currently running or queued."""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """
+        Runs a blocking password function on the worker pool.
+
+        Like `asyncio.to_thread`, the function runs in a copy of the caller's context, so context
+        variables such as the request ID reach the worker thread and its log records.
+
+        Args:
+            func (Callable[..., T]): The blocking function, e.g. `authenticate_user`.
+            *args (object): Positional arguments for `func`.
+
+        Returns:
+            T: The result of `func`.
+
+        Raises:
+            PasswordPoolBusyError: If `max_pending` checks are already running or queued.
+        """
+        if self._pending >= self.max_pending:
+            logger.warning(f"Password pool busy: {self._pending} pending checks, rejecting")
+            raise PasswordPoolBusyError("Too many concurrent password checks")
+        self._pending += 1
+        try:
+            call = partial(copy_context().run, func, *args)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker threads after running checks have finished.
+        """
+        self._executor.shutdown(wait=True)
+
+
+# Singleton
+_password_pool: PasswordPool | None = None
+
+
+def get_password_pool() -> PasswordPool:
+    """
+    Retrieve the process-wide password pool, creating it from settings on first use.
+
+    Returns:
+        PasswordPool: The password pool instance.
+    """
+    global _password_pool
+    if _password_pool is None:
+        settings = get_settings()
+        _password_pool = PasswordPool(
+            max_workers=settings.password_pool_workers,
+            max_pending=settings.password_pool_max_pending,
+        )
+    return _password_pool
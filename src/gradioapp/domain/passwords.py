@@ -0,0 +1,96 @@
+import time
+
+import bcrypt
+
+# bcrypt library default cost, used when no cost is given
+DEFAULT_ROUNDS = 12
+
+# Bounds of the automatically calibrated cost; below 10 is considered too weak for stored passwords
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+# Cheap cost that is measured during calibration and extrapolated from (each extra round doubles the work)
+CALIBRATION_ROUNDS = 8
+
+
+def hash_password(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
+    """
+    Hash a password using bcrypt.
+
+    Args:
+        password (str): The plain text password to hash.
+        rounds (int): The bcrypt cost factor (log2 of the number of key expansion rounds). Defaults to 12.
+
+    Returns:
+        str: The hashed password as a string.
+    """
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    """
+    Verify a password against a bcrypt hash.
+
+    Args:
+        password (str): The plain text password to verify.
+        password_hash (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def get_rounds(password_hash: str) -> int:
+    """
+    Read the cost factor of a bcrypt hash (`$2b$<rounds>$...`).
+
+    Args:
+        password_hash (str): The bcrypt hash.
+
+    Returns:
+        int: The cost factor.
+    """
+    return int(password_hash.split("$")[2])
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """
+    Measure how long one bcrypt hash (and therefore one verification) takes on this host.
+
+    Args:
+        rounds (int): The cost factor to measure.
+        samples (int): Number of measurements; the fastest is returned to filter out scheduling noise.
+
+    Returns:
+        float: Duration of one hash in milliseconds.
+    """
+    salt = bcrypt.gensalt(rounds)
+    timings = []
+    for _ in range(samples):
+        start_time = time.perf_counter()
+        bcrypt.hashpw(b"calibration", salt)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return min(timings)
+
+
+def calibrate_rounds(target_ms: float, min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS) -> int:
+    """
+    Pick the highest cost factor whose verification stays within a target latency on this host.
+
+    bcrypt work doubles with every round, so the duration of a cheap `CALIBRATION_ROUNDS` hash is
+    measured and extrapolated instead of timing expensive costs directly.
+
+    Args:
+        target_ms (float): Target verification latency in milliseconds.
+        min_rounds (int): Lowest cost ever returned, even if it exceeds the target. Defaults to `MIN_ROUNDS`.
+        max_rounds (int): Highest cost ever returned. Defaults to `MAX_ROUNDS`.
+
+    Returns:
+        int: The calibrated cost factor.
+    """
+    base_ms = measure_hash_ms(CALIBRATION_ROUNDS)
+    rounds = CALIBRATION_ROUNDS
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - CALIBRATION_ROUNDS) <= target_ms:
+        rounds += 1
+    return max(min_rounds, rounds)
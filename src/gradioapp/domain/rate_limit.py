@@ -0,0 +1,217 @@
+from collections import OrderedDict
+import math
+import threading
+import time
+from typing import Callable
+
+from loguru import logger
+
+from ..config import get_settings
+
+# Number of independently locked shards per limiter
+DEFAULT_SHARDS = 16
+
+
+class _Shard:
+    """One lock-protected slice of a `TokenBucketLimiter`."""
+
+    __slots__ = ("lock", "buckets", "allowed", "rejected", "evicted")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> [tokens, last update]; ordered from least to most recently updated
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+
+class TokenBucketLimiter:
+    """
+    In-memory token bucket rate limiter keyed by an arbitrary string (client IP, username, ...).
+
+    Every key gets a bucket of `burst` tokens that refills at `rate` tokens per second; each attempt
+    takes one token. Buckets live in `shards` independently locked ordered dicts, so concurrent
+    callers rarely contend. Memory is bounded by `max_keys`: a bucket that has been idle long enough
+    to refill completely is indistinguishable from a new one and is dropped, and when a shard is full
+    its least recently used bucket is evicted. Both evictions are O(1) and happen on access, so no
+    background thread is needed.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (float): Bucket capacity.
+        _idle_ttl (float): Seconds after which an untouched bucket is full again and can be dropped.
+        _max_keys_per_shard (int): Maximum number of buckets per shard.
+        _shards (list[_Shard]): The shards.
+        _clock (Callable[[], float]): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 100_000,
+        shards: int = DEFAULT_SHARDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._idle_ttl = burst / rate
+        self._max_keys_per_shard = max(1, max_keys // shards)
+        self._shards = [_Shard() for _ in range(shards)]
+        self._clock = clock
+
+    def acquire(self, key: str) -> float:
+        """
+        Takes a token from the bucket of `key` if one is available.
+
+        Args:
+            key (str): The bucket key.
+
+        Returns:
+            float: 0.0 if the attempt is admitted, otherwise the number of seconds until a token is available.
+        """
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = self._clock()
+        with shard.lock:
+            self._evict_idle(shard, now)
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                tokens = self.burst
+                if len(shard.buckets) >= self._max_keys_per_shard:
+                    shard.buckets.popitem(last=False)
+                    shard.evicted += 1
+            else:
+                tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+                shard.allowed += 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+                shard.rejected += 1
+            shard.buckets[key] = [tokens, now]
+            shard.buckets.move_to_end(key)
+        return retry_after
+
+    def _evict_idle(self, shard: _Shard, now: float) -> None:
+        """
+        Drops buckets, oldest first, that have been idle long enough to be full again.
+        """
+        while shard.buckets:
+            key, (_, updated) = next(iter(shard.buckets.items()))
+            if now - updated < self._idle_ttl:
+                return
+            del shard.buckets[key]
+            shard.evicted += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the limiter counters summed over all shards.
+
+        Returns:
+            dict[str, int]: `allowed`, `rejected` and `evicted` attempts/buckets, and the current number of `buckets`.
+        """
+        totals = {"allowed": 0, "rejected": 0, "evicted": 0, "buckets": 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals["allowed"] += shard.allowed
+                totals["rejected"] += shard.rejected
+                totals["evicted"] += shard.evicted
+                totals["buckets"] += len(shard.buckets)
+        return totals
+
+
+class LoginRateLimiter:
+    """
+    Admission control for login attempts, checked before any password is verified.
+
+    An attempt must get a token from the bucket of its client IP and then from the bucket of the
+    username it targets. The first limits credential stuffing from one source; the second limits
+    guessing against one account from many sources. A rejection costs one dict lookup, so throttled
+    attempts never reach bcrypt.
+
+    Attributes:
+        ip (TokenBucketLimiter): Buckets keyed by client IP.
+        account (TokenBucketLimiter): Buckets keyed by normalized username.
+    """
+
+    def __init__(self, ip: TokenBucketLimiter, account: TokenBucketLimiter) -> None:
+        self.ip = ip
+        self.account = account
+
+    def check(self, client_ip: str, username: str) -> int:
+        """
+        Checks whether a login attempt may proceed to password verification.
+
+        The account bucket is only charged when the IP bucket admits the attempt, so a throttled
+        source cannot drain the budget of the account it targets.
+
+        Args:
+            client_ip (str): The client IP address.
+            username (str): The submitted username.
+
+        Returns:
+            int: 0 if the attempt is admitted, otherwise the number of seconds to wait (for `Retry-After`).
+        """
+        retry_after = self.ip.acquire(client_ip)
+        if retry_after:
+            logger.debug("Login throttled for client {}", client_ip)
+            return math.ceil(retry_after)
+        retry_after = self.account.acquire(username.strip().lower())
+        if retry_after:
+            logger.debug("Login throttled for account {}", username)
+            return math.ceil(retry_after)
+        return 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters of both limiters.
+
+        Returns:
+            dict[str, int]: Counters prefixed with `ip_` and `account_`, e.g. `ip_rejected`.
+        """
+        ip_stats = {f"ip_{name}": value for name, value in self.ip.stats().items()}
+        account_stats = {f"account_{name}": value for name, value in self.account.stats().items()}
+        return ip_stats | account_stats
+
+
+# Singleton
+_login_rate_limiter: LoginRateLimiter | None = None
+
+
+def initialize_login_rate_limiter(limiter: LoginRateLimiter | None) -> None:
+    """
+    Initializes the global login rate limiter.
+
+    Args:
+        limiter (LoginRateLimiter | None): The limiter to use, or None to build it from the settings on next use.
+    """
+    global _login_rate_limiter
+    _login_rate_limiter = limiter
+
+
+def get_login_rate_limiter() -> LoginRateLimiter:
+    """
+    Retrieve the process-wide login rate limiter, creating it from settings on first use.
+
+    Returns:
+        LoginRateLimiter: The login rate limiter instance.
+    """
+    global _login_rate_limiter
+    if _login_rate_limiter is None:
+        settings = get_settings()
+        _login_rate_limiter = LoginRateLimiter(
+            ip=TokenBucketLimiter(
+                rate=settings.login_ip_rate / 60,
+                burst=settings.login_ip_burst,
+                max_keys=settings.login_limiter_max_keys,
+            ),
+            account=TokenBucketLimiter(
+                rate=settings.login_account_rate / 60,
+                burst=settings.login_account_burst,
+                max_keys=settings.login_limiter_max_keys,
+            ),
+        )
+    return _login_rate_limiter
@@ -1,4 +1,6 @@
 from .backends.memory import InMemorySessionStore
+from .revocation import SessionRevocationHub, get_revocation_hub
+from .scoped import RequestSession
 from .store import SessionStore, get_session_store, initialize_session_store
 from .types import SessionData
 
@@ -8,4 +10,7 @@ __all__ = [
     "InMemorySessionStore",
     "initialize_session_store",
     "get_session_store",
+    "SessionRevocationHub",
+    "get_revocation_hub",
+    "RequestSession",
 ]
@@ -1,11 +1,23 @@
-from datetime import datetime
+import functools
+import os
 import threading
 import time
-from typing import Optional
+from typing import Iterable, Optional
+import weakref
 
 from loguru import logger
 
-from ..types import SessionData
+from ..types import SessionData, format_session
+
+# Formats the session only when a debug record is written; created once, `logger.opt()` costs a microsecond per call
+_lazy_logger = logger.opt(lazy=True)
+
+
+def _call_if_alive(method_ref: weakref.WeakMethod) -> None:
+    """Calls a weakly referenced bound method, unless its object was garbage-collected."""
+    method = method_ref()
+    if method is not None:
+        method()
 
 
 class InMemorySessionStore:
@@ -31,12 +43,21 @@ class InMemorySessionStore:
             Retrieves a session by its session_id. If the session is expired or does not exist, returns None.
             Resets the TTL on successful retrieval.
 
+        update_session(session_id: str, data: dict) -> None:
+            Replaces the data of an existing session. Missing or expired sessions are ignored.
+
+        merge_session(session_id: str, changes: dict, removed: Iterable[str]) -> None:
+            Sets and removes keys in the data of an existing session under the store lock.
+
         delete_session(session_id: str) -> None:
             Deletes a session by its session_id.
 
         dump_session(session_id: str) -> str:
             Returns a string representation of a session for debugging purposes.
 
+        count_sessions() -> int:
+            Returns the number of sessions in the store, including expired ones not yet cleaned up.
+
         dump_store() -> str:
             Returns a string representation of all sessions in the store for debugging purposes.
 
@@ -48,6 +69,9 @@ class InMemorySessionStore:
 
         stop_cleanup_thread() -> None:
             Stops the background cleanup thread gracefully.
+
+        _restart_after_fork() -> None:
+            Recreates the lock and the cleanup thread in a forked child process.
     """
 
     def __init__(self, ttl: int = 60 * 30, cleanup_interval: int = 60) -> None:
@@ -69,6 +93,10 @@ class InMemorySessionStore:
         self._stop_cleanup_thread = threading.Event()
         self._cleanup_thread = threading.Thread(target=self._cleanup_expired_sessions, daemon=True)
         self._cleanup_thread.start()
+        # A prefork worker inherits the store without its thread (see `server.PreforkServer`)
+        os.register_at_fork(
+            after_in_child=functools.partial(_call_if_alive, weakref.WeakMethod(self._restart_after_fork))
+        )
 
     def create_session(self, session_id: str, username: str, data: dict) -> SessionData:
         """
@@ -90,7 +118,7 @@ class InMemorySessionStore:
         }
         with self._lock:
             self._store[session_id] = session_data
-        logger.debug(self._format_session(session_id, session_data))
+        _lazy_logger.debug("{}", lambda: self._format_session(session_id, session_data))
         return session_data
 
     def get_session(self, session_id: str) -> Optional[SessionData]:
@@ -120,9 +148,59 @@ class InMemorySessionStore:
             session["expire_at"] = current_time + self._ttl
             # Copy session data before releasing lock
             session_data = session.copy()
-        logger.debug(self._format_session(session_id, session_data))
+        _lazy_logger.debug("{}", lambda: self._format_session(session_id, session_data))
         return session_data
 
+    def update_session(self, session_id: str, data: dict) -> None:
+        """
+        Replace the data of an existing session.
+
+        Args:
+            session_id (str): The unique identifier of the session to update.
+            data (dict): The new session data.
+
+        Returns:
+            None
+
+        Side Effects:
+            - Missing or expired sessions are not recreated.
+        """
+        with self._lock:
+            session = self._store.get(session_id)
+            if not session or session["expire_at"] < time.time():
+                return
+            session["data"] = data
+        logger.debug("Session updated: {}", session_id)
+
+    def merge_session(self, session_id: str, changes: dict, removed: Iterable[str]) -> None:
+        """
+        Set and remove keys in the data of an existing session, keeping the other stored keys.
+
+        The merge happens under the store lock, so keys written concurrently by other requests or by
+        Gradio queue workers are kept. The data dict is replaced, not modified, so callers holding the
+        previous one do not see it change.
+
+        Args:
+            session_id (str): The unique identifier of the session to update.
+            changes (dict): Keys to set and their values.
+            removed (Iterable[str]): Keys to remove; missing keys are ignored.
+
+        Returns:
+            None
+
+        Side Effects:
+            - Missing or expired sessions are not recreated.
+        """
+        with self._lock:
+            session = self._store.get(session_id)
+            if not session or session["expire_at"] < time.time():
+                return
+            data = {**session["data"], **changes}
+            for key in removed:
+                data.pop(key, None)
+            session["data"] = data
+        logger.debug("Session merged: {}", session_id)
+
     def delete_session(self, session_id: str) -> None:
         """
         Delete a session from the in-memory store.
@@ -135,7 +213,19 @@ class InMemorySessionStore:
         """
         with self._lock:
             self._store.pop(session_id, None)
-        logger.debug(f"Session deleted: {session_id}")
+        logger.debug("Session deleted: {}", session_id)
+
+    def count_sessions(self) -> int:
+        """
+        Returns the number of sessions in the store.
+
+        Expired sessions are counted until the cleanup thread removes them.
+
+        Returns:
+            int: The number of stored sessions.
+        """
+        with self._lock:
+            return len(self._store)
 
     def dump_session(self, session_id: str) -> str:
         """
@@ -190,11 +280,7 @@ class InMemorySessionStore:
         Returns:
             str: A formatted string containing the session ID, username, expiration time (ISO format), and session data.
         """
-        expire_at_iso = datetime.fromtimestamp(session["expire_at"]).isoformat()
-        return (
-            f"Session ID: {session_id}, Username: {session['username']}, "
-            f"Expire At: {expire_at_iso}, Data: {session['data']}"
-        )
+        return format_session(session_id, session)
 
     def _cleanup_expired_sessions(self) -> None:
         """
@@ -217,7 +303,7 @@ class InMemorySessionStore:
                     self._store.pop(session_id, None)
             # Log outside the lock
             for session_id in expired_sessions:
-                logger.debug(f"Expired session removed: {session_id}")
+                logger.debug("Expired session removed: {}", session_id)
             # Use wait with timeout instead of sleep to allow faster shutdown
             if self._stop_cleanup_thread.wait(timeout=self._cleanup_interval):
                 # Event was set, exit loop
@@ -236,3 +322,17 @@ class InMemorySessionStore:
         """
         self._stop_cleanup_thread.set()
         self._cleanup_thread.join(timeout=timeout)
+
+    def _restart_after_fork(self) -> None:
+        """
+        Recreates the lock and restarts the cleanup thread in a forked child process.
+
+        Only the forking thread survives `fork()`, so the child has no cleanup thread, and the lock may
+        have been copied while the cleanup thread held it. A stopped store stays stopped.
+        """
+        self._lock = threading.RLock()
+        if self._stop_cleanup_thread.is_set():
+            return
+        self._stop_cleanup_thread = threading.Event()
+        self._cleanup_thread = threading.Thread(target=self._cleanup_expired_sessions, daemon=True)
+        self._cleanup_thread.start()
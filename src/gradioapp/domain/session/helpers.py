@@ -1,12 +1,18 @@
-from fastapi import Request
-import gradio as gr
+from typing import TYPE_CHECKING, Any
+
 from loguru import logger
 
+from .scoped import RequestSession
 from .store import get_session_store
 from .types import SessionData
 
+if TYPE_CHECKING:
+    # Type hints only: importing Gradio takes seconds, and the helpers work on any request with a `state`
+    from fastapi import Request
+    import gradio as gr
+
 
-def get_session_id(request: gr.Request | Request) -> str | None:
+def get_session_id(request: "gr.Request | Request") -> str | None:
     """
     Retrieve the session ID from the request state.
 
@@ -23,16 +29,38 @@ def get_session_id(request: gr.Request | Request) -> str | None:
     return session_id
 
 
-def get_session(request: gr.Request | Request) -> SessionData | None:
+def get_request_session(request: "gr.Request | Request") -> RequestSession | None:
+    """
+    Retrieve the session resolved by the gateway middleware for the given request.
+
+    Args:
+        request (gr.Request | Request): The incoming request object.
+
+    Returns:
+        RequestSession | None: The request-scoped session, or None if the middleware did not resolve one.
+    """
+    request_session = getattr(request.state, "session", None)
+    if isinstance(request_session, RequestSession):
+        return request_session
+    return None
+
+
+def get_session(request: "gr.Request | Request") -> SessionData | None:
     """
     Retrieve the session data associated with the given request.
 
+    The session resolved by the gateway middleware is reused; the session store is only
+    queried when the request carries no request-scoped session.
+
     Args:
         request (gr.Request | Request): The incoming request object from which to extract the session ID.
 
     Returns:
         SessionData | None: The session data as a SessionData dictionary if found, otherwise None.
     """
+    request_session = get_request_session(request)
+    if request_session is not None:
+        return request_session.session
     session_id = get_session_id(request)
     if not session_id:
         return None
@@ -41,3 +69,33 @@ def get_session(request: gr.Request | Request) -> SessionData | None:
         logger.error(f"Session data not found for session ID: {session_id}")
         return None
     return session
+
+
+def set_session_value(request: "gr.Request | Request", key: str, value: Any) -> bool:
+    """
+    Store a value in the session data of the given request.
+
+    With a request-scoped session the write is deferred and flushed once at the end of the
+    request; otherwise it is written to the session store immediately.
+
+    Args:
+        request (gr.Request | Request): The incoming request object.
+        key (str): The data key.
+        value (Any): The value to store.
+
+    Returns:
+        bool: True if the value was stored, False if the request has no valid session.
+    """
+    request_session = get_request_session(request)
+    if request_session is not None:
+        request_session.set(key, value)
+        return True
+    session_id = get_session_id(request)
+    if not session_id:
+        return False
+    store = get_session_store()
+    session = store.get_session(session_id)
+    if not session:
+        return False
+    store.merge_session(session_id, {key: value}, ())
+    return True
@@ -0,0 +1,86 @@
+import threading
+from typing import Callable
+
+from loguru import logger
+
+RevocationListener = Callable[[], None]
+
+
+class SessionRevocationHub:
+    """
+    In-process publish/subscribe hub for session revocation events.
+
+    Long-lived connections (SSE streams and websockets) subscribe with the session ID they were
+    authenticated for. When a session is revoked, for example on logout, every listener registered
+    for that session is called so the connection can be closed without polling the session store.
+
+    Listeners may be called from any thread; they must be cheap and thread-safe
+    (e.g. `loop.call_soon_threadsafe(event.set)`).
+
+    Attributes:
+        _listeners (dict[str, set[RevocationListener]]): Listeners registered per session ID.
+        _lock (threading.Lock): Lock protecting the listeners registry.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: dict[str, set[RevocationListener]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, session_id: str, listener: RevocationListener) -> None:
+        """
+        Registers a listener to be called when the given session is revoked.
+
+        Args:
+            session_id (str): The session ID to watch.
+            listener (RevocationListener): Callable invoked on revocation.
+        """
+        with self._lock:
+            self._listeners.setdefault(session_id, set()).add(listener)
+
+    def unsubscribe(self, session_id: str, listener: RevocationListener) -> None:
+        """
+        Removes a previously registered listener. Unknown listeners are ignored.
+
+        Args:
+            session_id (str): The session ID the listener was registered for.
+            listener (RevocationListener): The listener to remove.
+        """
+        with self._lock:
+            listeners = self._listeners.get(session_id)
+            if listeners is None:
+                return
+            listeners.discard(listener)
+            if not listeners:
+                del self._listeners[session_id]
+
+    def revoke(self, session_id: str) -> int:
+        """
+        Notifies and removes all listeners registered for the given session.
+
+        Args:
+            session_id (str): The revoked session ID.
+
+        Returns:
+            int: The number of listeners notified.
+        """
+        with self._lock:
+            listeners = self._listeners.pop(session_id, set())
+        for listener in listeners:
+            listener()
+        if listeners:
+            logger.debug("Session {} revoked, notified {} open stream(s)", session_id, len(listeners))
+        return len(listeners)
+
+
+# Singleton
+_revocation_hub = SessionRevocationHub()
+
+
+def get_revocation_hub() -> SessionRevocationHub:
+    """
+    Retrieve the process-wide session revocation hub.
+
+    Returns:
+        SessionRevocationHub: The revocation hub instance.
+    """
+    return _revocation_hub
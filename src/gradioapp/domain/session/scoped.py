@@ -0,0 +1,114 @@
+from typing import Any
+
+from loguru import logger
+
+from .store import get_session_store
+from .types import SessionData
+
+
+class RequestSession:
+    """
+    Session resolved once per request and shared by all handlers of that request.
+
+    The gateway middleware fetches the session from the store when it authenticates a request and
+    attaches a `RequestSession` to the connection state (`request.state.session`). Helpers read
+    from it without another store round trip. Writes made through `set` and `delete` are recorded
+    as pending changes; `close` merges them into the store once, at the end of the request, so keys
+    written meanwhile by other requests or Gradio queue workers are kept. Writes made after the
+    session was closed (e.g. by Gradio queue workers that outlive the HTTP request) are written
+    through to the store immediately.
+
+    Attributes:
+        session_id (str): The session ID.
+        _session (SessionData): The session data resolved from the store, including pending writes.
+        _changes (dict[str, Any]): Keys set since the last flush and their values.
+        _removed (set[str]): Keys deleted since the last flush.
+        _closed (bool): Whether the owning request has finished.
+    """
+
+    def __init__(self, session_id: str, session: SessionData) -> None:
+        self.session_id = session_id
+        self._session = session
+        self._changes: dict[str, Any] = {}
+        self._removed: set[str] = set()
+        self._closed = False
+
+    @property
+    def session(self) -> SessionData:
+        """SessionData: The resolved session data."""
+        return self._session
+
+    @property
+    def dirty(self) -> bool:
+        """bool: Whether there are writes that have not been flushed to the store."""
+        return bool(self._changes or self._removed)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns a value from the session data.
+
+        Args:
+            key (str): The data key.
+            default (Any): Value returned when the key is missing. Defaults to None.
+
+        Returns:
+            Any: The stored value or `default`.
+        """
+        return self._session["data"].get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a value in the session data and marks the session as dirty.
+
+        Args:
+            key (str): The data key.
+            value (Any): The value to store.
+        """
+        self._own_data()[key] = value
+        self._changes[key] = value
+        self._removed.discard(key)
+        self._flush_if_closed()
+
+    def delete(self, key: str) -> None:
+        """
+        Removes a value from the session data and marks the session as dirty. Missing keys are ignored.
+
+        Args:
+            key (str): The data key.
+        """
+        if key in self._session["data"]:
+            del self._own_data()[key]
+            self._changes.pop(key, None)
+            self._removed.add(key)
+            self._flush_if_closed()
+
+    def flush(self) -> None:
+        """
+        Merges the keys set and deleted since the last flush into the stored session data.
+        """
+        if not self.dirty:
+            return
+        get_session_store().merge_session(self.session_id, self._changes, self._removed)
+        self._changes = {}
+        self._removed = set()
+        logger.debug("Session {} flushed to store", self.session_id)
+
+    def close(self) -> None:
+        """
+        Flushes pending writes and switches the session to write-through mode.
+        """
+        self.flush()
+        self._closed = True
+
+    def _own_data(self) -> dict[str, Any]:
+        """
+        Returns the session data dict, copying it on the first write so pending writes stay private
+        to this request until flushed (stores may hand out data shared with their internal state).
+        """
+        if not self.dirty:
+            self._session["data"] = dict(self._session["data"])
+        return self._session["data"]
+
+    def _flush_if_closed(self) -> None:
+        if self._closed:
+            self.flush()
@@ -1,4 +1,4 @@
-from typing import Optional, Protocol
+from typing import Iterable, Optional, Protocol
 
 from .types import SessionData
 
@@ -16,6 +16,13 @@ class SessionStore(Protocol):
             Retrieve the session data for the given session ID.
             Returns the session as a SessionData dictionary if found, otherwise None.
 
+        update_session(session_id: str, data: dict) -> None:
+            Replace the data of an existing session. Missing or expired sessions are ignored.
+
+        merge_session(session_id: str, changes: dict, removed: Iterable[str]) -> None:
+            Atomically set the `changes` keys and remove the `removed` keys in the data of an existing
+            session, keeping every other key as stored. Missing or expired sessions are ignored.
+
         delete_session(session_id: str) -> None:
             Delete the session associated with the given session ID.
 
@@ -24,6 +31,9 @@ class SessionStore(Protocol):
 
         dump_store() -> str:
             Serialize and return the entire session store as a string.
+
+        count_sessions() -> int:
+            Return the number of stored sessions (expired ones may be included until they are cleaned up).
     """
 
     def create_session(self, session_id: str, username: str, data: dict) -> SessionData:
@@ -32,6 +42,12 @@ class SessionStore(Protocol):
     def get_session(self, session_id: str) -> Optional[SessionData]:
         ...
 
+    def update_session(self, session_id: str, data: dict) -> None:
+        ...
+
+    def merge_session(self, session_id: str, changes: dict, removed: Iterable[str]) -> None:
+        ...
+
     def delete_session(self, session_id: str) -> None:
         ...
 
@@ -41,6 +57,9 @@ class SessionStore(Protocol):
     def dump_store(self) -> str:
         ...
 
+    def count_sessions(self) -> int:
+        ...
+
 
 # Singleton
 _session_store: SessionStore | None = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, TypedDict
 
 
@@ -14,3 +15,21 @@ class SessionData(TypedDict):
     username: str
     data: dict[str, Any]
     expire_at: float
+
+
+def format_session(session_id: str, session: SessionData) -> str:
+    """
+    Formats the session information into a human-readable string.
+
+    Args:
+        session_id (str): The unique identifier for the session.
+        session (SessionData): The session data.
+
+    Returns:
+        str: A formatted string containing the session ID, username, expiration time (ISO format), and session data.
+    """
+    expire_at_iso = datetime.fromtimestamp(session["expire_at"]).isoformat()
+    return (
+        f"Session ID: {session_id}, Username: {session['username']}, "
+        f"Expire At: {expire_at_iso}, Data: {session['data']}"
+    )
@@ -0,0 +1,24 @@
+from .backends.memory import DEFAULT_USERS_FILE, InMemoryUserRepository
+from .backends.sqlite import SQLiteUserRepository
+from .helpers import authenticate_user, get_target_rounds, init_user_db
+from .model import User
+from .repository import (
+    UserRepository,
+    create_user_repository,
+    get_user_repository,
+    initialize_user_repository,
+)
+
+__all__ = [
+    "User",
+    "UserRepository",
+    "InMemoryUserRepository",
+    "SQLiteUserRepository",
+    "DEFAULT_USERS_FILE",
+    "create_user_repository",
+    "initialize_user_repository",
+    "get_user_repository",
+    "authenticate_user",
+    "get_target_rounds",
+    "init_user_db",
+]
@@ -0,0 +1,4 @@
+from .memory import InMemoryUserRepository
+from .sqlite import SQLiteUserRepository
+
+__all__ = ["InMemoryUserRepository", "SQLiteUserRepository"]
@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+from loguru import logger
+
+from ..model import User
+
+# Credentials file shipped with the package (sample users, password "secret")
+DEFAULT_USERS_FILE = Path(__file__).parents[3] / "data" / "users.json"
+
+
+class InMemoryUserRepository:
+    """
+    InMemoryUserRepository keeps all users in a dictionary keyed by username.
+
+    Suitable for a handful of accounts loaded from a credentials file; lookups are O(1).
+
+    Attributes:
+        _users (dict[str, User]): Users keyed by username.
+    """
+
+    def __init__(self, users: dict[str, User] | None = None) -> None:
+        """
+        Initializes the repository.
+
+        Args:
+            users (dict[str, User] | None): Initial users keyed by username. Defaults to no users.
+        """
+        self._users = dict(users or {})
+
+    @classmethod
+    def from_credentials(cls, credentials: dict[str, str]) -> "InMemoryUserRepository":
+        """
+        Creates a repository from a mapping of usernames to password hashes.
+
+        Args:
+            credentials (dict[str, str]): bcrypt hashes keyed by username.
+
+        Returns:
+            InMemoryUserRepository: The populated repository.
+        """
+        return cls({name: User(username=name, password_hash=hashed) for name, hashed in credentials.items()})
+
+    @classmethod
+    def from_file(cls, path: Path) -> "InMemoryUserRepository":
+        """
+        Creates a repository from a credentials file.
+
+        The file is a JSON object mapping usernames to bcrypt hashes, as written by
+        `gradioapp-admin hash-passwords`. No hashing happens here, so loading is cheap.
+
+        Args:
+            path (Path): The credentials file.
+
+        Returns:
+            InMemoryUserRepository: The populated repository.
+        """
+        with path.open(encoding="utf-8") as file:
+            credentials: dict[str, str] = json.load(file)
+        logger.info(f"Loaded {len(credentials)} users from {path}")
+        return cls.from_credentials(credentials)
+
+    def get_user(self, username: str) -> User | None:
+        """
+        Retrieves a user by username.
+
+        Args:
+            username (str): The username.
+
+        Returns:
+            User | None: The user, or None if it does not exist.
+        """
+        return self._users.get(username)
+
+    def add_user(self, user: User) -> None:
+        """
+        Adds a user, replacing an existing user with the same username.
+
+        Args:
+            user (User): The user to store.
+        """
+        self._users[user.username] = user
+
+    def usernames(self) -> list[str]:
+        """
+        Returns the usernames of all stored users.
+
+        Returns:
+            list[str]: The usernames.
+        """
+        return list(self._users)
+
+    def count_users(self) -> int:
+        """
+        Returns the number of stored users.
+
+        Returns:
+            int: The number of users.
+        """
+        return len(self._users)
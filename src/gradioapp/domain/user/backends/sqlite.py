@@ -0,0 +1,127 @@
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable
+
+from loguru import logger
+
+from ....core.cache import TTLCache
+from ..model import User
+
+
+class SQLiteUserRepository:
+    """
+    SQLiteUserRepository stores users in a SQLite database and caches loaded users in process.
+
+    Usernames are unique-indexed, so a lookup that misses the cache is a single index seek. Loaded
+    users are kept in a `TTLCache` so repeated logins do not touch the disk. Usernames that do not
+    exist are kept in a second, separately bounded `TTLCache`, so a flood of logins with made-up
+    usernames cannot evict real users from the first one. Entries expire after `cache_ttl` seconds,
+    which bounds how long a change made by another process (e.g. `gradioapp-admin import-users`) takes
+    to become visible; changes made through this instance invalidate the cache immediately.
+
+    The connection is shared by the worker threads of the password pool and guarded by a lock.
+
+    Attributes:
+        path (Path): The database file.
+        _connection (sqlite3.Connection): The database connection.
+        _lock (threading.Lock): Lock serializing access to the connection.
+        _cache (TTLCache[str, User]): Cached users keyed by username.
+        _misses (TTLCache[str, bool]): Cached usernames that do not exist.
+    """
+
+    def __init__(self, path: str | Path, cache_size: int = 1024, cache_ttl: float = 300.0) -> None:
+        """
+        Opens (and if needed creates) the user database.
+
+        Args:
+            path (str | Path): The database file, or ":memory:".
+            cache_size (int, optional): Maximum number of cached users, and of cached unknown usernames.
+                Defaults to 1024.
+            cache_ttl (float, optional): Seconds a cached lookup stays valid. Defaults to 300.
+        """
+        self.path = Path(path)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._cache: TTLCache[str, User] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._misses: TTLCache[str, bool] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "id INTEGER PRIMARY KEY, username TEXT NOT NULL, password_hash TEXT NOT NULL)"
+            )
+            self._connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_username_idx ON users (username)")
+        logger.info(f"SQLite user repository opened: {self.path}")
+
+    def get_user(self, username: str) -> User | None:
+        """
+        Retrieves a user by username, from the cache if possible.
+
+        Args:
+            username (str): The username.
+
+        Returns:
+            User | None: The user, or None if it does not exist.
+        """
+        user = self._cache.get(username)
+        if user is not None or self._misses.get(username):
+            return user
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT username, password_hash FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            self._misses.set(username, True)
+            return None
+        user = User(username=row[0], password_hash=row[1])
+        self._cache.set(username, user)
+        return user
+
+    def add_user(self, user: User) -> None:
+        """
+        Adds a user, replacing the password hash of an existing user with the same username.
+
+        Args:
+            user (User): The user to store.
+        """
+        self.add_users([user])
+
+    def add_users(self, users: Iterable[User]) -> int:
+        """
+        Adds or replaces several users in one transaction.
+
+        Args:
+            users (Iterable[User]): The users to store.
+
+        Returns:
+            int: The number of users written.
+        """
+        rows = [(user.username, user.password_hash) for user in users]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?) "
+                "ON CONFLICT (username) DO UPDATE SET password_hash = excluded.password_hash",
+                rows,
+            )
+        for username, _ in rows:
+            self._cache.pop(username)
+            self._misses.pop(username)
+        logger.debug(f"Stored {len(rows)} user(s) in {self.path}")
+        return len(rows)
+
+    def count_users(self) -> int:
+        """
+        Returns the number of stored users.
+
+        Returns:
+            int: The number of users.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,78 @@
+import threading
+
+from loguru import logger
+
+from ...config import get_settings
+from ..passwords import calibrate_rounds, get_rounds, hash_password
+from .model import User
+from .repository import (
+    create_user_repository,
+    get_user_repository,
+    initialize_user_repository,
+)
+
+# Cost factor new hashes are created with; resolved once by `get_target_rounds`
+_target_rounds: int | None = None
+_target_rounds_lock = threading.Lock()
+
+
+def init_user_db() -> None:
+    """Initialize the user repository from the settings, replacing the current one."""
+    initialize_user_repository(create_user_repository(get_settings()))
+
+
+def get_target_rounds() -> int:
+    """
+    Get the bcrypt cost factor that password hashes should have.
+
+    `BCRYPT_ROUNDS` is used when set. Otherwise the cost is calibrated once per process against
+    `BCRYPT_TARGET_MS`, so verification takes about that long on the measured hardware.
+
+    Returns:
+        int: The target cost factor.
+    """
+    global _target_rounds
+    if _target_rounds is None:
+        with _target_rounds_lock:
+            if _target_rounds is None:
+                _target_rounds = _resolve_target_rounds()
+    return _target_rounds
+
+
+def _resolve_target_rounds() -> int:
+    settings = get_settings()
+    if settings.bcrypt_rounds:
+        return settings.bcrypt_rounds
+    rounds = calibrate_rounds(settings.bcrypt_target_ms)
+    logger.info(f"bcrypt cost calibrated to {rounds} rounds for a {settings.bcrypt_target_ms} ms target")
+    return rounds
+
+
+def authenticate_user(username: str, password: str) -> User | None:
+    """
+    Authenticate a user by verifying the provided username and password.
+
+    If the password is correct but the stored hash was created with a lower cost factor than
+    `get_target_rounds`, the password is rehashed with the target cost and stored in the repository.
+    Stronger hashes are kept: the calibrated cost can differ between hosts and restarts, and a
+    downgrade would weaken the hash and make every process rewrite it back and forth.
+
+    Args:
+        username (str): The username of the user attempting to authenticate.
+        password (str): The password provided for authentication.
+
+    Returns:
+        Optional[User]: The authenticated User object if credentials are valid; otherwise, None.
+    """
+    repository = get_user_repository()
+    user = repository.get_user(username)
+    if not user or not user.verify_password(password):
+        return None
+
+    rounds = get_rounds(user.password_hash)
+    target_rounds = get_target_rounds()
+    if rounds < target_rounds:
+        user = User(username=user.username, password_hash=hash_password(password, target_rounds))
+        repository.add_user(user)
+        logger.info(f"Password of {username} rehashed from {rounds} to {target_rounds} rounds")
+    return user
@@ -0,0 +1,21 @@
+from ..passwords import check_password
+
+
+class User:
+    __slots__ = ("username", "password_hash")
+
+    def __init__(self, username: str, password_hash: str):
+        self.username = username
+        self.password_hash = password_hash
+
+    def verify_password(self, password: str) -> bool:
+        """
+        Verify a password against the stored hash.
+
+        Args:
+            password (str): The password to verify.
+
+        Returns:
+            bool: True if the password matches, False otherwise.
+        """
+        return check_password(password, self.password_hash)
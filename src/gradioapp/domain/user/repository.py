@@ -0,0 +1,87 @@
+from pathlib import Path
+from typing import Optional, Protocol
+
+from ...config import Settings, get_settings
+from .backends.memory import DEFAULT_USERS_FILE, InMemoryUserRepository
+from .backends.sqlite import SQLiteUserRepository
+from .model import User
+
+
+class UserRepository(Protocol):
+    """
+    Protocol for a user repository, defining the required methods for looking up and storing users.
+
+    Methods:
+        get_user(username: str) -> Optional[User]:
+            Retrieve the user with the given username. Returns None if it does not exist.
+
+        add_user(user: User) -> None:
+            Add a user, replacing an existing user with the same username.
+
+        count_users() -> int:
+            Return the number of stored users.
+    """
+
+    def get_user(self, username: str) -> Optional[User]: ...
+
+    def add_user(self, user: User) -> None: ...
+
+    def count_users(self) -> int: ...
+
+
+def create_user_repository(settings: Settings) -> UserRepository:
+    """
+    Creates the user repository selected by `USER_BACKEND`.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        UserRepository: An `InMemoryUserRepository` loaded from `USERS_FILE` (default: the bundled sample
+            users) for "memory", or a `SQLiteUserRepository` on `USER_DB_PATH` for "sqlite".
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if settings.user_backend == "memory":
+        users_file = Path(settings.users_file) if settings.users_file else DEFAULT_USERS_FILE
+        return InMemoryUserRepository.from_file(users_file)
+    if settings.user_backend == "sqlite":
+        return SQLiteUserRepository(
+            settings.user_db_path,
+            cache_size=settings.user_cache_size,
+            cache_ttl=settings.user_cache_ttl,
+        )
+    raise ValueError(f"Unknown user backend: {settings.user_backend!r} (expected 'memory' or 'sqlite')")
+
+
+# Singleton
+_user_repository: UserRepository | None = None
+
+
+def initialize_user_repository(repository: UserRepository | None) -> None:
+    """
+    Initializes the global user repository with the provided UserRepository instance.
+
+    Args:
+        repository (UserRepository | None): The user repository instance to be used globally,
+            or None to build it from the settings on next use.
+
+    Returns:
+        None
+    """
+    global _user_repository
+    _user_repository = repository
+
+
+def get_user_repository() -> UserRepository:
+    """
+    Retrieve the current user repository, creating it from the settings on first use.
+
+    Returns:
+        UserRepository: The current user repository instance.
+    """
+    global _user_repository
+    if _user_repository is None:
+        _user_repository = create_user_repository(get_settings())
+    return _user_repository
@@ -1,64 +1,255 @@
+import asyncio
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from pathlib import Path
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Callable
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-import gradio as gr
 from loguru import logger
-import uvicorn
 
-from .api.middleware import AuthMiddleware, LoggingMiddleware, SessionMiddleware
-from .api.routes import health_router, home_router, login_router, static_router
-from .config import get_settings
+from .api.middleware import (
+    AdmissionMiddleware,
+    CompressionMiddleware,
+    GatewayMiddleware,
+)
+from .api.routes import (
+    health_router,
+    home_router,
+    login_router,
+    metrics_router,
+    static_router,
+)
+from .api.routes.login import render_login_page
+from .config import Settings, get_settings
 from .core.logging import setup_logging
+from .core.loop_monitor import LoopLagMonitor, initialize_loop_monitor
+from .core.static_files import CachedStaticFiles
 from .domain.session.backends.memory import InMemorySessionStore
 from .domain.session.store import initialize_session_store
-from .ui import create_gradio_app
+from .domain.user.repository import create_user_repository, initialize_user_repository
+
+if TYPE_CHECKING:
+    import gradio as gr
 
 # Get base directory
 BASE_DIR = Path(__file__).parent
 
-# Setup logging
-setup_logging()
+GRADIO_PATH = "/gradio"
+
+Lifespan = Callable[[FastAPI], AbstractAsyncContextManager[None]]
+
+
+@asynccontextmanager
+async def _no_lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+
+
+def build_gradio_ui() -> "gr.Blocks":
+    """
+    Imports the UI package (and with it Gradio) and builds the Gradio UI.
+
+    Gradio and uvicorn take seconds to import, so they are imported only when the server starts:
+    tests and tools that import this module or create an app do not pay for them.
+
+    Returns:
+        gr.Blocks: The Gradio UI.
+    """
+    # Deferred so importing this module does not import Gradio
+    from .ui import create_gradio_app  # pylint: disable=import-outside-toplevel
+
+    return create_gradio_app()
+
+
+def mount_gradio(app: FastAPI, blocks: "gr.Blocks", path: str) -> Lifespan:
+    """
+    Mounts Gradio Blocks on an app whose lifespan is already running.
+
+    `gr.mount_gradio_app` chains the Gradio startup (queue, startup events) onto the app lifespan,
+    which is too late once the app has started. The Blocks are therefore mounted over an empty
+    lifespan, and the Gradio lifespan is returned for the caller to enter.
+
+    Args:
+        app (FastAPI): The application.
+        blocks (gr.Blocks): The Gradio UI.
+        path (str): The mount path.
+
+    Returns:
+        Lifespan: The Gradio lifespan context manager factory.
+    """
+    # Deferred so importing this module does not import Gradio
+    import gradio as gr  # pylint: disable=import-outside-toplevel
+
+    app_lifespan = app.router.lifespan_context
+    # Keep this swap: Gradio's lifespan must be entered by the caller, as `lifespan` does through
+    # `app.state.gradio_lifespan`. Chained onto the app lifespan by `mount_gradio_app`, it would be
+    # missed when the app is already running and entered twice when `main()` preloads the UI.
+    app.router.lifespan_context = _no_lifespan
+    try:
+        gr.mount_gradio_app(app, blocks, path=path)
+        return app.router.lifespan_context
+    finally:
+        app.router.lifespan_context = app_lifespan
+
+
+def preload_gradio(app: FastAPI) -> None:
+    """
+    Builds the Gradio UI and mounts it at `GRADIO_PATH`, unless the app already has it.
+
+    Must run on the main thread or on the event loop thread: the Gradio queue creates its asyncio
+    locks when the Blocks are built, and `gradio.utils.safe_get_lock` returns None in a thread
+    without an event loop, which breaks every queued event. `main()` calls it before the server
+    forks, so a recycled prefork worker starts with the UI already built; otherwise the lifespan
+    calls it on first start.
+
+    Args:
+        app (FastAPI): The application created by `create_app`.
+    """
+    if getattr(app.state, "gradio_blocks", None) is not None:
+        return
+    blocks = build_gradio_ui()
+    # Kept in the app state for the /readyz probe
+    app.state.gradio_blocks = blocks
+    app.state.gradio_lifespan = mount_gradio(app, blocks, GRADIO_PATH)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Initializes the application when the server starts and releases it when the server stops.
+
+    The session store and the user repository are created concurrently in worker threads. The
+    Gradio UI is built on the event loop thread by `preload_gradio`, unless `main()` preloaded it;
+    it is built and mounted once per app, and a restarted app reuses it. The event loop lag
+    monitor runs while the app serves, unless `loop_monitor_interval` is 0.
 
-# Setup session store
-initialize_session_store(InMemorySessionStore(ttl=300, cleanup_interval=60))
+    Args:
+        app (FastAPI): The application created by `create_app`.
 
-# Get settings for app initialization
-app_settings = get_settings()
+    Yields:
+        None: While the application is serving.
+    """
+    settings: Settings = app.state.settings
+    start_time = time.perf_counter()
+    session_store, user_repository = await asyncio.gather(
+        asyncio.to_thread(InMemorySessionStore, ttl=300, cleanup_interval=60),
+        asyncio.to_thread(create_user_repository, settings),
+    )
+    initialize_session_store(session_store)
+    initialize_user_repository(user_repository)
+    preload_gradio(app)
+    # The readiness lock belongs to this event loop (see `health.get_readiness_lock`)
+    app.state.readiness_lock = asyncio.Lock()
+    logger.info(f"Application started in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+    loop_monitor = None
+    if settings.loop_monitor_interval > 0:
+        loop_monitor = LoopLagMonitor(settings.loop_monitor_interval, settings.loop_block_threshold_ms / 1000)
+        loop_monitor.start()
+        initialize_loop_monitor(loop_monitor)
+
+    try:
+        async with app.state.gradio_lifespan(app):
+            yield
+    finally:
+        if loop_monitor is not None:
+            initialize_loop_monitor(None)
+            await loop_monitor.stop()
+        session_store.stop_cleanup_thread()
+        logger.info("Application stopped")
+
+
+def create_app(settings: Settings) -> FastAPI:
+    """
+    Creates the FastAPI application: middleware, routes and static files.
+
+    Nothing expensive happens here; the session store, the user repository and the Gradio UI are
+    created by the `lifespan` when the server starts.
+
+    Args:
+        settings (Settings): The application settings.
+
+    Returns:
+        FastAPI: The application.
+    """
+    setup_logging(
+        settings.log_level,
+        queue_size=settings.log_queue_size,
+        queue_policy=settings.log_queue_policy,
+        log_file=settings.log_file,
+        log_file_max_bytes=settings.log_file_max_bytes,
+        log_file_backups=settings.log_file_backups,
+        log_file_compress=settings.log_file_compress,
+        log_format=settings.log_format,
+    )
+
+    app = FastAPI(title=settings.projectname, version=settings.version, lifespan=lifespan)
+    app.state.settings = settings
+
+    # Single pure ASGI middleware: authentication, session validation and request logging
+    app.add_middleware(
+        GatewayMiddleware,
+        stream_revalidate_interval=settings.stream_revalidate_interval,
+        csrf_protected_prefixes=(f"{GRADIO_PATH}/",) if settings.csrf_protect_gradio else (),
+    )
+
+    # Sheds low-priority requests under overload before the gateway authenticates them
+    app.add_middleware(AdmissionMiddleware, login_page=render_login_page)
+
+    # Outermost: compress responses on the fly (SSE and websockets pass through)
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+    # Include routers
+    app.include_router(login_router)
+    app.include_router(health_router)
+    app.include_router(metrics_router)
+    app.include_router(home_router)
+    app.include_router(static_router)
+
+    # Add static files for serving Gradio assets (small files are kept in memory, precompressed)
+    static_dir = BASE_DIR / "static"
+    app.mount("/static", CachedStaticFiles(directory=str(static_dir)), name="static")
+
+    return app
 
-# Main FastAPI application
-app = FastAPI(title=app_settings.projectname, version=app_settings.version)
 
-# Middleware are executed in reverse order of their addition
-app.add_middleware(SessionMiddleware)
-app.add_middleware(AuthMiddleware)
-app.add_middleware(LoggingMiddleware)
+# Created on first access, see `__getattr__`
+_app: FastAPI | None = None
 
-# Include routers
-app.include_router(login_router)
-app.include_router(health_router)
-app.include_router(home_router)
-app.include_router(static_router)
 
-# Add static files for serving Gradio assets
-static_dir = BASE_DIR / "static"
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+def get_app() -> FastAPI:
+    """
+    Retrieve the application, creating it from the settings on first use.
 
-# Mount gradio app
-gr.mount_gradio_app(app, create_gradio_app(), path="/gradio")
+    Returns:
+        FastAPI: The application.
+    """
+    global _app
+    if _app is None:
+        _app = create_app(get_settings())
+    return _app
+
+
+def __getattr__(name: str) -> FastAPI:
+    """
+    Creates `app` on first access, so that importing this module has no side effects.
+
+    `uvicorn gradioapp.main:app` and `from gradioapp.main import app` keep working.
+    """
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main() -> None:
     """Main entry point for the application."""
+    # Deferred so importing this module does not import uvicorn
+    from .server import run_server  # pylint: disable=import-outside-toplevel
+
+    app = get_app()
+    # Build the Gradio UI on the main thread, before the prefork server freezes the heap and forks
+    preload_gradio(app)
     logger.info("Starting the application")
-    settings = get_settings()
-    uvicorn.run(
-        "gradioapp.main:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=settings.reload,
-        log_config=None,  # Disable uvicorn's default logging
-    )
+    run_server(app, get_settings())
 
 
 if __name__ == "__main__":
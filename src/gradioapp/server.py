@@ -0,0 +1,203 @@
+import gc
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from types import FrameType
+
+from loguru import logger
+from starlette.types import ASGIApp
+import uvicorn
+from uvicorn.config import Config
+
+from .config import Settings
+from .core.logging import drain_logging
+
+# A worker dying sooner than this after its start is assumed to crash at startup; respawning waits a bit
+MIN_WORKER_UPTIME = 1.0
+RESPAWN_DELAY = 1.0
+
+# How often a worker checks that the master process is still alive
+MASTER_CHECK_INTERVAL = 1.0
+
+# Seconds an exiting worker waits for its queued log messages to be written
+LOG_DRAIN_TIMEOUT = 5.0
+
+
+def build_config(app: ASGIApp | str, settings: Settings) -> Config:
+    """
+    Builds the uvicorn configuration from the settings.
+
+    Args:
+        app (ASGIApp | str): The ASGI application, or an import string such as "gradioapp.main:app".
+        settings (Settings): The application settings.
+
+    Returns:
+        Config: The server configuration.
+    """
+    return Config(
+        app,
+        host=settings.host,
+        port=settings.port,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        timeout_keep_alive=settings.keep_alive,
+        log_config=None,  # Disable uvicorn's default logging
+    )
+
+
+class PreforkServer:
+    """
+    Pre-forking server recycling a single worker, forked from a master that loaded the app once.
+
+    The master binds the listening socket, moves every object allocated so far (imported modules, the
+    app, templates, compressed static files) into the permanent GC generation with `gc.freeze()` and
+    forks the worker, which then runs the app lifespan. Frozen objects are never touched by the
+    collector, so the memory pages holding them stay shared between the master and the worker instead
+    of being copied on write by the first collection, and a replacement worker starts without loading
+    the app again.
+
+    A worker that served `max_requests` (plus a random jitter, so restarts of several instances do not
+    line up) finishes its open requests and exits; the master replaces it, and also a worker that
+    crashed. SIGTERM or SIGINT to the master stops the worker gracefully; a second signal makes it exit
+    immediately.
+
+    There is a single worker: sessions, the login limiter, metrics and the Gradio queue live in the
+    worker's memory, and Gradio expects every request of a session to reach the process that holds its
+    queue, so several workers sharing the socket would each see a fraction of every session.
+
+    Attributes:
+        config (Config): The uvicorn configuration of the worker.
+        max_requests (int): Requests after which the worker is replaced (0 never replaces it).
+        max_requests_jitter (int): Upper bound of the random number of requests added to `max_requests`.
+        _children (dict[int, float]): Start time of the running worker, by process ID.
+        _stopping (bool): Whether a shutdown signal was received.
+    """
+
+    def __init__(self, config: Config, max_requests: int = 0, max_requests_jitter: int = 0) -> None:
+        self.config = config
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self._children: dict[int, float] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """
+        Binds the socket, forks the worker and replaces it whenever it exits, until a shutdown signal.
+        """
+        sock = self.config.bind_socket()
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+        logger.info(f"Master {os.getpid()}: starting the worker")
+        self._spawn(sock)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started_at = self._children.pop(pid, None)
+            if started_at is None or self._stopping:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code == 0:
+                logger.info(f"Worker {pid} reached its request limit, replacing it")
+            else:
+                logger.error(f"Worker {pid} exited with code {exit_code}, replacing it")
+                if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+                    time.sleep(RESPAWN_DELAY)
+            self._spawn(sock)
+
+        sock.close()
+        logger.info(f"Master {os.getpid()}: worker stopped")
+
+    def _spawn(self, sock: socket.socket) -> None:
+        """
+        Forks one worker process serving on `sock`.
+        """
+        master_pid = os.getpid()
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+
+        exit_code = 1
+        try:
+            self._run_worker(sock, master_pid)
+            exit_code = 0
+        except BaseException as error:  # The child must never return into the master's code
+            logger.exception(f"Worker {os.getpid()} failed: {error}")
+        finally:
+            # os._exit skips atexit, which would otherwise write the queued log messages
+            drain_logging(timeout=LOG_DRAIN_TIMEOUT)
+            os._exit(exit_code)
+
+    def _run_worker(self, sock: socket.socket, master_pid: int) -> None:
+        """
+        Serves requests in a forked worker until it is stopped or reaches its request limit.
+        """
+        # Keep terminal Ctrl-C away from the worker: the master stops it, once
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        if self.max_requests:
+            self.config.limit_max_requests = self.max_requests + random.randint(0, self.max_requests_jitter)
+
+        server = uvicorn.Server(self.config)
+        threading.Thread(target=self._watch_master, args=(server, master_pid), daemon=True).start()
+        logger.info(f"Worker {os.getpid()} started")
+        server.run(sockets=[sock])
+
+    @staticmethod
+    def _watch_master(server: uvicorn.Server, master_pid: int) -> None:
+        """
+        Stops the worker if the master dies without stopping it (e.g. SIGKILL), instead of leaving it orphaned.
+        """
+        while os.getppid() == master_pid:
+            time.sleep(MASTER_CHECK_INTERVAL)
+        server.should_exit = True
+
+    def _handle_exit(self, sig: int, _frame: FrameType | None) -> None:
+        """
+        Forwards a shutdown signal to the worker: SIGTERM first, SIGINT (forced exit) on repeated signals.
+        """
+        worker_signal = signal.SIGINT if self._stopping else signal.SIGTERM
+        self._stopping = True
+        logger.info(f"Master {os.getpid()}: received {signal.Signals(sig).name}, stopping the worker")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, worker_signal)
+            except ProcessLookupError:
+                pass
+
+
+def run_server(app: ASGIApp, settings: Settings) -> None:
+    """
+    Runs the application: the reloader in development, an in-process server, or a recycled prefork worker.
+
+    The prefork server is used when `MAX_REQUESTS` is set, since a recycled worker needs a master to
+    replace it.
+
+    Args:
+        app (ASGIApp): The ASGI application, already loaded.
+        settings (Settings): The application settings (`HOST`, `PORT`, `KEEP_ALIVE`, `MAX_REQUESTS`, ...).
+    """
+    if settings.reload:
+        # The reloader re-imports the app from its import string in a subprocess on every change
+        uvicorn.run(
+            "gradioapp.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+            log_config=None,
+        )
+        return
+    config = build_config(app, settings)
+    if not settings.max_requests:
+        uvicorn.Server(config).run()
+        return
+    PreforkServer(config, settings.max_requests, settings.max_requests_jitter).run()
@@ -1,8 +1,10 @@
 """
 JavaScript code as a string that defines a fetch interceptor for handling 401
-Unauthorized responses.
+Unauthorized responses and attaching the CSRF token.
 
 This interceptor wraps the native `window.fetch` function to:
+- Add the `X-CSRF-Token` header, read from the `csrf_token` cookie, to every
+  request that is not a GET or HEAD (required when CSRF_PROTECT_GRADIO is on).
 - Log all outgoing requests and their URLs.
 - Log the status of all responses.
 - If a response has a 401 status code:
@@ -23,11 +25,23 @@ Used in main Gradio gr.Blocks statement.
 redirect_js = """
 () => {
     const originalFetch = window.fetch;
+    const csrfCookie = () => {
+        const cookie = document.cookie.split("; ").find((item) => item.startsWith("csrf_token="));
+        return cookie ? decodeURIComponent(cookie.slice("csrf_token=".length)) : null;
+    };
     window.fetch = async (...args) => {
         const [resource, config] = args;
         const url = typeof resource === "string" ? resource : resource.url;
         console.log("[Interceptor] Request to:", url);
 
+        const method = (config?.method || (resource instanceof Request ? resource.method : "GET")).toUpperCase();
+        const csrfToken = csrfCookie();
+        if (csrfToken && method !== "GET" && method !== "HEAD") {
+            const headers = new Headers(config?.headers || (resource instanceof Request ? resource.headers : {}));
+            headers.set("X-CSRF-Token", csrfToken);
+            args[1] = { ...config, headers };
+        }
+
         const response = await originalFetch(...args);
         console.log("[Interceptor] Response status:", response.status);
 
@@ -1,8 +1,10 @@
 import gradio as gr
 from loguru import logger
 
-from ...domain.session.helpers import get_session_id
+from ...api.middleware.admission import SESSION_DUMP, get_admission_controller
+from ...domain.session.helpers import get_session, get_session_id
 from ...domain.session.store import get_session_store
+from ...domain.session.types import format_session
 from .base import BasePage, BaseTab
 
 
@@ -19,7 +21,10 @@ class Tab1(BaseTab):
         logger.debug(f"Showing session for session_id: {session_id}")
         if session_id is None:
             return "No session ID found"
-        return f"{get_session_store().dump_session(session_id)}"
+        session = get_session(request)
+        if session is None:
+            return "Session not found"
+        return format_session(session_id, session)
 
 
 class Tab2(BaseTab):
@@ -31,6 +36,9 @@ class Tab2(BaseTab):
         show_btn.click(fn=self.dump_sessions, outputs=gr.Textbox())
 
     def dump_sessions(self) -> str:
+        # Runs through the protected Gradio queue, so it is shed here rather than by the middleware
+        if get_admission_controller().shed(SESSION_DUMP):
+            raise gr.Error("Server is busy, please try again")
         return get_session_store().dump_store()
 
 
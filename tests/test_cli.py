@@ -0,0 +1,115 @@
+"""Tests for the gradioapp-admin command line interface."""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from gradioapp.cli import main, read_credentials_stdin
+from gradioapp.domain.passwords import check_password, get_rounds
+from gradioapp.domain.user import SQLiteUserRepository
+
+
+class TestReadCredentialsStdin:
+    """Tests for read_credentials_stdin function."""
+
+    def test_parses_lines(self):
+        """Test that username:password lines are parsed and comments skipped."""
+        lines = ["# comment\n", "alice@test.com:pw:with:colons\n", "\n", "bob@test.com:secret\n"]
+
+        assert read_credentials_stdin(lines) == {"alice@test.com": "pw:with:colons", "bob@test.com": "secret"}
+
+    def test_rejects_line_without_separator(self):
+        """Test that a line without ':' raises ValueError."""
+        with pytest.raises(ValueError, match="Line 1"):
+            read_credentials_stdin(["alice@test.com\n"])
+
+
+class TestHashPasswordsCommand:
+    """Tests for the hash-passwords subcommand."""
+
+    def test_hash_passwords_from_stdin(self, tmp_path):
+        """Test that hashes are written to the output file."""
+        output = tmp_path / "users.json"
+
+        with patch("sys.stdin", io.StringIO("alice@test.com:pw\n")):
+            exit_code = main(["hash-passwords", "--stdin", "-o", str(output)])
+
+        assert exit_code == 0
+        users = json.loads(output.read_text())
+        assert check_password("pw", users["alice@test.com"])
+
+    def test_hash_passwords_rounds(self, tmp_path):
+        """Test that --rounds sets the cost factor of the written hashes."""
+        output = tmp_path / "users.json"
+
+        with patch("sys.stdin", io.StringIO("alice@test.com:pw\n")):
+            main(["hash-passwords", "--stdin", "--rounds", "5", "-o", str(output)])
+
+        assert get_rounds(json.loads(output.read_text())["alice@test.com"]) == 5
+
+    def test_hash_passwords_merges_existing_file(self, tmp_path):
+        """Test that existing users are kept and given users are replaced."""
+        output = tmp_path / "users.json"
+        output.write_text(json.dumps({"keep@test.com": "existing-hash", "alice@test.com": "old-hash"}))
+
+        with patch("gradioapp.cli.getpass", side_effect=["new", "new"]):
+            exit_code = main(["hash-passwords", "alice@test.com", "-o", str(output)])
+
+        assert exit_code == 0
+        users = json.loads(output.read_text())
+        assert users["keep@test.com"] == "existing-hash"
+        assert check_password("new", users["alice@test.com"])
+
+    def test_hash_passwords_confirmation_mismatch(self, tmp_path):
+        """Test that a mismatching confirmation fails without writing the file."""
+        output = tmp_path / "users.json"
+
+        with patch("gradioapp.cli.getpass", side_effect=["one", "two"]):
+            exit_code = main(["hash-passwords", "alice@test.com", "-o", str(output)])
+
+        assert exit_code == 1
+        assert not output.exists()
+
+    def test_hash_passwords_requires_input(self, tmp_path):
+        """Test that the command fails when neither usernames nor --stdin are given."""
+        assert main(["hash-passwords", "-o", str(tmp_path / "users.json")]) == 2
+
+
+class TestImportUsersCommand:
+    """Tests for the import-users subcommand."""
+
+    def test_import_users_into_sqlite(self, tmp_path):
+        """Test that a credentials file is imported into the SQLite database."""
+        credentials = tmp_path / "users.json"
+        credentials.write_text(json.dumps({"alice@test.com": "hash-a", "bob@test.com": "hash-b"}))
+        database = tmp_path / "users.db"
+
+        exit_code = main(["import-users", str(credentials), "--db", str(database)])
+
+        assert exit_code == 0
+        repository = SQLiteUserRepository(database)
+        try:
+            assert repository.count_users() == 2
+            assert repository.get_user("bob@test.com").password_hash == "hash-b"
+        finally:
+            repository.close()
+
+
+class TestCalibrateBcryptCommand:
+    """Tests for the calibrate-bcrypt subcommand."""
+
+    def test_prints_calibrated_rounds(self, capsys):
+        """Test that the command prints the cost table and the calibrated cost."""
+        with (
+            patch("gradioapp.cli.measure_hash_ms", return_value=10.0),
+            patch("gradioapp.cli.calibrate_rounds", return_value=11) as calibrate,
+        ):
+            exit_code = main(["calibrate-bcrypt", "--target-ms", "100"])
+
+        assert exit_code == 0
+        calibrate.assert_called_once_with(100.0)
+        output = capsys.readouterr().out
+        assert "    11       80.0" in output
+        assert "BCRYPT_ROUNDS=11" in output
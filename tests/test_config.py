@@ -32,6 +32,102 @@ class TestSettings:
         with pytest.raises(ValueError, match="JWT_SECRET must be at least 32 characters long"):
             load_settings()
 
+    def test_bcrypt_rounds_validation(self, monkeypatch):
+        """Test that BCRYPT_ROUNDS outside bcrypt's 4-31 range raises ValueError."""
+        monkeypatch.setenv("BCRYPT_ROUNDS", "3")
+
+        with pytest.raises(ValueError, match="BCRYPT_ROUNDS must be between 4 and 31"):
+            load_settings()
+
+    @pytest.mark.parametrize("workers", ["0", "4"])
+    def test_workers_validation(self, monkeypatch, workers):
+        """Test that any number of workers but one raises ValueError, as sessions live in process memory."""
+        monkeypatch.setenv("WORKERS", workers)
+
+        with pytest.raises(ValueError, match="WORKERS must be 1"):
+            load_settings()
+
+    def test_log_level_parsed_and_validated(self, monkeypatch):
+        """Test that LOG_LEVEL is case-insensitive and must name a log level."""
+        monkeypatch.setenv("LOG_LEVEL", "info")
+        assert load_settings().log_level == "INFO"
+
+        monkeypatch.setenv("LOG_LEVEL", "VERBOSE")
+        with pytest.raises(ValueError, match="LOG_LEVEL must be one of"):
+            load_settings()
+
+    def test_log_format_validation(self, monkeypatch):
+        """Test that LOG_FORMAT must be "text" or "json"."""
+        monkeypatch.setenv("LOG_FORMAT", "JSON")
+        assert load_settings().log_format == "json"
+
+        monkeypatch.setenv("LOG_FORMAT", "xml")
+        with pytest.raises(ValueError, match="LOG_FORMAT"):
+            load_settings()
+
+    def test_log_sampling_parsed_and_validated(self, monkeypatch):
+        """Test that LOG_SAMPLE_ROUTES is parsed into route/rate pairs and rates must be between 0 and 1."""
+        monkeypatch.setenv("LOG_SAMPLE_RATE", "0.1")
+        monkeypatch.setenv("LOG_SAMPLE_ROUTES", "/gradio/gradio_api/queue/data=0.01, /healthz=0")
+
+        settings = load_settings()
+
+        assert settings.log_sample_rate == 0.1
+        assert settings.log_sample_routes == (("/gradio/gradio_api/queue/data", 0.01), ("/healthz", 0.0))
+
+        monkeypatch.setenv("LOG_SAMPLE_ROUTES", "/healthz=2")
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            load_settings()
+
+        monkeypatch.setenv("LOG_SAMPLE_ROUTES", "/healthz")
+        with pytest.raises(ValueError, match="route=rate"):
+            load_settings()
+
+    def test_log_queue_policy_validation(self, monkeypatch):
+        """Test that LOG_QUEUE_POLICY must be "drop" or "block"."""
+        monkeypatch.setenv("LOG_QUEUE_POLICY", "Block")
+        assert load_settings().log_queue_policy == "block"
+
+        monkeypatch.setenv("LOG_QUEUE_POLICY", "discard")
+        with pytest.raises(ValueError, match="LOG_QUEUE_POLICY"):
+            load_settings()
+
+    def test_server_settings_parsed_from_env(self, monkeypatch):
+        """Test that the server settings are read from the environment."""
+        monkeypatch.setenv("HOST", "127.0.0.1")
+        monkeypatch.setenv("PORT", "9000")
+        monkeypatch.setenv("MAX_REQUESTS", "1000")
+        monkeypatch.setenv("SERVER_LOOP", "UVLOOP")
+
+        settings = load_settings()
+
+        assert (settings.host, settings.port, settings.workers) == ("127.0.0.1", 9000, 1)
+        assert settings.max_requests == 1000
+        assert settings.server_loop == "uvloop"
+        assert settings.keep_alive == 5
+
+    def test_loop_monitor_settings_parsed_from_env(self, monkeypatch):
+        """Test that the event loop monitor settings are read from the environment."""
+        monkeypatch.setenv("LOOP_MONITOR_INTERVAL", "0")
+        monkeypatch.setenv("LOOP_BLOCK_THRESHOLD_MS", "250")
+
+        settings = load_settings()
+
+        assert settings.loop_monitor_interval == 0.0
+        assert settings.loop_block_threshold_ms == 250.0
+
+    def test_admission_settings_parsed_from_env(self, monkeypatch):
+        """Test that the load shedding thresholds are read from the environment."""
+        monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT", "0")
+        monkeypatch.setenv("ADMISSION_LAG_THRESHOLD_MS", "500")
+        monkeypatch.setenv("ADMISSION_RETRY_AFTER", "10")
+
+        settings = load_settings()
+
+        assert settings.admission_max_in_flight == 0
+        assert settings.admission_lag_threshold_ms == 500.0
+        assert settings.admission_retry_after == 10
+
     def test_settings_frozen(self, test_settings):
         """Test that Settings is frozen (immutable)."""
         with pytest.raises(Exception):  # dataclass frozen raises FrozenInstanceError
@@ -54,3 +150,14 @@ class TestSettings:
         assert settings.home_as_html is False
         assert settings.secret_key == ""
         assert settings.csrf_secret == ""
+
+    def test_path_lists_parsed_from_env(self, monkeypatch):
+        """Test that comma-separated path lists are split and stripped."""
+        monkeypatch.setenv("JWT_SECRET", "a" * 32)
+        monkeypatch.setenv("ALLOWED_PATHS", " /login , /static/*,,")
+        monkeypatch.delenv("TOKEN_ONLY_PATHS", raising=False)
+
+        settings = load_settings()
+
+        assert settings.allowed_paths == ("/login", "/static/*")
+        assert settings.token_only_paths == ()
@@ -1,133 +1,139 @@
 """Tests for CSRF token generation and validation."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
-from fastapi import Request
-import pytest
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
 
-from gradioapp.domain.csrf import generate_csrf_token, validate_csrf_token
+from gradioapp.domain.csrf import (
+    CSRF_NONCE_COOKIE,
+    CSRF_TOKEN_COOKIE,
+    ensure_csrf_cookies,
+    generate_csrf_token,
+    new_csrf_nonce,
+    set_csrf_cookies,
+    validate_csrf_token,
+)
+
+
+def _request_with_nonce(nonce: str | None) -> MagicMock:
+    """Create a mock request carrying the given nonce cookie."""
+    request = MagicMock(spec=HTTPConnection)
+    request.cookies = {CSRF_NONCE_COOKIE: nonce} if nonce else {}
+    return request
 
 
 class TestGenerateCsrfToken:
     """Tests for generate_csrf_token function."""
 
-    def test_generate_csrf_token_with_client(self):
-        """Test generating CSRF token with client host."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client.host = "127.0.0.1"
+    def test_generate_csrf_token_is_deterministic_per_nonce(self):
+        """Test that the token depends only on the nonce."""
+        nonce = new_csrf_nonce()
 
-        token = generate_csrf_token(mock_request)
+        assert generate_csrf_token(nonce) == generate_csrf_token(nonce)
+        assert generate_csrf_token(nonce) != generate_csrf_token(new_csrf_nonce())
 
-        assert token is not None
-        assert isinstance(token, str)
-        assert len(token) > 0
+    def test_generate_csrf_token_is_url_safe(self):
+        """Test that the token can be used in cookies, headers and forms unchanged."""
+        token = generate_csrf_token(new_csrf_nonce())
 
-    def test_generate_csrf_token_without_client(self):
-        """Test generating CSRF token when client is None."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client = None
+        assert len(token) == 43
+        assert set(token) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
 
-        token = generate_csrf_token(mock_request)
-
-        assert token is not None
-        assert isinstance(token, str)
-        assert len(token) > 0
+    def test_new_csrf_nonce_is_random(self):
+        """Test that nonces are unique."""
+        assert new_csrf_nonce() != new_csrf_nonce()
 
 
 class TestValidateCsrfToken:
     """Tests for validate_csrf_token function."""
 
     def test_validate_csrf_token_valid(self):
-        """Test validating a valid CSRF token."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client.host = "127.0.0.1"
-
-        # Generate a valid token
-        token = generate_csrf_token(mock_request)
+        """Test validating a token that matches the nonce cookie."""
+        nonce = new_csrf_nonce()
 
-        # Validate it
-        result = validate_csrf_token(token, mock_request)
-
-        assert result is True
+        assert validate_csrf_token(generate_csrf_token(nonce), _request_with_nonce(nonce)) is True
 
     def test_validate_csrf_token_invalid(self):
         """Test validating an invalid CSRF token."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client.host = "127.0.0.1"
-
-        # Use an invalid token
-        invalid_token = "invalid_token_string"
-
-        result = validate_csrf_token(invalid_token, mock_request)
+        assert validate_csrf_token("invalid_token_string", _request_with_nonce(new_csrf_nonce())) is False
 
-        assert result is False
+    def test_validate_csrf_token_other_nonce(self):
+        """Test that a token minted for another nonce is rejected."""
+        token = generate_csrf_token(new_csrf_nonce())
 
-    def test_validate_csrf_token_wrong_host(self):
-        """Test validating a token with wrong host."""
-        mock_request1 = MagicMock(spec=Request)
-        mock_request1.client.host = "127.0.0.1"
+        assert validate_csrf_token(token, _request_with_nonce(new_csrf_nonce())) is False
 
-        # Generate token for one host
-        token = generate_csrf_token(mock_request1)
+    def test_validate_csrf_token_without_nonce_cookie(self):
+        """Test that a request without a nonce cookie is rejected."""
+        token = generate_csrf_token(new_csrf_nonce())
 
-        # Try to validate with different host
-        mock_request2 = MagicMock(spec=Request)
-        mock_request2.client.host = "192.168.1.1"
+        assert validate_csrf_token(token, _request_with_nonce(None)) is False
 
-        result = validate_csrf_token(token, mock_request2)
+    def test_validate_csrf_token_missing_token(self):
+        """Test that an empty or missing token is rejected."""
+        request = _request_with_nonce(new_csrf_nonce())
 
-        assert result is False
+        assert validate_csrf_token("", request) is False
+        assert validate_csrf_token(None, request) is False
 
-    def test_validate_csrf_token_without_client(self):
-        """Test validating token when client is None."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client = None
+    def test_validate_csrf_token_non_ascii(self):
+        """Test that a non-ASCII token is rejected instead of raising."""
+        assert validate_csrf_token("żółw", _request_with_nonce(new_csrf_nonce())) is False
 
-        # Generate token with None client
-        token = generate_csrf_token(mock_request)
+    def test_validate_csrf_token_independent_of_client_host(self):
+        """Test that validation does not depend on the client address (works behind proxies)."""
+        nonce = new_csrf_nonce()
+        request = _request_with_nonce(nonce)
+        request.client.host = "10.0.0.1"
 
-        # Validate it
-        result = validate_csrf_token(token, mock_request)
+        assert validate_csrf_token(generate_csrf_token(nonce), request) is True
 
-        # Should work with "unknown" host
-        assert result is True
 
-    def test_validate_csrf_token_expired(self):
-        """Test validating an expired CSRF token."""
-        from itsdangerous import URLSafeTimedSerializer
+class TestSetCsrfCookies:
+    """Tests for set_csrf_cookies function."""
 
-        from gradioapp.config import get_settings
+    def test_set_csrf_cookies(self):
+        """Test that the nonce is HttpOnly and the token is readable by scripts."""
+        response = Response()
+        nonce = new_csrf_nonce()
 
-        settings = get_settings()
-        serializer = URLSafeTimedSerializer(settings.secret_key)
+        token = set_csrf_cookies(response, nonce)
 
-        # Create an expired token manually (max_age is 3600 seconds)
-        # We'll create a token and then try to validate it after manipulating time
-        mock_request = MagicMock(spec=Request)
-        mock_request.client.host = "127.0.0.1"
+        cookies = response.headers.getlist("set-cookie")
+        nonce_cookie = next(cookie for cookie in cookies if cookie.startswith(f"{CSRF_NONCE_COOKIE}="))
+        token_cookie = next(cookie for cookie in cookies if cookie.startswith(f"{CSRF_TOKEN_COOKIE}="))
+        assert token == generate_csrf_token(nonce)
+        assert f"{CSRF_NONCE_COOKIE}={nonce}" in nonce_cookie
+        assert "HttpOnly" in nonce_cookie
+        assert f"{CSRF_TOKEN_COOKIE}={token}" in token_cookie
+        assert "HttpOnly" not in token_cookie
 
-        # Create a token with very short max_age
-        token = serializer.dumps("127.0.0.1", salt=settings.csrf_secret)
 
-        # Try to validate with max_age=0 to simulate expiration
-        # Actually, we can't easily test expiration without time manipulation
-        # So we'll test with an invalid token format instead
-        invalid_token = "invalid.token.here"
+class TestEnsureCsrfCookies:
+    """Tests for ensure_csrf_cookies function."""
 
-        result = validate_csrf_token(invalid_token, mock_request)
+    def test_issues_cookies_without_nonce(self):
+        """Test that a new nonce and token are issued to a first-time visitor."""
+        response = Response()
 
-        assert result is False
+        assert ensure_csrf_cookies(_request_with_nonce(None), response) is True
+        assert len(response.headers.getlist("set-cookie")) == 2
 
-    def test_validate_csrf_token_exception_handling(self):
-        """Test that exceptions in validate_csrf_token are caught and return False."""
-        mock_request = MagicMock(spec=Request)
-        mock_request.client.host = "127.0.0.1"
+    def test_keeps_valid_pair(self):
+        """Test that nothing is set when the request carries a matching nonce and token."""
+        nonce = new_csrf_nonce()
+        request = _request_with_nonce(nonce)
+        request.cookies[CSRF_TOKEN_COOKIE] = generate_csrf_token(nonce)
+        response = Response()
 
-        # Use a token that will cause an exception when deserializing
-        # A malformed token should trigger an exception
-        malformed_token = "not.a.valid.token.format"
+        assert ensure_csrf_cookies(request, response) is False
+        assert response.headers.getlist("set-cookie") == []
 
-        # Should not raise exception, but return False
-        result = validate_csrf_token(malformed_token, mock_request)
+    def test_repairs_missing_token_with_same_nonce(self):
+        """Test that a missing token cookie is reissued for the existing nonce."""
+        nonce = new_csrf_nonce()
+        response = Response()
 
-        assert result is False
+        assert ensure_csrf_cookies(_request_with_nonce(nonce), response) is True
+        assert any(f"{CSRF_NONCE_COOKIE}={nonce}" in cookie for cookie in response.headers.getlist("set-cookie"))
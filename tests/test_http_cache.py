@@ -0,0 +1,115 @@
+"""Tests for the HTTP caching helpers."""
+
+import gzip
+
+import pytest
+
+from gradioapp.core import http_cache
+from gradioapp.core.http_cache import (
+    PrecompressedBody,
+    accepts_encoding,
+    etag_matches,
+    make_etag,
+)
+
+
+class TestEtags:
+    """Tests for make_etag and etag_matches."""
+
+    def test_make_etag_is_strong_and_stable(self):
+        """Test that the ETag is quoted, not weak and depends only on the body."""
+        etag = make_etag(b"body")
+
+        assert etag == make_etag(b"body")
+        assert etag != make_etag(b"other")
+        assert etag.startswith('"') and etag.endswith('"')
+
+    def test_etag_matches(self):
+        """Test If-None-Match lists, weak tags and the wildcard."""
+        etag = make_etag(b"body")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestAcceptsEncoding:
+    """Tests for accepts_encoding."""
+
+    def test_listed_coding(self):
+        """Test codings with and without a quality value."""
+        assert accepts_encoding("gzip, deflate, br", "gzip")
+        assert accepts_encoding("br;q=1.0, gzip;q=0.5", "gzip")
+        assert accepts_encoding("*", "gzip")
+
+    def test_refused_coding(self):
+        """Test missing codings, a zero quality and malformed values."""
+        assert not accepts_encoding("br", "gzip")
+        assert not accepts_encoding("gzip;q=0", "gzip")
+        assert not accepts_encoding("gzip;q=abc", "gzip")
+        assert not accepts_encoding(None, "gzip")
+
+
+class TestPrecompressedBody:
+    """Tests for PrecompressedBody."""
+
+    body = b"<html>" + b"login " * 200 + b"</html>"
+
+    def test_identity_response(self):
+        """Test the uncompressed representation and its headers."""
+        response = PrecompressedBody(self.body, "text/html").response({})
+
+        assert response.status_code == 200
+        assert response.body == self.body
+        assert response.headers["etag"] == make_etag(self.body)
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in response.headers
+
+    def test_gzip_response(self):
+        """Test the gzip representation when the client accepts it."""
+        response = PrecompressedBody(self.body, "text/html").response({"accept-encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(response.body) == self.body
+        assert response.headers["etag"] == make_etag(response.body)
+
+    def test_incompressible_body_is_served_as_is(self):
+        """Test that codings are skipped when they would not make the body smaller."""
+        precompressed = PrecompressedBody(b"x", "text/plain")
+
+        assert precompressed.encoded == {}
+        assert "content-encoding" not in precompressed.response({"accept-encoding": "gzip, br"}).headers
+
+    @pytest.mark.skipif(http_cache.brotli is None, reason="brotli is not installed")
+    def test_brotli_response(self):
+        """Test the brotli representation, preferred over gzip."""
+        response = PrecompressedBody(self.body, "text/html").response({"accept-encoding": "gzip;q=1.0, br;q=0.5"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert http_cache.brotli.decompress(response.body) == self.body
+
+    def test_from_file(self, tmp_path):
+        """Test loading a file with a guessed media type."""
+        path = tmp_path / "manifest.json"
+        path.write_bytes(b"{}")
+
+        precompressed = PrecompressedBody.from_file(path, cache_control="max-age=60")
+
+        assert precompressed.body == b"{}"
+        assert precompressed.media_type == "application/json"
+        assert precompressed.cache_control == "max-age=60"
+
+    def test_not_modified(self):
+        """Test the empty 304 response for a matching If-None-Match."""
+        precompressed = PrecompressedBody(self.body, "text/html", cache_control="max-age=60")
+
+        response = precompressed.response({"if-none-match": precompressed.etag}, headers={"X-Extra": "1"})
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == precompressed.etag
+        assert response.headers["cache-control"] == "max-age=60"
+        assert response.headers["x-extra"] == "1"
@@ -0,0 +1,180 @@
+"""Tests for the queued and rotating log sinks."""
+
+import gzip
+import threading
+
+import pytest
+
+from gradioapp.core.log_sinks import QueuedSink, RotatingFile
+
+
+class RecordingTarget:
+    """Target that records the chunks written to it and can be held to fill the queue."""
+
+    def __init__(self):
+        self.chunks = []
+        self.flushes = 0
+        self.stopped = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def write(self, text):
+        self.release.wait()
+        self.chunks.append(text)
+
+    def flush(self):
+        self.flushes += 1
+
+    def stop(self):
+        self.stopped = True
+
+
+class FailingTarget:
+    """Target whose writes fail."""
+
+    def write(self, text):
+        raise OSError("broken pipe")
+
+
+class TestQueuedSink:
+    """Tests for QueuedSink."""
+
+    def test_writes_in_batches(self):
+        """Test that queued messages are written in order, in batches, and flushed once per batch."""
+        target = RecordingTarget()
+        target.release.clear()
+        sink = QueuedSink(target, "test", max_size=100, batch_size=10)
+        sink.write("first\n")
+        # The writer thread holds "first" in `target.write`; the next messages queue up behind it
+        while sink.queued:
+            pass
+        for index in range(25):
+            sink.write(f"{index}\n")
+        target.release.set()
+
+        assert sink.drain(timeout=5)
+        sink.stop()
+
+        assert "".join(target.chunks) == "first\n" + "".join(f"{index}\n" for index in range(25))
+        assert len(target.chunks) == 4  # 1 + 10 + 10 + 5
+        assert target.flushes == 4
+        assert (sink.written, sink.dropped, sink.queued) == (26, 0, 0)
+        assert target.stopped
+
+    def test_drop_policy_counts_dropped_messages(self):
+        """Test that a full queue drops new messages under the drop policy."""
+        target = RecordingTarget()
+        target.release.clear()
+        sink = QueuedSink(target, "test", max_size=2)
+        sink.write("held\n")
+        while sink.queued:
+            pass
+        for index in range(5):
+            sink.write(f"{index}\n")
+
+        assert sink.queued == 2
+        assert sink.dropped == 3
+
+        target.release.set()
+        sink.stop()
+        assert "".join(target.chunks) == "held\n0\n1\n"
+
+    def test_block_policy_waits_for_room(self):
+        """Test that a full queue makes the caller wait under the block policy."""
+        target = RecordingTarget()
+        target.release.clear()
+        sink = QueuedSink(target, "test", max_size=1, policy="block")
+        sink.write("held\n")
+        while sink.queued:
+            pass
+        sink.write("0\n")
+        writer = threading.Thread(target=sink.write, args=("1\n",))
+        writer.start()
+        writer.join(timeout=0.1)
+
+        assert writer.is_alive()
+
+        target.release.set()
+        writer.join(timeout=5)
+        sink.stop()
+        assert "".join(target.chunks) == "held\n0\n1\n"
+        assert sink.dropped == 0
+
+    def test_failing_target_counts_dropped_messages(self):
+        """Test that messages the target fails to write are counted as dropped and the writer keeps running."""
+        sink = QueuedSink(FailingTarget(), "test")
+        sink.write("a\n")
+        sink.write("b\n")
+
+        assert sink.drain(timeout=5)
+        assert sink.dropped == 2
+        assert sink.written == 0
+        sink.stop()
+
+    def test_invalid_policy(self):
+        """Test that an unknown queue policy raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown queue policy"):
+            QueuedSink(RecordingTarget(), "test", policy="discard")
+
+    def test_restart_after_fork(self):
+        """Test that the forked child gets a new writer thread and queue."""
+        target = RecordingTarget()
+        sink = QueuedSink(target, "test")
+        thread = sink._thread
+
+        sink._restart_after_fork()
+        sink.write("after fork\n")
+
+        assert sink._thread is not thread
+        assert sink.drain(timeout=5)
+        assert target.chunks == ["after fork\n"]
+        sink.stop()
+
+
+class TestRotatingFile:
+    """Tests for RotatingFile."""
+
+    def test_rotates_and_compresses(self, tmp_path):
+        """Test that a full file is rotated, compressed and old backups are deleted."""
+        path = tmp_path / "logs" / "app.log"
+        log_file = RotatingFile(path, max_bytes=10, backups=2, compress=True)
+        for line in ("aaaaaaa\n", "bbbbbbb\n", "ccccccc\n", "ddddddd\n"):
+            log_file.write(line)
+        log_file.stop()
+
+        assert path.read_text() == "ddddddd\n"
+        assert gzip.decompress((tmp_path / "logs" / "app.log.1.gz").read_bytes()) == b"ccccccc\n"
+        assert gzip.decompress((tmp_path / "logs" / "app.log.2.gz").read_bytes()) == b"bbbbbbb\n"
+        assert not (tmp_path / "logs" / "app.log.3.gz").exists()
+
+    def test_rotates_without_compression(self, tmp_path):
+        """Test that rotated files are renamed when compression is off, and appending resumes the size."""
+        path = tmp_path / "app.log"
+        path.write_text("existing\n")
+        log_file = RotatingFile(path, max_bytes=12, backups=1, compress=False)
+        log_file.write("new line\n")
+        log_file.stop()
+
+        assert (tmp_path / "app.log.1").read_text() == "existing\n"
+        assert path.read_text() == "new line\n"
+
+    def test_max_bytes_counts_encoded_bytes(self, tmp_path):
+        """Test that the size limit applies to UTF-8 bytes, not characters."""
+        path = tmp_path / "app.log"
+        log_file = RotatingFile(path, max_bytes=12, backups=1, compress=False)
+        for _ in range(2):
+            log_file.write("éééé\n")  # 5 characters, 9 bytes
+        log_file.stop()
+
+        assert (tmp_path / "app.log.1").read_text(encoding="utf-8") == "éééé\n"
+        assert path.stat().st_size == 9
+
+    def test_no_rotation_without_limit(self, tmp_path):
+        """Test that max_bytes=0 never rotates."""
+        path = tmp_path / "app.log"
+        log_file = RotatingFile(path)
+        for _ in range(100):
+            log_file.write("x" * 100 + "\n")
+        log_file.stop()
+
+        assert list(tmp_path.iterdir()) == [path]
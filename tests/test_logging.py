@@ -1,11 +1,20 @@
 """Tests for logging setup."""
 
+import json
 import sys
 from unittest.mock import MagicMock, patch
 
+from loguru import logger
 import pytest
 
-from gradioapp.core.logging import _format_location, setup_logging
+from gradioapp.core.logging import (
+    _format_location,
+    drain_logging,
+    get_queued_sinks,
+    new_request_id,
+    request_id_var,
+    setup_logging,
+)
 
 
 class TestFormatLocation:
@@ -87,3 +96,83 @@ class TestSetupLogging:
         assert call_args[1]["filter"] == _format_location
         # Verify logger.info was called
         mock_logger.info.assert_called_once_with("Logging initialized with custom format and location handler")
+
+    def test_setup_logging_level(self, capsys):
+        """Test that records below the configured level are dropped before their message is formatted."""
+        lazy_value = MagicMock(return_value="value")
+        try:
+            setup_logging("info")
+            logger.opt(lazy=True).debug("debug {}", lazy_value)
+            logger.info("info {}", "message")
+        finally:
+            setup_logging()
+
+        lazy_value.assert_not_called()
+        output = capsys.readouterr().err
+        assert "info message" in output
+        assert "debug" not in output
+
+    def test_setup_logging_queued_sinks(self, tmp_path):
+        """Test that a queue size wraps stderr and the log file in queued sinks."""
+        log_file = tmp_path / "app.log"
+        try:
+            setup_logging("info", queue_size=100, log_file=str(log_file))
+            sinks = get_queued_sinks()
+            logger.info("queued {}", "message")
+            drain_logging(timeout=5)
+        finally:
+            setup_logging()
+
+        assert [sink.name for sink in sinks] == ["stderr", "file"]
+        assert [sink.target for sink in sinks][0] is sys.stderr
+        assert "queued message" in log_file.read_text()
+        assert get_queued_sinks() == []
+
+    def test_setup_logging_json(self, capsys):
+        """Test that the JSON format writes one object per record with the request ID and keyword fields."""
+        token = request_id_var.set("abc123")
+        try:
+            setup_logging("info", log_format="json")
+            logger.info("[{method}] {path}", method="GET", path="/login")
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed")
+        finally:
+            request_id_var.reset(token)
+            setup_logging()
+
+        lines = capsys.readouterr().err.splitlines()
+        records = [json.loads(line) for line in lines if line.startswith("{")]
+        request = next(record for record in records if record["message"] == "[GET] /login")
+        assert request["request_id"] == "abc123"
+        assert (request["method"], request["path"], request["level"]) == ("GET", "/login", "INFO")
+        failure = next(record for record in records if record["message"] == "failed")
+        assert "ValueError: boom" in failure["exception"]
+
+    def test_text_format_includes_request_id(self, capsys):
+        """Test that text log lines carry the request ID, or "-" outside requests."""
+        try:
+            setup_logging("info")
+            logger.info("outside")
+            token = request_id_var.set("abc123")
+            logger.info("inside")
+            request_id_var.reset(token)
+        finally:
+            setup_logging()
+
+        output = capsys.readouterr().err
+        assert any("| -" in line and "outside" in line for line in output.splitlines())
+        assert any("| abc123" in line and "inside" in line for line in output.splitlines())
+
+
+class TestRequestId:
+    """Tests for new_request_id."""
+
+    def test_new_request_id(self):
+        """Test that valid incoming IDs are kept and missing or unsafe ones replaced."""
+        assert new_request_id("edge-42") == "edge-42"
+        assert len(new_request_id()) == 16
+        assert new_request_id() != new_request_id()
+        assert new_request_id("bad\nid") != "bad\nid"
+        assert len(new_request_id("x" * 129)) == 16
@@ -0,0 +1,66 @@
+"""Tests for the event loop lag monitor."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from gradioapp.core.loop_monitor import LoopLagMonitor
+
+
+def _block_the_loop(seconds: float) -> None:
+    """Blocks the calling thread, standing in for synchronous work on the event loop."""
+    time.sleep(seconds)
+
+
+class TestLoopLagMonitor:
+    """Tests for LoopLagMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_logs_stack_of_blocking_code(self):
+        """Test that the watchdog logs the stack of the code blocking the loop, once per episode."""
+        monitor = LoopLagMonitor(interval=0.02, threshold=0.05)
+        with patch("gradioapp.core.loop_monitor.logger") as mock_logger:
+            monitor.start()
+            await asyncio.sleep(0.1)
+            _block_the_loop(0.3)
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+
+        assert monitor.blocked == 1
+        stack_logs = [call for call in mock_logger.warning.call_args_list if "stack" in call.kwargs]
+        assert len(stack_logs) == 1
+        assert "_block_the_loop" in stack_logs[0].kwargs["stack"]
+        assert stack_logs[0].kwargs["blocked_ms"] >= 50
+        lag_logs = [call for call in mock_logger.warning.call_args_list if "lag_ms" in call.kwargs]
+        assert lag_logs[0].kwargs["lag_ms"] >= 250
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_is_not_reported(self):
+        """Test that an idle loop records small lags and no blocking episode."""
+        monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+        monitor.start()
+        await asyncio.sleep(0.15)
+        await monitor.stop()
+
+        lines = monitor.render()
+        count = next(line for line in lines if line.startswith("event_loop_lag_seconds_count"))
+        assert int(count.split()[1]) >= 5
+        assert monitor.blocked == 0
+        assert "event_loop_blocked_total 0" in lines
+
+    def test_render_histogram(self):
+        """Test the cumulative lag buckets, sum and count."""
+        monitor = LoopLagMonitor()
+        monitor.observe(0.0005)
+        monitor.observe(0.2)
+
+        lines = monitor.render()
+
+        assert "# TYPE event_loop_lag_seconds histogram" in lines
+        assert 'event_loop_lag_seconds_bucket{le="0.001"} 1' in lines
+        assert 'event_loop_lag_seconds_bucket{le="0.25"} 2' in lines
+        assert 'event_loop_lag_seconds_bucket{le="+Inf"} 2' in lines
+        assert "event_loop_lag_seconds_sum 0.2005" in lines
+        assert "event_loop_lag_seconds_count 2" in lines
@@ -0,0 +1,76 @@
+"""Tests for the request metrics."""
+
+import threading
+
+from gradioapp.core.metrics import (
+    RequestMetrics,
+    format_labels,
+    process_metrics,
+    render_metric,
+)
+
+
+class TestFormatting:
+    """Tests for format_labels and render_metric."""
+
+    def test_format_labels_escapes_values(self):
+        """Test quoting and escaping of label values."""
+        assert format_labels({}) == ""
+        assert format_labels({"route": "/a", "note": 'say "hi"\\\n'}) == '{route="/a",note="say \\"hi\\"\\\\\\n"}'
+
+    def test_render_metric(self):
+        """Test HELP and TYPE lines and value formatting."""
+        lines = render_metric("sessions", "gauge", "Stored sessions.", [({}, 3), ({"kind": "x"}, 1.5)])
+
+        assert lines == [
+            "# HELP sessions Stored sessions.",
+            "# TYPE sessions gauge",
+            "sessions 3",
+            'sessions{kind="x"} 1.5',
+        ]
+
+    def test_process_metrics(self):
+        """Test that the process statistics are rendered."""
+        text = "\n".join(process_metrics())
+
+        assert "process_cpu_seconds_total" in text
+        assert "process_start_time_seconds" in text
+        assert "python_threads" in text
+
+
+class TestRequestMetrics:
+    """Tests for RequestMetrics."""
+
+    def test_counters_and_histogram(self):
+        """Test request counts per status and cumulative latency buckets."""
+        metrics = RequestMetrics(buckets=(0.1, 1.0))
+        metrics.observe("GET", "/login", 200, 0.05)
+        metrics.observe("GET", "/login", 200, 0.5)
+        metrics.observe("GET", "/login", 429, 3.0)
+
+        lines = metrics.render()
+
+        assert 'http_requests_total{method="GET",route="/login",status="200"} 2' in lines
+        assert 'http_requests_total{method="GET",route="/login",status="429"} 1' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/login",le="0.1"} 1' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/login",le="1"} 2' in lines
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/login",le="+Inf"} 3' in lines
+        assert 'http_request_duration_seconds_sum{method="GET",route="/login"} 3.55' in lines
+        assert 'http_request_duration_seconds_count{method="GET",route="/login"} 3' in lines
+
+    def test_threads_are_merged(self):
+        """Test that observations recorded by several threads are merged on render."""
+        metrics = RequestMetrics()
+
+        def record():
+            for _ in range(100):
+                metrics.observe("POST", "/login", 302, 0.01)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(metrics._shards) == 4
+        assert 'http_requests_total{method="POST",route="/login",status="302"} 400' in metrics.render()
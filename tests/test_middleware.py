@@ -1,19 +1,30 @@
 """Tests for middleware components."""
 
+import asyncio
 from datetime import timedelta
-from unittest.mock import AsyncMock, patch
+from functools import partial
+from typing import Callable
+from unittest.mock import patch
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 import pytest
-from starlette.responses import Response
-
-from gradioapp.api.middleware.auth import AuthMiddleware
-from gradioapp.api.middleware.logging import LoggingMiddleware
-from gradioapp.api.middleware.session import SessionMiddleware
+from starlette.types import Message, Receive, Scope, Send
+from starlette.websockets import WebSocketDisconnect
+
+from gradioapp.api.middleware.gateway import GatewayMiddleware
+from gradioapp.api.middleware.sampling import (
+    RequestLogSampler,
+    get_request_log_sampler,
+    initialize_request_log_sampler,
+)
+from gradioapp.core.logging import get_request_id
+from gradioapp.core.metrics import RequestMetrics
 from gradioapp.domain.auth import create_access_token
+from gradioapp.domain.csrf import CSRF_NONCE_COOKIE, generate_csrf_token, new_csrf_nonce
 from gradioapp.domain.session.backends.memory import InMemorySessionStore
+from gradioapp.domain.session.revocation import get_revocation_hub
 from gradioapp.domain.session.store import initialize_session_store
 
 
@@ -43,17 +54,17 @@ def test_token():
     )
 
 
-class TestAuthMiddleware:
-    """Tests for AuthMiddleware."""
+class TestGatewayMiddlewareAuth:
+    """Tests for authentication in GatewayMiddleware."""
 
-    def test_auth_middleware_allowed_path(self, app):
+    def test_allowed_path(self, app):
         """Test that allowed paths bypass authentication."""
 
         @app.get("/login")
         async def login():
             return {"message": "ok"}
 
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
 
         response = client.get("/login")
@@ -61,23 +72,57 @@ class TestAuthMiddleware:
         assert response.status_code == 200
         assert response.json() == {"message": "ok"}
 
-    def test_auth_middleware_missing_token(self, app):
+    def test_missing_token(self, app):
         """Test that missing token returns unauthorized response."""
 
         @app.get("/protected")
         async def protected():
             return {"message": "ok"}
 
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
+            response = client.get("/protected")
+            mock_logger.warning.assert_called_once_with("No access token found. Redirecting to /login.")
+
+        assert response.status_code == 401
+        assert response.json() == {"error": "Missing access token", "redirect_to": "/login"}
+
+    def test_missing_token_browser_redirect(self, app):
+        """Test that browser requests without token are redirected to /login."""
+
+        @app.get("/protected")
+        async def protected():
+            return {"message": "ok"}
+
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
 
+        response = client.get("/protected", headers={"accept": "text/html"}, follow_redirects=False)
+
+        assert response.status_code == 302
+        assert response.headers["location"] == "/login"
+
+    def test_invalid_token(self, app):
+        """Test that invalid token returns unauthorized response."""
+
+        @app.get("/protected")
+        async def protected():
+            return {"message": "ok"}
+
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+        client.cookies.set("access_token", "invalid_token")
+
         response = client.get("/protected")
 
-        assert response.status_code in [302, 401]  # Redirect or JSON error
+        assert response.status_code == 401
+        assert response.json()["error"] == "Invalid or expired token"
 
-    def test_auth_middleware_valid_token(self, app, test_token):
-        """Test that valid token allows request to proceed."""
-        from fastapi import Request
+    def test_valid_token_and_session(self, app, session_store, test_token):
+        """Test that valid token and session allow request to proceed with identity in state."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
 
         @app.get("/protected")
         async def protected(request: Request):
@@ -87,7 +132,7 @@ class TestAuthMiddleware:
                 "session_id": getattr(request.state, "session_id", None),
             }
 
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
         client.cookies.set("access_token", test_token)
 
@@ -98,161 +143,493 @@ class TestAuthMiddleware:
         assert data["user_id"] == "test_user"
         assert data["session_id"] == "test_session"
 
-    def test_auth_middleware_invalid_token(self, app):
-        """Test that invalid token returns unauthorized response."""
+
+class TestGatewayMiddlewareSession:
+    """Tests for session validation in GatewayMiddleware."""
+
+    def test_token_without_session_id(self, app, session_store):
+        """Test that a token without session_id claim is rejected."""
+        token = create_access_token({"sub": "test_user"}, expires_delta=timedelta(minutes=30))
 
         @app.get("/protected")
         async def protected():
             return {"message": "ok"}
 
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
-        client.cookies.set("access_token", "invalid_token")
+        client.cookies.set("access_token", token)
 
-        response = client.get("/protected")
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
+            response = client.get("/protected")
+            mock_logger.warning.assert_called_once_with("Session ID not found in access token.")
+
+        assert response.status_code == 401
+        assert response.json()["error"] == "Missing session ID"
+
+    def test_expired_session(self, app, session_store, test_token):
+        """Test that a valid token whose session is gone returns unauthorized response."""
+
+        @app.get("/protected")
+        async def protected():
+            return {"message": "ok"}
 
-        assert response.status_code in [302, 401]  # Redirect or JSON error
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+        client.cookies.set("access_token", test_token)
 
+        response = client.get("/protected")
 
-class TestSessionMiddleware:
-    """Tests for SessionMiddleware."""
+        assert response.status_code == 401
+        assert response.json()["error"] == "Session expired or not found"
 
-    def test_session_middleware_allowed_path(self, app):
-        """Test that allowed paths bypass session validation."""
+    def test_token_only_route_skips_store(self, app, session_store, test_token):
+        """Test that token-only routes (Gradio assets) do not look up the session store."""
 
-        @app.get("/login")
-        async def login():
-            return {"message": "ok"}
+        @app.get("/gradio/assets/app.js")
+        async def asset(request: Request):
+            return {"session_id": request.state.session_id}
 
-        app.add_middleware(SessionMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
+        client.cookies.set("access_token", test_token)
 
-        response = client.get("/login")
+        with patch.object(session_store, "get_session") as mock_get_session:
+            response = client.get("/gradio/assets/app.js")
 
         assert response.status_code == 200
-        assert response.json() == {"message": "ok"}
+        assert response.json() == {"session_id": "test_session"}
+        mock_get_session.assert_not_called()
 
-    def test_session_middleware_missing_session_id(self, app, session_store):
-        """Test that missing session ID returns unauthorized response."""
+    def test_token_only_route_requires_token(self, app):
+        """Test that token-only routes still reject requests without a token."""
 
-        @app.get("/protected")
-        async def protected():
+        @app.get("/gradio/assets/app.js")
+        async def asset():
             return {"message": "ok"}
 
-        # Add SessionMiddleware without AuthMiddleware - session_id won't be set
-        app.add_middleware(SessionMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
 
-        # Request without token - session_id won't be in request.state
-        with patch("gradioapp.api.middleware.session.logger") as mock_logger:
-            response = client.get("/protected")
-            mock_logger.warning.assert_called_once_with("Session ID not found in request state.")
+        response = client.get("/gradio/assets/app.js")
 
-        assert response.status_code in [302, 401]  # Redirect or JSON error
+        assert response.status_code == 401
 
-    def test_session_middleware_missing_session_id_direct(self, app, session_store):
-        """Test that missing session ID logs warning when SessionMiddleware is first."""
-        from gradioapp.api.middleware.session import SessionMiddleware
 
-        @app.get("/protected")
-        async def protected():
+class TestGatewayMiddlewareCsrf:
+    """Tests for CSRF protection of Gradio API requests in GatewayMiddleware."""
+
+    @pytest.fixture
+    def csrf_app(self, app, session_store, test_token):
+        """App with a protected POST endpoint and an authenticated client."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+
+        @app.post("/gradio/gradio_api/queue/join")
+        async def join():
+            return {"message": "ok"}
+
+        @app.post("/api/other")
+        async def other():
             return {"message": "ok"}
 
-        # Add SessionMiddleware without AuthMiddleware - session_id won't be set
-        app.add_middleware(SessionMiddleware)
+        app.add_middleware(GatewayMiddleware, csrf_protected_prefixes=("/gradio/",))
         client = TestClient(app)
+        client.cookies.set("access_token", test_token)
+        return client
 
-        with patch("gradioapp.api.middleware.session.logger") as mock_logger:
-            response = client.get("/protected")
-            mock_logger.warning.assert_called_once_with("Session ID not found in request state.")
+    def test_post_without_token_rejected(self, csrf_app):
+        """Test that a protected POST without X-CSRF-Token is rejected with 403."""
+        nonce = new_csrf_nonce()
+        csrf_app.cookies.set(CSRF_NONCE_COOKIE, nonce)
 
-        assert response.status_code in [302, 401]  # Redirect or JSON error
+        response = csrf_app.post("/gradio/gradio_api/queue/join")
 
-    def test_session_middleware_valid_session(self, app, session_store):
-        """Test that valid session allows request to proceed."""
-        from gradioapp.api.middleware.auth import AuthMiddleware
-        from gradioapp.domain.auth import create_access_token
+        assert response.status_code == 403
+        assert response.json() == {"detail": "CSRF token missing or invalid"}
 
-        # Create a session
-        session_id = "test_session"
-        session_store.create_session(session_id=session_id, username="test_user", data={})
+    def test_post_with_valid_token(self, csrf_app):
+        """Test that a protected POST with the token of its nonce cookie is accepted."""
+        nonce = new_csrf_nonce()
+        csrf_app.cookies.set(CSRF_NONCE_COOKIE, nonce)
 
-        token = create_access_token(
-            {"sub": "test_user", "session_id": session_id},
-            expires_delta=timedelta(minutes=30),
+        response = csrf_app.post("/gradio/gradio_api/queue/join", headers={"X-CSRF-Token": generate_csrf_token(nonce)})
+
+        assert response.status_code == 200
+
+    def test_post_with_foreign_token_rejected(self, csrf_app):
+        """Test that a token of another nonce is rejected."""
+        csrf_app.cookies.set(CSRF_NONCE_COOKIE, new_csrf_nonce())
+
+        response = csrf_app.post(
+            "/gradio/gradio_api/queue/join", headers={"X-CSRF-Token": generate_csrf_token(new_csrf_nonce())}
         )
 
-        @app.get("/protected")
-        async def protected():
+        assert response.status_code == 403
+
+    def test_unprotected_prefix_not_checked(self, csrf_app):
+        """Test that paths outside the protected prefixes do not need a token."""
+        assert csrf_app.post("/api/other").status_code == 200
+
+    def test_disabled_by_default(self, app, session_store, test_token):
+        """Test that without protected prefixes Gradio POSTs do not need a token."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+
+        @app.post("/gradio/gradio_api/queue/join")
+        async def join():
             return {"message": "ok"}
 
-        app.add_middleware(SessionMiddleware)
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
-        client.cookies.set("access_token", token)
+        client.cookies.set("access_token", test_token)
 
-        response = client.get("/protected")
+        assert client.post("/gradio/gradio_api/queue/join").status_code == 200
 
-        assert response.status_code == 200
-        assert response.json() == {"message": "ok"}
 
-    def test_session_middleware_expired_session(self, app, session_store):
-        """Test that expired session returns unauthorized response."""
-        from gradioapp.api.middleware.auth import AuthMiddleware
-        from gradioapp.domain.auth import create_access_token
+class TestGatewayMiddlewareRequestSession:
+    """Tests for request-scoped session resolution in GatewayMiddleware."""
 
-        # Create token with non-existent session
-        token = create_access_token(
-            {"sub": "test_user", "session_id": "nonexistent_session"},
-            expires_delta=timedelta(minutes=30),
-        )
+    def test_session_fetched_once_and_flushed_once(self, app, session_store, test_token):
+        """Test that handlers reuse the resolved session and writes are flushed at the end."""
+        from gradioapp.domain.session.helpers import get_session, set_session_value
+
+        session_store.create_session(session_id="test_session", username="test_user", data={})
 
         @app.get("/protected")
-        async def protected():
-            return {"message": "ok"}
+        async def protected(request: Request):
+            set_session_value(request, "visits", 1)
+            return {"username": get_session(request)["username"]}
 
-        app.add_middleware(SessionMiddleware)
-        app.add_middleware(AuthMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
-        client.cookies.set("access_token", token)
+        client.cookies.set("access_token", test_token)
 
-        response = client.get("/protected")
+        with (
+            patch.object(session_store, "get_session", wraps=session_store.get_session) as mock_get_session,
+            patch.object(session_store, "merge_session", wraps=session_store.merge_session) as mock_merge,
+        ):
+            response = client.get("/protected")
+
+        assert response.status_code == 200
+        assert response.json() == {"username": "test_user"}
+        mock_get_session.assert_called_once_with("test_session")
+        mock_merge.assert_called_once_with("test_session", {"visits": 1}, set())
+
+
+class TestGatewayMiddlewareMetrics:
+    """Tests for request metrics recorded by GatewayMiddleware."""
+
+    def test_records_route_template(self, app):
+        """Test that requests are recorded under their route template, rejected ones as unmatched."""
+        metrics = RequestMetrics()
+
+        @app.get("/static/{name}")
+        async def static_file(name: str):
+            return {"name": name}
+
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+
+        with patch("gradioapp.api.middleware.gateway.get_request_metrics", return_value=metrics):
+            client.get("/static/a.js")
+            client.get("/static/b.js")
+            client.get("/protected", headers={"Accept": "application/json"})
 
-        assert response.status_code in [302, 401]  # Redirect or JSON error
+        lines = metrics.render()
+        assert 'http_requests_total{method="GET",route="/static/{name}",status="200"} 2' in lines
+        assert 'http_requests_total{method="GET",route="unmatched",status="401"} 1' in lines
 
 
-class TestLoggingMiddleware:
-    """Tests for LoggingMiddleware."""
+class TestGatewayMiddlewareWebSocket:
+    """Tests for websocket handling in GatewayMiddleware."""
 
-    def test_logging_middleware_success(self, app):
-        """Test that logging middleware logs successful requests."""
+    def test_websocket_rejected_without_token(self, app):
+        """Test that websocket handshake without token is closed with policy violation."""
 
-        @app.get("/test")
-        async def test():
+        @app.websocket("/ws")
+        async def websocket_endpoint(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_text("hello")
+            await websocket.close()
+
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/ws"):
+                pass
+
+        assert exc_info.value.code == 1008
+
+    def test_websocket_accepted_with_valid_session(self, app, session_store, test_token):
+        """Test that websocket connection with valid token and session gets identity in state."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+
+        @app.websocket("/ws")
+        async def websocket_endpoint(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_text(websocket.state.session_id)
+            await websocket.close()
+
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+        client.cookies.set("access_token", test_token)
+
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_text() == "test_session"
+
+
+class TestGatewayMiddlewareRequestId:
+    """Tests for request IDs in GatewayMiddleware."""
+
+    @pytest.fixture
+    def request_id_app(self, app):
+        """App whose route returns the request ID seen by the handler and by the log context."""
+
+        @app.get("/login")
+        async def login(request: Request):
+            return {"state": request.state.request_id, "context": get_request_id()}
+
+        app.add_middleware(GatewayMiddleware)
+        return app
+
+    def test_generates_and_echoes_request_id(self, request_id_app):
+        """Test that a request without a request ID gets a new one, echoed in the response header."""
+        client = TestClient(request_id_app)
+
+        first = client.get("/login")
+        second = client.get("/login")
+
+        request_id = first.headers["x-request-id"]
+        assert len(request_id) == 16
+        assert first.json() == {"state": request_id, "context": request_id}
+        assert second.headers["x-request-id"] != request_id
+        assert get_request_id() == "-"
+
+    def test_accepts_valid_incoming_request_id(self, request_id_app):
+        """Test that a valid X-Request-ID header from the client is kept."""
+        client = TestClient(request_id_app)
+
+        response = client.get("/login", headers={"X-Request-ID": "edge-1234.abcd"})
+
+        assert response.headers["x-request-id"] == "edge-1234.abcd"
+        assert response.json()["context"] == "edge-1234.abcd"
+
+    def test_replaces_invalid_incoming_request_id(self, request_id_app):
+        """Test that a request ID that could forge log lines is replaced."""
+        client = TestClient(request_id_app)
+
+        response = client.get("/login", headers={"X-Request-ID": "x | INFO | forged"})
+
+        assert response.headers["x-request-id"] != "x | INFO | forged"
+        assert len(response.headers["x-request-id"]) == 16
+
+    def test_request_id_on_rejected_request(self, app):
+        """Test that unauthorized responses carry the request ID too."""
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+
+        response = client.get("/protected", headers={"Accept": "application/json"})
+
+        assert response.status_code == 401
+        assert "x-request-id" in response.headers
+
+
+class TestGatewayMiddlewareLogging:
+    """Tests for request logging in GatewayMiddleware."""
+
+    def test_logs_successful_request(self, app):
+        """Test that middleware logs successful requests with status code."""
+
+        @app.get("/login")
+        async def login():
             return {"message": "ok"}
 
-        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
 
-        with patch("gradioapp.api.middleware.logging.logger") as mock_logger:
-            response = client.get("/test")
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
+            response = client.get("/login")
 
             assert response.status_code == 200
             assert response.json() == {"message": "ok"}
-            mock_logger.debug.assert_called()
+            # The message is formatted by loguru, only when the record is written
+            message = mock_logger.debug.call_args.args[0].format(**mock_logger.debug.call_args.kwargs)
+            assert "[GET] /login | status=200" in message
+
+    @pytest.fixture
+    def sampled_app(self, app):
+        """App with routes answering 200 and 500, and a sampler logging one request in three."""
+
+        @app.get("/login")
+        async def login():
+            return {"message": "ok"}
+
+        @app.get("/healthz")
+        async def failing():
+            return JSONResponse({"status": "fail"}, status_code=500)
+
+        app.add_middleware(GatewayMiddleware)
+        initialize_request_log_sampler(RequestLogSampler(rate=1 / 3, slow_threshold_ms=60_000))
+        yield app
+        initialize_request_log_sampler(None)
+
+    def test_samples_successful_requests(self, sampled_app):
+        """Test that successful requests are sampled per route and the next line counts the suppressed ones."""
+        client = TestClient(sampled_app)
+
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
+            for _ in range(4):
+                client.get("/login")
 
-    def test_logging_middleware_exception(self, app):
-        """Test that logging middleware logs exceptions."""
+        calls = mock_logger.debug.call_args_list
+        assert len(calls) == 2
+        assert [call.kwargs["suppressed"] for call in calls] == [0, 2]
+        assert "similar request(s) not logged" in calls[1].args[0].format(**calls[1].kwargs)
 
-        @app.get("/test")
-        async def test():
+    def test_errors_and_slow_requests_always_logged(self, sampled_app):
+        """Test that server errors and slow requests bypass sampling and are logged as warnings."""
+        client = TestClient(sampled_app)
+
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
+            for _ in range(3):
+                client.get("/healthz")
+            assert mock_logger.warning.call_count == 3
+
+            get_request_log_sampler().slow_threshold_ms = 0.001
+            client.get("/login")
+
+        message = mock_logger.warning.call_args.args[0].format(**mock_logger.warning.call_args.kwargs)
+        assert message.startswith("[GET] /login | status=200")
+        assert message.endswith("| slow")
+
+    def test_logs_exception(self, app):
+        """Test that middleware logs exceptions and re-raises them."""
+
+        @app.get("/login")
+        async def login():
             raise ValueError("Test error")
 
-        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(GatewayMiddleware)
         client = TestClient(app)
 
-        with patch("gradioapp.api.middleware.logging.logger") as mock_logger:
+        with patch("gradioapp.api.middleware.gateway.logger") as mock_logger:
             with pytest.raises(ValueError):
-                client.get("/test")
+                client.get("/login")
 
             mock_logger.exception.assert_called_once()
+
+    def test_streaming_response_passes_through(self, app):
+        """Test that streaming responses are forwarded chunk by chunk without buffering."""
+        from fastapi.responses import StreamingResponse
+
+        async def event_stream():
+            for index in range(3):
+                yield f"data: {index}\n\n"
+
+        @app.get("/login")
+        async def login():
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        app.add_middleware(GatewayMiddleware)
+        client = TestClient(app)
+
+        response = client.get("/login")
+
+        assert response.status_code == 200
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+def _stream_scope(token: str, scope_type: str = "http") -> Scope:
+    """Build an ASGI scope for a Gradio queue stream authenticated with the given token."""
+    scope: Scope = {
+        "type": scope_type,
+        "path": "/gradio/gradio_api/queue/data",
+        "query_string": b"",
+        "headers": [(b"cookie", f"access_token={token}".encode()), (b"accept", b"text/event-stream")],
+    }
+    if scope_type == "http":
+        scope["method"] = "GET"
+    return scope
+
+
+async def _endless_sse(scope: Scope, receive: Receive, send: Send) -> None:
+    """ASGI app streaming SSE events until cancelled."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    while True:
+        await send({"type": "http.response.body", "body": b"data: ping\n\n", "more_body": True})
+        await asyncio.sleep(0.01)
+
+
+async def _endless_websocket(scope: Scope, receive: Receive, send: Send) -> None:
+    """ASGI app accepting a websocket and keeping it open until cancelled."""
+    await send({"type": "websocket.accept"})
+    await asyncio.Event().wait()
+
+
+async def _drive(middleware: GatewayMiddleware, scope: Scope, trigger: Callable[[], object]) -> list[Message]:
+    """Run the middleware on a stream, fire the trigger once it is open and collect sent messages."""
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    task = asyncio.ensure_future(middleware(scope, receive, send))
+    await asyncio.sleep(0.05)
+    trigger()
+    await asyncio.wait_for(task, timeout=2)
+    return messages
+
+
+class TestGatewayMiddlewareStreams:
+    """Tests for stream-aware authentication in GatewayMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_closed_on_revocation(self, session_store, test_token):
+        """Test that a revoked session ends an open SSE stream without waiting for re-validation."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+        middleware = GatewayMiddleware(_endless_sse, stream_revalidate_interval=60)
+
+        revoke = partial(get_revocation_hub().revoke, "test_session")
+        messages = await _drive(middleware, _stream_scope(test_token), revoke)
+
+        assert (messages[0]["type"], messages[0]["status"]) == ("http.response.start", 200)
+        assert [name for name, _ in messages[0]["headers"]] == [b"x-request-id"]
+        assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_closed_on_expiry(self, session_store, test_token):
+        """Test that periodic re-validation ends a stream whose session disappeared."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+        middleware = GatewayMiddleware(_endless_sse, stream_revalidate_interval=0.02)
+
+        expire = partial(session_store.delete_session, "test_session")
+        messages = await _drive(middleware, _stream_scope(test_token), expire)
+
+        assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+    @pytest.mark.asyncio
+    async def test_stream_does_not_hit_store_per_message(self, session_store, test_token):
+        """Test that an open stream only looks up the session when it opens."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+        middleware = GatewayMiddleware(_endless_sse, stream_revalidate_interval=60)
+
+        with patch.object(session_store, "get_session", wraps=session_store.get_session) as mock_get_session:
+            await _drive(middleware, _stream_scope(test_token), partial(get_revocation_hub().revoke, "test_session"))
+
+        mock_get_session.assert_called_once_with("test_session")
+
+    @pytest.mark.asyncio
+    async def test_websocket_closed_on_revocation(self, session_store, test_token):
+        """Test that a revoked session closes its open websocket with a policy violation."""
+        session_store.create_session(session_id="test_session", username="test_user", data={})
+        middleware = GatewayMiddleware(_endless_websocket, stream_revalidate_interval=60)
+
+        scope = _stream_scope(test_token, scope_type="websocket")
+        messages = await _drive(middleware, scope, partial(get_revocation_hub().revoke, "test_session"))
+
+        assert messages[0]["type"] == "websocket.accept"
+        assert messages[-1]["type"] == "websocket.close"
+        assert messages[-1]["code"] == 1008
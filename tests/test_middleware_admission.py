@@ -0,0 +1,207 @@
+"""Tests for the load-shedding admission controller and middleware."""
+
+import asyncio
+from dataclasses import replace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from starlette.requests import HTTPConnection
+
+from gradioapp.api.middleware.admission import (
+    LOGIN,
+    OTHER,
+    QUEUE,
+    REASON_IN_FLIGHT,
+    REASON_LAG,
+    SESSION_DUMP,
+    STREAM,
+    UPLOAD,
+    AdmissionController,
+    AdmissionMiddleware,
+    get_admission_controller,
+    initialize_admission_controller,
+)
+from gradioapp.api.routes.login import render_login_page
+from gradioapp.config import load_settings
+from gradioapp.core.loop_monitor import LoopLagMonitor, initialize_loop_monitor
+from gradioapp.domain.csrf import CSRF_NONCE_COOKIE
+
+
+def _connection(method: str, path: str, accept: str = "") -> HTTPConnection:
+    headers = [(b"accept", accept.encode())] if accept else []
+    return HTTPConnection({"type": "http", "method": method, "path": path, "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Start and end every test without a global admission controller or loop monitor."""
+    initialize_admission_controller(None)
+    initialize_loop_monitor(None)
+    yield
+    initialize_admission_controller(None)
+    initialize_loop_monitor(None)
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    @pytest.mark.parametrize(
+        ("method", "path", "accept", "expected"),
+        [
+            ("POST", "/login", "", LOGIN),
+            ("GET", "/login", "text/html", OTHER),
+            ("POST", "/gradio/gradio_api/upload", "", UPLOAD),
+            ("POST", "/gradio/gradio_api/queue/join", "", QUEUE),
+            ("GET", "/gradio/gradio_api/queue/data", "", STREAM),
+            ("GET", "/events", "text/event-stream", STREAM),
+            ("GET", "/gradio/config", "", OTHER),
+        ],
+    )
+    def test_classify(self, method, path, accept, expected):
+        """Test the route class of logins, uploads, queue requests, streams and other requests."""
+        assert AdmissionController.classify(_connection(method, path, accept)) == expected
+
+    def test_sheds_low_priority_work_above_in_flight_limit(self):
+        """Test that only low-priority work is shed once max_in_flight requests are in flight."""
+        controller = AdmissionController(max_in_flight=2)
+        controller.enter(QUEUE)
+        assert controller.shed(LOGIN) is None
+
+        controller.enter(OTHER)
+
+        assert controller.shed(LOGIN) == REASON_IN_FLIGHT
+        assert controller.shed(UPLOAD) == REASON_IN_FLIGHT
+        assert controller.shed(SESSION_DUMP) == REASON_IN_FLIGHT
+        assert controller.shed(QUEUE) is None
+        assert controller.shed(OTHER) is None
+        controller.leave(OTHER)
+        assert controller.shed(LOGIN) is None
+        assert controller.stats() == {
+            (LOGIN, REASON_IN_FLIGHT): 1,
+            (UPLOAD, REASON_IN_FLIGHT): 1,
+            (SESSION_DUMP, REASON_IN_FLIGHT): 1,
+        }
+
+    def test_streams_do_not_count_towards_the_limit(self):
+        """Test that open streams are tracked but do not make the server overloaded."""
+        controller = AdmissionController(max_in_flight=1)
+        controller.enter(STREAM)
+        controller.enter(STREAM)
+
+        assert controller.overload() is None
+        assert controller.in_flight() == {STREAM: 2}
+
+    def test_sheds_on_event_loop_lag(self):
+        """Test that lag measured by the loop monitor at or above the threshold sheds low-priority work."""
+        controller = AdmissionController(lag_threshold_ms=200)
+        monitor = LoopLagMonitor()
+        assert controller.overload() is None  # monitor not running
+
+        initialize_loop_monitor(monitor)
+        monitor.observe(0.15)
+        assert controller.overload() is None
+        monitor.observe(0.2)
+
+        assert controller.shed(LOGIN) == REASON_LAG
+        assert controller.stats() == {(LOGIN, REASON_LAG): 1}
+
+    def test_zero_thresholds_disable_shedding(self):
+        """Test that the default thresholds of 0 never shed."""
+        controller = AdmissionController()
+        monitor = LoopLagMonitor()
+        monitor.observe(5.0)
+        initialize_loop_monitor(monitor)
+        for _ in range(1000):
+            controller.enter(OTHER)
+
+        assert controller.shed(LOGIN) is None
+
+    def test_built_from_settings(self, monkeypatch):
+        """Test that the controller is created from the settings on first use."""
+        settings = replace(
+            load_settings(), admission_max_in_flight=50, admission_lag_threshold_ms=300.0, admission_retry_after=5
+        )
+        monkeypatch.setattr("gradioapp.api.middleware.admission.get_settings", lambda: settings)
+
+        controller = get_admission_controller()
+
+        assert (controller.max_in_flight, controller.lag_threshold_ms, controller.retry_after) == (50, 300.0, 5)
+        assert get_admission_controller() is controller
+
+
+class TestAdmissionMiddleware:
+    """Tests for AdmissionMiddleware."""
+
+    @pytest.fixture
+    def controller(self):
+        controller = AdmissionController(max_in_flight=1, retry_after=3)
+        initialize_admission_controller(controller)
+        return controller
+
+    @pytest.fixture
+    def client(self, controller):
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, login_page=render_login_page)
+
+        @app.post("/login")
+        async def login():
+            return {"in_flight": controller.in_flight()}
+
+        @app.post("/gradio/gradio_api/queue/join")
+        async def queue_join():
+            return {"in_flight": controller.in_flight()}
+
+        return TestClient(app)
+
+    def test_admits_and_tracks_requests(self, client, controller):
+        """Test that admitted requests are counted in flight while they run."""
+        response = client.post("/login")
+
+        assert response.status_code == 200
+        assert response.json() == {"in_flight": {LOGIN: 1}}
+        assert controller.in_flight() == {LOGIN: 0}
+
+    def test_sheds_login_with_retry_after(self, client, controller):
+        """Test that a login is rejected with 503 and Retry-After while the server is overloaded."""
+        controller.enter(OTHER)
+
+        response = client.post("/login")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert response.json() == {"detail": "Server is busy, please try again"}
+        assert controller.stats() == {(LOGIN, REASON_IN_FLIGHT): 1}
+        assert LOGIN not in controller.in_flight()
+
+    def test_sheds_browser_login_with_login_page(self, client, controller):
+        """Test that a shed login from a browser form gets the login page with an error."""
+        controller.enter(OTHER)
+
+        response = client.post("/login", headers={"Accept": "text/html,application/xhtml+xml"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+        assert "text/html" in response.headers["content-type"]
+        assert "Server is busy, please try again" in response.text
+        assert CSRF_NONCE_COOKIE in response.cookies
+
+    def test_protects_gradio_queue(self, client, controller):
+        """Test that Gradio queue requests are admitted while the server is overloaded."""
+        controller.enter(OTHER)
+
+        response = client.post("/gradio/gradio_api/queue/join")
+
+        assert response.status_code == 200
+        assert controller.stats() == {}
+
+    def test_passes_lifespan_through(self):
+        """Test that non-HTTP scopes reach the app untouched."""
+        received = []
+
+        async def app(scope, receive, send):
+            received.append(scope["type"])
+
+        asyncio.run(AdmissionMiddleware(app)({"type": "lifespan"}, None, None))
+
+        assert received == ["lifespan"]
@@ -0,0 +1,195 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.testclient import TestClient
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from gradioapp.api.middleware.compression import CompressionMiddleware
+from gradioapp.core import http_cache
+
+PAYLOAD = {"components": [{"id": index, "type": "textbox", "label": f"Field {index}"} for index in range(50)]}
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Create a test app with compressible, small, encoded, binary and file responses."""
+    test_app = FastAPI()
+    text_file = tmp_path / "app.js"
+    text_file.write_text("console.log('gradio');\n" * 200)
+
+    @test_app.get("/file")
+    async def file():
+        return FileResponse(text_file)
+
+    @test_app.get("/config")
+    async def config():
+        return JSONResponse(PAYLOAD, headers={"ETag": '"v1"'})
+
+    @test_app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @test_app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(b"x" * 1000), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @test_app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\x00" * 1000, media_type="image/png")
+
+    test_app.add_middleware(CompressionMiddleware)
+    return test_app
+
+
+async def run_asgi(app, scope: Scope) -> list[Message]:
+    """Call an ASGI app directly and collect the messages it sends."""
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+def http_scope(path: str = "/", accept_encoding: str = "gzip", method: str = "GET") -> Scope:
+    """Build a minimal HTTP scope."""
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+
+def streaming_app(media_type: str, chunks: list[bytes]):
+    """Create an ASGI app streaming the given chunks."""
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        async def body():
+            for chunk in chunks:
+                yield chunk
+
+        await StreamingResponse(body(), media_type=media_type)(scope, receive, send)
+
+    return app
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware on complete responses."""
+
+    def test_compresses_json(self, app):
+        """Test that a large JSON body is gzip compressed with correct headers."""
+        response = TestClient(app).get("/config", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == PAYLOAD
+
+    def test_weakens_etag(self, app):
+        """Test that the validator of the identity body is marked weak."""
+        response = TestClient(app).get("/config", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["etag"] == 'W/"v1"'
+
+    @pytest.mark.skipif(http_cache.brotli is None, reason="brotli is not installed")
+    def test_prefers_brotli(self, app):
+        """Test that brotli is chosen when accepted."""
+        response = TestClient(app).get("/config", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+
+    @pytest.mark.parametrize(
+        ("path", "accept_encoding"),
+        [("/config", "identity"), ("/small", "gzip"), ("/image", "gzip")],
+    )
+    def test_passthrough(self, app, path, accept_encoding):
+        """Test that unaccepted codings, small bodies and binary media types are sent as they are."""
+        response = TestClient(app).get(path, headers={"Accept-Encoding": accept_encoding})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_keeps_existing_encoding(self, app):
+        """Test that an already encoded body is not compressed twice."""
+        response = TestClient(app).get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+        assert response.text == "x" * 1000
+
+    def test_range_response_passthrough(self, app):
+        """Test that a partial response keeps the identity body its Content-Range refers to."""
+        response = TestClient(app).get("/file", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-999"})
+
+        assert response.status_code == 206
+        assert "content-encoding" not in response.headers
+        assert response.headers["content-range"].startswith("bytes 0-999/")
+        assert len(response.content) == 1000
+
+    @pytest.mark.asyncio
+    async def test_head_passthrough(self, app):
+        """Test that HEAD responses keep the identity headers."""
+        messages = await run_asgi(app, http_scope("/config", method="HEAD"))
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+
+
+class TestCompressionMiddlewareStreaming:
+    """Tests for CompressionMiddleware on streamed and non-HTTP traffic."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_chunks_are_flushed(self):
+        """Test that each streamed chunk can be decoded as soon as it arrives."""
+        chunks = [b"first line\n" * 10, b"second line\n" * 10, b"third line\n" * 10]
+        middleware = CompressionMiddleware(streaming_app("text/plain", chunks))
+
+        messages = await run_asgi(middleware, http_scope())
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        bodies = [message for message in messages[1:] if message.get("body")]
+        for chunk, message in zip(chunks, bodies):
+            assert decoder.decompress(message["body"]) == chunk
+
+    @pytest.mark.asyncio
+    async def test_event_stream_passthrough(self):
+        """Test that server-sent events are neither compressed nor buffered."""
+        chunks = [b"data: 1\n\n", b"data: 2\n\n"]
+        middleware = CompressionMiddleware(streaming_app("text/event-stream", chunks), minimum_size=0)
+
+        messages = await run_asgi(middleware, http_scope())
+
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        assert [message.get("body") for message in messages[1:3]] == chunks
+
+    @pytest.mark.asyncio
+    async def test_websocket_passthrough(self):
+        """Test that websocket scopes reach the app with the original send callable."""
+        received = {}
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            received["send"] = send
+
+        async def send(message: Message) -> None:
+            pass
+
+        scope = {"type": "websocket", "path": "/ws", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app)(scope, None, send)
+
+        assert received["send"] is send
@@ -0,0 +1,70 @@
+"""Tests for the request log sampler."""
+
+from dataclasses import replace
+
+import pytest
+
+from gradioapp.api.middleware.sampling import (
+    RequestLogSampler,
+    get_request_log_sampler,
+    initialize_request_log_sampler,
+)
+from gradioapp.config import load_settings
+
+
+class TestRequestLogSampler:
+    """Tests for RequestLogSampler."""
+
+    def test_full_rate_logs_everything(self):
+        """Test that the default rate logs every request and suppresses nothing."""
+        sampler = RequestLogSampler()
+
+        assert [sampler.sample("/login") for _ in range(5)] == [0, 0, 0, 0, 0]
+        assert sampler.stats() == {}
+
+    def test_rate_logs_evenly_with_suppressed_counts(self):
+        """Test that a rate of 0.25 logs the first request and then every fourth, reporting the gap."""
+        sampler = RequestLogSampler(rate=0.25)
+
+        decisions = [sampler.sample("/gradio/config") for _ in range(9)]
+
+        assert decisions == [0, None, None, None, 3, None, None, None, 3]
+        assert sampler.stats() == {"/gradio/config": 6}
+
+    def test_route_rates(self):
+        """Test that route rates override the default rate, per route."""
+        sampler = RequestLogSampler(rate=1.0, route_rates={"/healthz": 0.0, "/gradio/config": 0.5})
+
+        assert [sampler.sample("/healthz") for _ in range(3)] == [None, None, None]
+        assert [sampler.sample("/gradio/config") for _ in range(4)] == [0, None, 1, None]
+        assert sampler.sample("/login") == 0
+        assert sampler.stats() == {"/healthz": 3, "/gradio/config": 2}
+
+    def test_is_slow(self):
+        """Test the slow request threshold, and that 0 disables it."""
+        assert RequestLogSampler(slow_threshold_ms=500).is_slow(500)
+        assert not RequestLogSampler(slow_threshold_ms=500).is_slow(499.9)
+        assert not RequestLogSampler(slow_threshold_ms=0).is_slow(10_000)
+
+
+class TestRequestLogSamplerSingleton:
+    """Tests for the global request log sampler."""
+
+    @pytest.fixture(autouse=True)
+    def reset_sampler(self):
+        """Start and end every test without a global sampler."""
+        initialize_request_log_sampler(None)
+        yield
+        initialize_request_log_sampler(None)
+
+    def test_built_from_settings(self, monkeypatch):
+        """Test that the sampler is created from the settings on first use."""
+        settings = replace(
+            load_settings(), log_sample_rate=0.5, log_sample_routes=(("/healthz", 0.0),), log_slow_request_ms=250.0
+        )
+        monkeypatch.setattr("gradioapp.api.middleware.sampling.get_settings", lambda: settings)
+
+        sampler = get_request_log_sampler()
+
+        assert (sampler.rate, sampler.route_rates, sampler.slow_threshold_ms) == (0.5, {"/healthz": 0.0}, 250.0)
+        assert get_request_log_sampler() is sampler
@@ -5,12 +5,21 @@ from unittest.mock import MagicMock, patch
 from fastapi import Request
 from fastapi.responses import JSONResponse, RedirectResponse
 import pytest
+from starlette.requests import HTTPConnection
 
 from gradioapp.api.middleware.utils import (
+    PathMatcher,
+    RouteAccess,
+    RouteClassifier,
+    build_route_classifier,
+    classify_route,
     create_unauthorized_response,
     is_browser_request,
     is_path_allowed,
+    is_stream_request,
+    route_template,
 )
+from gradioapp.core.metrics import UNMATCHED_ROUTE
 
 
 class TestIsPathAllowed:
@@ -28,6 +37,10 @@ class TestIsPathAllowed:
         """Test that /healthz path is allowed."""
         assert is_path_allowed("/healthz") is True
 
+    def test_is_path_allowed_readyz(self):
+        """Test that /readyz path is allowed."""
+        assert is_path_allowed("/readyz") is True
+
     def test_is_path_allowed_static(self):
         """Test that /static/* paths are allowed."""
         assert is_path_allowed("/static/css/style.css") is True
@@ -43,6 +56,89 @@ class TestIsPathAllowed:
         assert is_path_allowed("/api/data") is False
 
 
+class TestPathMatcher:
+    """Tests for the compiled PathMatcher."""
+
+    def test_exact_match(self):
+        """Test that patterns without '*' match exactly."""
+        matcher = PathMatcher(["/login"])
+
+        assert matcher.matches("/login") is True
+        assert matcher.matches("/login/extra") is False
+        assert matcher.matches("/log") is False
+
+    def test_prefix_match(self):
+        """Test that patterns ending with '*' match by prefix at any depth."""
+        matcher = PathMatcher(["/static/*", "/gradio/pwa_icon*"])
+
+        assert matcher.matches("/static/app.js") is True
+        assert matcher.matches("/static/css/deep/style.css") is True
+        assert matcher.matches("/gradio/pwa_icon") is True
+        assert matcher.matches("/static") is False
+        assert matcher.matches("/staticfiles") is False
+
+    def test_empty_matcher(self):
+        """Test that a matcher without patterns matches nothing."""
+        assert PathMatcher([]).matches("/anything") is False
+
+    def test_wildcard_in_middle_rejected(self):
+        """Test that '*' outside the end of a pattern is rejected."""
+        with pytest.raises(ValueError, match="only allowed at the end"):
+            PathMatcher(["/static/*/app.js"])
+
+
+class TestClassifyRoute:
+    """Tests for route classification."""
+
+    def test_public_paths(self):
+        """Test that allowed paths are public."""
+        assert classify_route("/login") is RouteAccess.PUBLIC
+        assert classify_route("/static/css/style.css") is RouteAccess.PUBLIC
+
+    def test_gradio_assets_are_token_only(self):
+        """Test that immutable Gradio assets only require a token."""
+        assert classify_route("/gradio/assets/index-abc123.js") is RouteAccess.TOKEN
+        assert classify_route("/gradio/assets/fonts/Inter.woff2") is RouteAccess.TOKEN
+        assert classify_route("/gradio/theme.css") is RouteAccess.TOKEN
+        assert classify_route("/gradio/pwa_icon/192") is RouteAccess.TOKEN
+
+    def test_gradio_app_requires_session(self):
+        """Test that Gradio pages and API calls require a live session."""
+        assert classify_route("/gradio/") is RouteAccess.SESSION
+        assert classify_route("/gradio/gradio_api/queue/join") is RouteAccess.SESSION
+        assert classify_route("/") is RouteAccess.SESSION
+
+    def test_public_takes_precedence(self):
+        """Test that a path matching both tiers is public."""
+        classifier = RouteClassifier(["/shared/*"], ["/shared/*"])
+
+        assert classifier.classify("/shared/file.js") is RouteAccess.PUBLIC
+
+    def test_classifier_caches_recent_paths(self):
+        """Test that repeated classification of a path hits the LRU cache."""
+        classifier = RouteClassifier(["/login"], [], cache_size=8)
+
+        with patch.object(PathMatcher, "matches", return_value=True) as mock_matches:
+            classifier.classify("/login")
+            classifier.classify("/login")
+
+        mock_matches.assert_called_once_with("/login")
+
+    def test_build_from_settings(self, monkeypatch):
+        """Test that allowlists are loaded from settings, with built-in defaults as fallback."""
+        from gradioapp.config import load_settings
+
+        monkeypatch.setenv("ALLOWED_PATHS", "/public, /docs/*")
+        monkeypatch.delenv("TOKEN_ONLY_PATHS", raising=False)
+
+        classifier = build_route_classifier(load_settings())
+
+        assert classifier.classify("/public") is RouteAccess.PUBLIC
+        assert classifier.classify("/docs/index.html") is RouteAccess.PUBLIC
+        assert classifier.classify("/login") is RouteAccess.SESSION
+        assert classifier.classify("/gradio/assets/app.js") is RouteAccess.TOKEN
+
+
 class TestIsBrowserRequest:
     """Tests for is_browser_request function."""
 
@@ -68,6 +164,55 @@ class TestIsBrowserRequest:
         assert is_browser_request(mock_request) is False
 
 
+class TestIsStreamRequest:
+    """Tests for is_stream_request function."""
+
+    @staticmethod
+    def _connection(scope_type: str = "http", path: str = "/gradio/run", accept: str = "") -> HTTPConnection:
+        headers = [(b"accept", accept.encode())] if accept else []
+        return HTTPConnection({"type": scope_type, "path": path, "headers": headers})
+
+    def test_websocket_is_stream(self):
+        """Test that websocket connections are streams."""
+        assert is_stream_request(self._connection(scope_type="websocket")) is True
+
+    def test_gradio_queue_data_is_stream(self):
+        """Test that the Gradio queue data path is a stream."""
+        assert is_stream_request(self._connection(path="/gradio/gradio_api/queue/data")) is True
+
+    def test_event_stream_accept_is_stream(self):
+        """Test that SSE requests are streams."""
+        assert is_stream_request(self._connection(accept="text/event-stream")) is True
+
+    def test_regular_request_is_not_stream(self):
+        """Test that regular HTTP requests are not streams."""
+        assert is_stream_request(self._connection(accept="application/json")) is False
+
+
+class TestRouteTemplate:
+    """Tests for route_template function."""
+
+    def test_route_template(self):
+        """Test that the template of the matched route is used, not the concrete path."""
+        scope = {"path": "/items/42", "root_path": "", "route": MagicMock(path="/items/{item_id}")}
+
+        assert route_template(scope) == "/items/{item_id}"
+
+    def test_mounted_route_template(self):
+        """Test that routes of mounted apps get the mount prefix."""
+        scope = {"path": "/gradio/config", "root_path": "/prefix/gradio", "route": MagicMock(path="/config")}
+
+        assert route_template(scope, root_path="/prefix") == "/gradio/config"
+
+    def test_mount_without_route(self):
+        """Test that mounts without routes (static files) are labeled by prefix."""
+        assert route_template({"path": "/static/app.js", "root_path": "/static"}) == "/static/*"
+
+    def test_unmatched(self):
+        """Test that unknown paths share one label."""
+        assert route_template({"path": "/wp-admin.php", "root_path": ""}) == UNMATCHED_ROUTE
+
+
 class TestCreateUnauthorizedResponse:
     """Tests for create_unauthorized_response function."""
 
@@ -0,0 +1,79 @@
+"""Tests for the bounded password verification pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from gradioapp.core.logging import request_id_var
+from gradioapp.domain.password_pool import (
+    PasswordPool,
+    PasswordPoolBusyError,
+    get_password_pool,
+)
+
+
+class TestPasswordPool:
+    """Tests for PasswordPool."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result_from_worker_thread(self):
+        """Test that run executes the function off the event loop thread and returns its result."""
+        pool = PasswordPool(max_workers=1, max_pending=2)
+        try:
+            thread_name = await pool.run(lambda: threading.current_thread().name)
+            assert thread_name.startswith("password")
+            assert await pool.run(pow, 2, 10) == 1024
+            assert pool.pending == 0
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_propagates_context(self):
+        """Test that the function sees the caller's context variables, such as the request ID."""
+        pool = PasswordPool(max_workers=1, max_pending=1)
+        token = request_id_var.set("req-123")
+        try:
+            assert await pool.run(request_id_var.get) == "req-123"
+        finally:
+            request_id_var.reset(token)
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_rejects_when_queue_is_full(self):
+        """Test that run fails fast once max_pending checks are in flight."""
+        pool = PasswordPool(max_workers=1, max_pending=2)
+        release = threading.Event()
+        try:
+            in_flight = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert pool.pending == 2
+
+            with pytest.raises(PasswordPoolBusyError):
+                await pool.run(release.wait)
+
+            release.set()
+            await asyncio.gather(*in_flight)
+            assert pool.pending == 0
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_pending_released_on_exception(self):
+        """Test that a failing function frees its slot and propagates the exception."""
+        pool = PasswordPool(max_workers=1, max_pending=1)
+
+        def fail() -> None:
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                await pool.run(fail)
+            assert pool.pending == 0
+        finally:
+            pool.shutdown()
+
+    def test_get_password_pool_returns_singleton(self):
+        """Test that get_password_pool returns the same instance."""
+        assert get_password_pool() is get_password_pool()
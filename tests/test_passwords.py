@@ -0,0 +1,50 @@
+"""Tests for bcrypt hashing helpers and cost calibration."""
+
+from unittest.mock import patch
+
+from gradioapp.domain.passwords import (
+    CALIBRATION_ROUNDS,
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    calibrate_rounds,
+    check_password,
+    get_rounds,
+    hash_password,
+    measure_hash_ms,
+)
+
+
+class TestHashing:
+    """Tests for hash_password, check_password and get_rounds."""
+
+    def test_hash_with_explicit_rounds(self):
+        """Test that the requested cost factor is encoded in the hash."""
+        password_hash = hash_password("pw", rounds=5)
+
+        assert get_rounds(password_hash) == 5
+        assert check_password("pw", password_hash) is True
+        assert check_password("other", password_hash) is False
+
+    def test_default_rounds(self):
+        """Test that hashes default to the bcrypt library cost of 12."""
+        assert get_rounds(hash_password("pw")) == 12
+
+
+class TestCalibrateRounds:
+    """Tests for calibrate_rounds function."""
+
+    def test_picks_highest_cost_within_target(self):
+        """Test extrapolation from the calibration cost: 10 ms at 8 rounds means 80 ms at 11 rounds."""
+        with patch("gradioapp.domain.passwords.measure_hash_ms", return_value=10.0):
+            assert calibrate_rounds(target_ms=100) == 11
+            assert calibrate_rounds(target_ms=160) == 12
+
+    def test_clamped_to_bounds(self):
+        """Test that the calibrated cost stays within the minimum and maximum."""
+        with patch("gradioapp.domain.passwords.measure_hash_ms", return_value=10.0):
+            assert calibrate_rounds(target_ms=1) == MIN_ROUNDS
+            assert calibrate_rounds(target_ms=10_000_000) == MAX_ROUNDS
+
+    def test_measure_hash_ms(self):
+        """Test that a real measurement returns a positive duration."""
+        assert measure_hash_ms(CALIBRATION_ROUNDS - 4, samples=1) > 0
@@ -0,0 +1,130 @@
+"""Tests for the login rate limiter."""
+
+import pytest
+
+from gradioapp.domain.rate_limit import (
+    LoginRateLimiter,
+    TokenBucketLimiter,
+    get_login_rate_limiter,
+    initialize_login_rate_limiter,
+)
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Provide a manually advanced clock."""
+    return FakeClock()
+
+
+class TestTokenBucketLimiter:
+    """Tests for TokenBucketLimiter."""
+
+    def test_burst_then_reject(self, clock):
+        """Test that a key gets `burst` attempts and is then rejected with a retry delay."""
+        limiter = TokenBucketLimiter(rate=1.0, burst=3, clock=clock)
+
+        assert [limiter.acquire("1.2.3.4") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("1.2.3.4") == pytest.approx(1.0)
+        assert limiter.acquire("5.6.7.8") == 0.0
+
+    def test_refill(self, clock):
+        """Test that tokens refill at `rate` per second."""
+        limiter = TokenBucketLimiter(rate=2.0, burst=1, clock=clock)
+        limiter.acquire("key")
+        assert limiter.acquire("key") > 0
+
+        clock.now = 0.5
+        assert limiter.acquire("key") == 0.0
+
+    def test_idle_buckets_evicted(self, clock):
+        """Test that buckets idle long enough to be full again are dropped."""
+        limiter = TokenBucketLimiter(rate=1.0, burst=2, shards=1, clock=clock)
+        limiter.acquire("old")
+        clock.now = 1.0
+        limiter.acquire("recent")
+
+        clock.now = 2.5
+        limiter.acquire("new")
+
+        stats = limiter.stats()
+        assert stats["buckets"] == 2
+        assert stats["evicted"] == 1
+
+    def test_memory_bounded(self, clock):
+        """Test that the least recently used bucket is evicted when a shard is full."""
+        limiter = TokenBucketLimiter(rate=0.001, burst=1, max_keys=2, shards=1, clock=clock)
+        limiter.acquire("a")
+        limiter.acquire("b")
+        limiter.acquire("a")
+
+        limiter.acquire("c")
+
+        assert limiter.stats()["buckets"] == 2
+        assert limiter.acquire("a") > 0  # still tracked
+        assert limiter.acquire("b") == 0.0  # evicted, starts with a full bucket
+
+    def test_stats(self, clock):
+        """Test the allowed and rejected counters."""
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=clock)
+        limiter.acquire("key")
+        limiter.acquire("key")
+
+        assert limiter.stats() == {"allowed": 1, "rejected": 1, "evicted": 0, "buckets": 1}
+
+
+class TestLoginRateLimiter:
+    """Tests for LoginRateLimiter."""
+
+    def test_ip_limit(self, clock):
+        """Test that a client IP is throttled across usernames."""
+        limiter = LoginRateLimiter(
+            ip=TokenBucketLimiter(rate=1.0, burst=2, clock=clock),
+            account=TokenBucketLimiter(rate=1.0, burst=10, clock=clock),
+        )
+
+        assert limiter.check("1.2.3.4", "a@test.com") == 0
+        assert limiter.check("1.2.3.4", "b@test.com") == 0
+        assert limiter.check("1.2.3.4", "c@test.com") == 1
+        assert limiter.stats()["ip_rejected"] == 1
+
+    def test_account_limit_normalizes_username(self, clock):
+        """Test that one account is throttled across client IPs, case-insensitively."""
+        limiter = LoginRateLimiter(
+            ip=TokenBucketLimiter(rate=1.0, burst=10, clock=clock),
+            account=TokenBucketLimiter(rate=0.5, burst=1, clock=clock),
+        )
+
+        assert limiter.check("1.1.1.1", "John@Test.com") == 0
+        assert limiter.check("2.2.2.2", " john@test.com ") == 2
+        assert limiter.stats()["account_rejected"] == 1
+
+    def test_throttled_ip_does_not_charge_account(self, clock):
+        """Test that attempts rejected by the IP bucket leave the account bucket untouched."""
+        limiter = LoginRateLimiter(
+            ip=TokenBucketLimiter(rate=1.0, burst=1, clock=clock),
+            account=TokenBucketLimiter(rate=1.0, burst=1, clock=clock),
+        )
+        limiter.check("1.1.1.1", "other@test.com")
+
+        limiter.check("1.1.1.1", "john@test.com")
+
+        assert limiter.check("2.2.2.2", "john@test.com") == 0
+
+    def test_singleton_built_from_settings(self):
+        """Test that the global limiter is created lazily and can be replaced."""
+        initialize_login_rate_limiter(None)
+        limiter = get_login_rate_limiter()
+
+        assert get_login_rate_limiter() is limiter
+        assert limiter.ip.burst == 20
+        initialize_login_rate_limiter(None)
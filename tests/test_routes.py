@@ -1,14 +1,29 @@
 """Tests for route handlers."""
 
 from datetime import timedelta
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 import pytest
 
-from gradioapp.api.routes import health_router, home_router, login_router, static_router
+from gradioapp.api.routes import (
+    health,
+    health_router,
+    home_router,
+    login_router,
+    metrics_router,
+    static_router,
+)
+from gradioapp.core.loop_monitor import LoopLagMonitor, initialize_loop_monitor
 from gradioapp.domain.auth import create_access_token, create_session_token
+from gradioapp.domain.csrf import CSRF_NONCE_COOKIE, CSRF_TOKEN_COOKIE
+from gradioapp.domain.password_pool import PasswordPoolBusyError
+from gradioapp.domain.rate_limit import (
+    LoginRateLimiter,
+    TokenBucketLimiter,
+    initialize_login_rate_limiter,
+)
 from gradioapp.domain.session.backends.memory import InMemorySessionStore
 from gradioapp.domain.session.store import initialize_session_store
 from gradioapp.domain.user import User, authenticate_user, init_user_db
@@ -21,10 +36,19 @@ def app():
     test_app.include_router(health_router)
     test_app.include_router(home_router)
     test_app.include_router(login_router)
+    test_app.include_router(metrics_router)
     test_app.include_router(static_router)
     return test_app
 
 
+@pytest.fixture(autouse=True)
+def login_rate_limiter():
+    """Start every test with a fresh login rate limiter built from the settings."""
+    initialize_login_rate_limiter(None)
+    yield
+    initialize_login_rate_limiter(None)
+
+
 @pytest.fixture
 def session_store():
     """Create a fresh in-memory session store for testing."""
@@ -54,6 +78,152 @@ class TestHealthRoute:
         assert response.status_code == 200
         assert response.json() == {"status": "ok"}
 
+    def test_login_limiter_stats(self, app):
+        """Test that the login limiter counters are exposed."""
+        client = TestClient(app)
+
+        response = client.get("/healthz/login-limiter")
+
+        assert response.status_code == 200
+        assert response.json()["ip_rejected"] == 0
+        assert "account_buckets" in response.json()
+
+
+class TestReadinessRoute:
+    """Tests for the readiness route."""
+
+    @pytest.fixture(autouse=True)
+    def readiness_cache(self):
+        """Start every test without a cached readiness result."""
+        health.get_readiness_cache().clear()
+        yield
+        health.get_readiness_cache().clear()
+
+    @pytest.fixture
+    def gradio_blocks(self, app):
+        """Attach started Gradio Blocks to the app state."""
+        blocks = MagicMock(is_running=True)
+        blocks._queue.stopped = False
+        app.state.gradio_blocks = blocks
+        return blocks
+
+    def test_ready(self, app, session_store, gradio_blocks):
+        """Test that all probes pass and the session probe leaves no session behind."""
+        client = TestClient(app)
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ok"
+        assert set(body["checks"]) == {"session_store", "gradio", "event_loop", "thread_pools"}
+        assert "latency_ms" in body["checks"]["session_store"]
+        assert session_store.count_sessions() == 0
+
+    def test_degraded_above_threshold(self, app, session_store, gradio_blocks):
+        """Test that a probe above its threshold degrades the status but keeps 200."""
+        client = TestClient(app)
+
+        with patch.object(health, "get_settings") as mock_settings:
+            mock_settings.return_value.readyz_session_store_max_ms = -1.0
+            mock_settings.return_value.readyz_loop_lag_max_ms = 100.0
+            mock_settings.return_value.readyz_thread_pool_max_ratio = 0.9
+            response = client.get("/readyz")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["checks"]["session_store"]["status"] == "degraded"
+
+    def test_event_loop_lag_from_monitor(self, app, session_store, gradio_blocks):
+        """Test that the event loop probe reports the lag last measured by the loop monitor."""
+        monitor = LoopLagMonitor()
+        monitor.observe(0.25)
+        initialize_loop_monitor(monitor)
+        try:
+            response = TestClient(app).get("/readyz")
+        finally:
+            initialize_loop_monitor(None)
+
+        assert response.status_code == 200
+        assert response.json()["checks"]["event_loop"] == {"status": "degraded", "lag_ms": 250.0}
+
+    def test_event_loop_without_monitor(self, app, session_store, gradio_blocks):
+        """Test that the event loop probe passes without a lag when the monitor is disabled."""
+        response = TestClient(app).get("/readyz")
+
+        assert response.json()["checks"]["event_loop"] == {"status": "ok", "lag_ms": None}
+
+    def test_readiness_lock_per_app(self):
+        """Test that every app gets its own readiness lock instead of one bound to the first event loop."""
+        first, second = FastAPI(), FastAPI()
+
+        assert health.get_readiness_lock(first) is health.get_readiness_lock(first)
+        assert health.get_readiness_lock(first) is not health.get_readiness_lock(second)
+
+    def test_fail_without_gradio(self, app, session_store):
+        """Test that a missing Gradio app fails readiness with 503."""
+        client = TestClient(app)
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "fail"
+        assert response.json()["checks"]["gradio"]["status"] == "fail"
+
+    def test_fail_when_gradio_queue_stopped(self, app, session_store, gradio_blocks):
+        """Test that a stopped Gradio queue fails readiness."""
+        gradio_blocks._queue.stopped = True
+        client = TestClient(app)
+
+        response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["gradio"]["error"] == "Gradio queue stopped"
+
+    def test_fail_when_session_store_raises(self, app, gradio_blocks):
+        """Test that a failing session store fails readiness."""
+        store = MagicMock()
+        store.create_session.side_effect = ConnectionError("store down")
+        client = TestClient(app)
+
+        with patch.object(health, "get_session_store", return_value=store):
+            response = client.get("/readyz")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["session_store"] == {"status": "fail", "error": "store down"}
+
+    def test_result_is_cached(self, app, session_store, gradio_blocks):
+        """Test that polls within the cache TTL reuse the last result."""
+        client = TestClient(app)
+
+        with patch.object(health, "check_readiness", AsyncMock(return_value={"status": "ok", "checks": {}})) as check:
+            client.get("/readyz")
+            response = client.get("/readyz")
+
+        assert response.status_code == 200
+        check.assert_awaited_once()
+
+
+class TestMetricsRoute:
+    """Tests for the metrics route."""
+
+    def test_metrics(self, app, session_store):
+        """Test that the metrics are served in the Prometheus text format."""
+        session_store.create_session("session_1", "user1", {})
+        client = TestClient(app)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "process_cpu_seconds_total" in response.text
+        assert "sessions_stored 1" in response.text
+        assert 'login_limiter_attempts_total{limiter="ip",result="allowed"}' in response.text
+        assert "# TYPE log_messages_dropped_total counter" in response.text
+        assert "# TYPE log_requests_suppressed_total counter" in response.text
+        assert "# TYPE admission_requests_shed_total counter" in response.text
+
 
 class TestLoginRoute:
     """Tests for login route."""
@@ -66,6 +236,92 @@ class TestLoginRoute:
         assert response.status_code == 200
         assert "text/html" in response.headers["content-type"]
 
+    def test_login_page_issues_csrf_cookies_once(self, app):
+        """Test that the first visit issues the CSRF nonce and later visits reuse it."""
+        client = TestClient(app, base_url="https://testserver")
+
+        first = client.get("/login")
+        second = client.get("/login")
+
+        assert CSRF_NONCE_COOKIE in first.cookies
+        assert CSRF_TOKEN_COOKIE in first.cookies
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert CSRF_NONCE_COOKIE not in second.cookies
+        assert second.headers["cache-control"] == "no-cache"
+
+    def test_login_page_is_static_shell(self, app):
+        """Test that every visitor gets the same body, without a token in it, and a strong ETag."""
+        first = TestClient(app, base_url="https://testserver").get("/login")
+        second = TestClient(app, base_url="https://testserver").get("/login?error=Invalid%20credentials")
+
+        assert first.cookies[CSRF_TOKEN_COOKIE] not in first.text
+        assert first.text == second.text
+        assert first.headers["etag"] == second.headers["etag"]
+        assert not first.headers["etag"].startswith("W/")
+
+    def test_login_page_not_modified(self, app):
+        """Test that a client with a current copy gets an empty 304."""
+        client = TestClient(app, base_url="https://testserver")
+        etag = client.get("/login").headers["etag"]
+
+        response = client.get("/login", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_login_page_gzip(self, app):
+        """Test that the precompressed body is served to clients accepting gzip."""
+        client = TestClient(app)
+
+        compressed = client.get("/login", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/login", headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in identity.headers
+        assert compressed.text == identity.text
+        assert compressed.headers["etag"] != identity.headers["etag"]
+
+    def test_login_with_double_submit_token(self, app, session_store, test_user):
+        """Test the full flow: the token from the login page is accepted and the nonce is rotated."""
+        client = TestClient(app, base_url="https://testserver")
+        page = client.get("/login")
+        token = page.cookies[CSRF_TOKEN_COOKIE]
+
+        response = client.post(
+            "/login",
+            data={"username": "john@test.com", "password": "secret", "csrf_token": token},
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 302
+        assert response.cookies[CSRF_NONCE_COOKIE] != page.cookies[CSRF_NONCE_COOKIE]
+
+    def test_login_rejects_token_without_nonce_cookie(self, app):
+        """Test that a token is useless without the matching nonce cookie (cross-site form post)."""
+        client = TestClient(app, base_url="https://testserver")
+        token = client.get("/login").cookies[CSRF_TOKEN_COOKIE]
+        client.cookies.clear()
+
+        response = client.post(
+            "/login",
+            data={"username": "john@test.com", "password": "secret", "csrf_token": token},
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 303
+        assert response.headers["location"].endswith("/login?error=csrf")
+
+    def test_login_page_maps_error_codes(self, app):
+        """Test that the page maps error codes to fixed messages and posts to the login route."""
+        client = TestClient(app)
+
+        response = client.get("/login?error=csrf")
+
+        assert '"csrf": "Invalid CSRF token"' in response.text
+        assert "Object.hasOwn(messages, error)" in response.text
+        assert 'action="/login"' in response.text
+
     def test_login_page_with_error(self, app):
         """Test that login page displays error message."""
         client = TestClient(app)
@@ -79,9 +335,10 @@ class TestLoginRoute:
         client = TestClient(app)
 
         # Mock CSRF token validation and user authentication
-        with patch("gradioapp.api.routes.login.validate_csrf_token", return_value=True), patch(
-            "gradioapp.api.routes.login.authenticate_user"
-        ) as mock_auth:
+        with (
+            patch("gradioapp.api.routes.login.validate_csrf_token", return_value=True),
+            patch("gradioapp.api.routes.login.authenticate_user") as mock_auth,
+        ):
             # Mock successful authentication
             mock_user = User(username="admin", password_hash="hashed")
             mock_auth.return_value = mock_user
@@ -120,12 +377,57 @@ class TestLoginRoute:
             assert response.status_code == 200
             assert "text/html" in response.headers["content-type"]
 
+    def test_login_password_pool_busy(self, app):
+        """Test that a saturated password pool answers 503 with Retry-After."""
+        client = TestClient(app)
+        busy_pool = MagicMock()
+        busy_pool.run = AsyncMock(side_effect=PasswordPoolBusyError("busy"))
+
+        with (
+            patch("gradioapp.api.routes.login.validate_csrf_token", return_value=True),
+            patch("gradioapp.api.routes.login.get_password_pool", return_value=busy_pool),
+        ):
+            response = client.post(
+                "/login",
+                data={"username": "john@test.com", "password": "secret", "csrf_token": "test_token"},
+            )
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert "Server is busy" in response.text
+        assert "access_token" not in response.cookies
+
+    def test_login_rate_limited(self, app):
+        """Test that throttled attempts get 429 with Retry-After and never reach password verification."""
+        client = TestClient(app)
+        initialize_login_rate_limiter(
+            LoginRateLimiter(
+                ip=TokenBucketLimiter(rate=0.1, burst=1),
+                account=TokenBucketLimiter(rate=0.1, burst=10),
+            )
+        )
+        form = {"username": "john@test.com", "password": "wrong", "csrf_token": "test_token"}
+
+        with (
+            patch("gradioapp.api.routes.login.validate_csrf_token", return_value=True),
+            patch("gradioapp.api.routes.login.authenticate_user", return_value=None) as authenticate,
+        ):
+            first = client.post("/login", data=form)
+            second = client.post("/login", data=form)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert int(second.headers["retry-after"]) >= 1
+        assert "Too many login attempts" in second.text
+        authenticate.assert_called_once()
+
     def test_login_invalid_csrf(self, app):
         """Test login with invalid CSRF token."""
         client = TestClient(app)
 
-        with patch("gradioapp.api.routes.login.validate_csrf_token", return_value=False), patch(
-            "gradioapp.api.routes.login.generate_csrf_token", return_value="test_token"
+        with (
+            patch("gradioapp.api.routes.login.validate_csrf_token", return_value=False),
+            patch("gradioapp.api.routes.login.generate_csrf_token", return_value="test_token"),
         ):
             response = client.post(
                 "/login",
@@ -310,3 +612,13 @@ class TestStaticRoute:
             # If file doesn't exist, endpoint might return 404 or 500
             # This is acceptable for coverage purposes
             assert response.status_code in [200, 404, 500]
+
+    def test_manifest_not_modified(self, app):
+        """Test that the manifest carries a strong ETag and is revalidated with a 304."""
+        client = TestClient(app)
+        etag = client.get("/manifest.json").headers["etag"]
+
+        response = client.get("/manifest.json", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,196 @@
+"""Tests for the server launcher."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from gradioapp.config import load_settings
+from gradioapp.server import PreforkServer, build_config, run_server
+
+# Master with a worker recycled after 2 requests, answering with its process ID
+PREFORK_SCRIPT = textwrap.dedent(
+    """
+    import os
+    import sys
+
+    from gradioapp.server import PreforkServer
+    from uvicorn.config import Config
+
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+    config = Config(app, host="127.0.0.1", port=int(sys.argv[1]), lifespan="off", log_config=None)
+    PreforkServer(config, max_requests=2).run()
+    """
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_pid(port: int, timeout: float = 10.0) -> str:
+    """Requests the worker PID on a new connection, retrying while the workers start or restart."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return httpx.get(f"http://127.0.0.1:{port}/", headers={"Connection": "close"}).text
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+class TestBuildConfig:
+    """Tests for the uvicorn configuration built from the settings."""
+
+    def test_settings_are_applied(self, monkeypatch):
+        """Test that host, port, keep-alive and the loop/HTTP implementations come from the settings."""
+        monkeypatch.setenv("HOST", "127.0.0.1")
+        monkeypatch.setenv("PORT", "9000")
+        monkeypatch.setenv("KEEP_ALIVE", "30")
+        monkeypatch.setenv("SERVER_HTTP", "h11")
+        app = MagicMock()
+
+        config = build_config(app, load_settings())
+
+        assert config.app is app
+        assert (config.host, config.port) == ("127.0.0.1", 9000)
+        assert config.timeout_keep_alive == 30
+        assert config.loop == "auto"
+        assert config.http == "h11"
+        assert config.log_config is None
+
+
+class TestRunServer:
+    """Tests for the choice between reloader, in-process server and prefork worker."""
+
+    @patch("gradioapp.server.uvicorn")
+    def test_reload_uses_import_string(self, mock_uvicorn, monkeypatch):
+        """Test that reload mode runs the reloader on the app import string."""
+        monkeypatch.setenv("RELOAD", "true")
+
+        run_server(MagicMock(), load_settings())
+
+        mock_uvicorn.run.assert_called_once()
+        assert mock_uvicorn.run.call_args[0][0] == "gradioapp.main:app"
+        assert mock_uvicorn.run.call_args[1]["reload"] is True
+
+    @patch("gradioapp.server.PreforkServer")
+    @patch("gradioapp.server.uvicorn")
+    def test_without_recycling_runs_in_process(self, mock_uvicorn, mock_prefork, monkeypatch):
+        """Test that the app is served by the current process when the worker is not recycled."""
+        monkeypatch.delenv("MAX_REQUESTS", raising=False)
+
+        run_server(MagicMock(), load_settings())
+
+        mock_uvicorn.Server.return_value.run.assert_called_once_with()
+        mock_prefork.assert_not_called()
+
+    @patch("gradioapp.server.PreforkServer")
+    @patch("gradioapp.server.uvicorn")
+    def test_prefork(self, mock_uvicorn, mock_prefork, monkeypatch):
+        """Test that worker recycling uses the prefork server."""
+        monkeypatch.setenv("MAX_REQUESTS", "1000")
+        monkeypatch.setenv("MAX_REQUESTS_JITTER", "50")
+
+        run_server(MagicMock(), load_settings())
+
+        mock_prefork.assert_called_once()
+        assert mock_prefork.call_args[0][1:] == (1000, 50)
+        mock_prefork.return_value.run.assert_called_once_with()
+        mock_uvicorn.Server.assert_not_called()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Prefork workers require fork()")
+class TestPreforkServer:
+    """Tests for the prefork server, run in a subprocess."""
+
+    def test_worker_is_recycled_and_stopped(self):
+        """Test that the worker is replaced after its request limit and stops on SIGTERM."""
+        port = _free_port()
+        master = subprocess.Popen([sys.executable, "-c", PREFORK_SCRIPT, str(port)])
+        try:
+            pids = {_get_pid(port) for _ in range(12)}
+
+            # The worker stops soon after its 2 requests (uvicorn checks the limit periodically) and is replaced
+            assert len(pids) > 1
+            assert str(master.pid) not in pids
+
+            master.send_signal(signal.SIGTERM)
+            assert master.wait(timeout=10) == 0
+        finally:
+            master.kill()
+            master.wait()
+
+    def test_worker_exits_when_master_dies(self):
+        """Test that the worker does not outlive a killed master."""
+        port = _free_port()
+        master = subprocess.Popen([sys.executable, "-c", PREFORK_SCRIPT, str(port)])
+        try:
+            worker_pid = int(_get_pid(port))
+        finally:
+            master.kill()
+            master.wait()
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                os.kill(worker_pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("Worker still running after the master was killed")
+
+    def test_fork_restarts_session_cleanup_thread(self):
+        """Test that a forked in-memory session store gets a working cleanup thread and lock."""
+        code = textwrap.dedent(
+            """
+            import os
+            from gradioapp.domain.session.backends.memory import InMemorySessionStore
+
+            store = InMemorySessionStore(ttl=300, cleanup_interval=60)
+            pid = os.fork()
+            if pid == 0:
+                ok = store._cleanup_thread.is_alive() and store.create_session("s", "u", {}) is not None
+                os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+            raise SystemExit(os.waitstatus_to_exitcode(status))
+            """
+        )
+
+        assert subprocess.run([sys.executable, "-c", code], timeout=30, check=False).returncode == 0
+
+
+class TestPreforkServerSignals:
+    """Tests for the signal forwarding of the prefork master."""
+
+    @patch("gradioapp.server.os.kill")
+    def test_first_signal_terminates_second_forces(self, mock_kill):
+        """Test that the worker gets SIGTERM first and SIGINT (forced exit) on a repeated signal."""
+        server = PreforkServer(MagicMock())
+        server._children = {101: 0.0}
+
+        server._handle_exit(signal.SIGINT, None)
+        server._handle_exit(signal.SIGINT, None)
+
+        assert [call.args for call in mock_kill.call_args_list] == [
+            (101, signal.SIGTERM),
+            (101, signal.SIGINT),
+        ]
@@ -7,7 +7,13 @@ import gradio as gr
 import pytest
 
 from gradioapp.domain.session.backends.memory import InMemorySessionStore
-from gradioapp.domain.session.helpers import get_session, get_session_id
+from gradioapp.domain.session.helpers import (
+    get_request_session,
+    get_session,
+    get_session_id,
+    set_session_value,
+)
+from gradioapp.domain.session.scoped import RequestSession
 from gradioapp.domain.session.store import initialize_session_store
 from gradioapp.domain.session.types import SessionData
 
@@ -173,3 +179,63 @@ class TestGetSession:
         # or might be None if cleanup ran. Both are valid behaviors.
         # We'll just verify the function doesn't crash
         assert result is None or isinstance(result, dict)
+
+
+class TestRequestScopedSession:
+    """Tests for helpers reading and writing the request-scoped session."""
+
+    @pytest.fixture
+    def session_store(self):
+        """Create a fresh in-memory session store for testing."""
+        store = InMemorySessionStore(ttl=300, cleanup_interval=1)
+        initialize_session_store(store)
+        yield store
+        store.stop_cleanup_thread()
+
+    def test_get_request_session_ignores_non_session_state(self):
+        """Test that arbitrary state attributes are not mistaken for a request session."""
+        mock_request = MagicMock()
+
+        assert get_request_session(mock_request) is None
+
+    def test_get_session_reuses_request_session(self, session_store):
+        """Test that get_session returns the resolved session without a store lookup."""
+        session = session_store.create_session(session_id="session_1", username="user1", data={})
+        mock_request = MagicMock(spec=Request)
+        mock_request.state.session_id = "session_1"
+        mock_request.state.session = RequestSession("session_1", session)
+
+        with patch.object(session_store, "get_session") as mock_get_session:
+            result = get_session(mock_request)
+
+        assert result is session
+        mock_get_session.assert_not_called()
+
+    def test_set_session_value_deferred(self, session_store):
+        """Test that set_session_value marks the request session dirty without writing."""
+        session = session_store.create_session(session_id="session_1", username="user1", data={})
+        request_session = RequestSession("session_1", dict(session, data={}))
+        mock_request = MagicMock(spec=Request)
+        mock_request.state.session = request_session
+
+        assert set_session_value(mock_request, "key", "value") is True
+
+        assert request_session.dirty is True
+        assert session_store.get_session("session_1")["data"] == {}
+
+    def test_set_session_value_without_request_session(self, session_store):
+        """Test that set_session_value writes to the store when no request session exists."""
+        session_store.create_session(session_id="session_1", username="user1", data={"a": 1})
+        mock_request = MagicMock()
+        mock_request.state.session_id = "session_1"
+
+        assert set_session_value(mock_request, "b", 2) is True
+
+        assert session_store.get_session("session_1")["data"] == {"a": 1, "b": 2}
+
+    def test_set_session_value_missing_session(self, session_store):
+        """Test that set_session_value fails for unknown sessions."""
+        mock_request = MagicMock()
+        mock_request.state.session_id = "missing"
+
+        assert set_session_value(mock_request, "b", 2) is False
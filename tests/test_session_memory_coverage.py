@@ -17,6 +17,14 @@ class TestInMemorySessionStoreCoverage:
         yield store
         store.stop_cleanup_thread()
 
+    def test_count_sessions(self, session_store):
+        """Test counting the stored sessions."""
+        session_store.create_session("session_1", "user1", {})
+        session_store.create_session("session_2", "user2", {})
+        session_store.delete_session("session_1")
+
+        assert session_store.count_sessions() == 1
+
     def test_dump_session_nonexistent(self, session_store):
         """Test dumping a nonexistent session returns empty string."""
         dumped = session_store.dump_session("nonexistent_session")
@@ -80,3 +88,31 @@ class TestInMemorySessionStoreCoverage:
         assert session_store.get_session(session_id1) is None
         # Valid session should still exist
         assert session_store.get_session(session_id2) is not None
+
+    def test_update_session(self, session_store):
+        """Test that update_session replaces the data of an existing session."""
+        session_store.create_session("session_1", "user1", {"old": 1})
+
+        session_store.update_session("session_1", {"new": 2})
+
+        assert session_store.get_session("session_1")["data"] == {"new": 2}
+
+    def test_update_session_missing(self, session_store):
+        """Test that update_session does not recreate missing sessions."""
+        session_store.update_session("missing", {"new": 2})
+
+        assert session_store.get_session("missing") is None
+
+    def test_merge_session(self, session_store):
+        """Test that merge_session sets and removes keys and keeps the others."""
+        session_store.create_session("session_1", "user1", {"keep": 1, "old": 2, "gone": 3})
+
+        session_store.merge_session("session_1", {"old": 20, "new": 4}, ["gone", "missing"])
+
+        assert session_store.get_session("session_1")["data"] == {"keep": 1, "old": 20, "new": 4}
+
+    def test_merge_session_missing(self, session_store):
+        """Test that merge_session does not recreate missing sessions."""
+        session_store.merge_session("missing", {"new": 2}, ())
+
+        assert session_store.get_session("missing") is None
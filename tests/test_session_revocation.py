@@ -0,0 +1,59 @@
+"""Tests for the session revocation hub."""
+
+from unittest.mock import MagicMock
+
+from gradioapp.domain.session.revocation import SessionRevocationHub, get_revocation_hub
+
+
+class TestSessionRevocationHub:
+    """Tests for SessionRevocationHub."""
+
+    def test_revoke_notifies_listeners(self):
+        """Test that revoke calls every listener of the session."""
+        hub = SessionRevocationHub()
+        first = MagicMock()
+        second = MagicMock()
+        hub.subscribe("session_1", first)
+        hub.subscribe("session_1", second)
+
+        notified = hub.revoke("session_1")
+
+        assert notified == 2
+        first.assert_called_once_with()
+        second.assert_called_once_with()
+
+    def test_revoke_only_targets_given_session(self):
+        """Test that listeners of other sessions are not notified."""
+        hub = SessionRevocationHub()
+        listener = MagicMock()
+        hub.subscribe("session_2", listener)
+
+        assert hub.revoke("session_1") == 0
+        listener.assert_not_called()
+
+    def test_revoke_removes_listeners(self):
+        """Test that listeners are notified at most once."""
+        hub = SessionRevocationHub()
+        listener = MagicMock()
+        hub.subscribe("session_1", listener)
+
+        hub.revoke("session_1")
+        hub.revoke("session_1")
+
+        listener.assert_called_once_with()
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed listeners are not notified and unknown ones are ignored."""
+        hub = SessionRevocationHub()
+        listener = MagicMock()
+        hub.subscribe("session_1", listener)
+
+        hub.unsubscribe("session_1", listener)
+        hub.unsubscribe("unknown", listener)
+
+        assert hub.revoke("session_1") == 0
+        listener.assert_not_called()
+
+    def test_get_revocation_hub_singleton(self):
+        """Test that get_revocation_hub returns the same instance."""
+        assert get_revocation_hub() is get_revocation_hub()
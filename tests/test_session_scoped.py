@@ -0,0 +1,98 @@
+"""Tests for request-scoped sessions."""
+
+import pytest
+
+from gradioapp.domain.session.backends.memory import InMemorySessionStore
+from gradioapp.domain.session.scoped import RequestSession
+from gradioapp.domain.session.store import initialize_session_store
+
+
+@pytest.fixture
+def session_store():
+    """Create a fresh in-memory session store for testing."""
+    store = InMemorySessionStore(ttl=300, cleanup_interval=1)
+    initialize_session_store(store)
+    yield store
+    store.stop_cleanup_thread()
+
+
+@pytest.fixture
+def request_session(session_store):
+    """Create a request-scoped session backed by the store."""
+    session = session_store.create_session(session_id="session_1", username="user1", data={"key": "value"})
+    return RequestSession("session_1", session)
+
+
+class TestRequestSession:
+    """Tests for RequestSession."""
+
+    def test_get(self, request_session):
+        """Test reading values from session data."""
+        assert request_session.get("key") == "value"
+        assert request_session.get("missing", "default") == "default"
+
+    def test_set_is_deferred_until_close(self, session_store):
+        """Test that writes are only flushed to the store on close."""
+        session_store.create_session(session_id="session_1", username="user1", data={})
+        request_session = RequestSession("session_1", session_store.get_session("session_1"))
+
+        request_session.set("counter", 1)
+
+        assert request_session.dirty is True
+        assert session_store.get_session("session_1")["data"] == {}
+
+        request_session.close()
+
+        assert request_session.dirty is False
+        assert session_store.get_session("session_1")["data"] == {"counter": 1}
+
+    def test_flush_without_writes_skips_store(self, request_session, session_store, monkeypatch):
+        """Test that a clean session does not write to the store."""
+        calls = []
+        monkeypatch.setattr(session_store, "merge_session", lambda *args: calls.append(args))
+
+        request_session.close()
+
+        assert not calls
+
+    def test_flush_keeps_concurrent_writes(self, session_store):
+        """Test that flushing only merges this request's keys over writes made meanwhile."""
+        session_store.create_session(session_id="session_1", username="user1", data={"a": 1, "b": 2})
+        request_session = RequestSession("session_1", session_store.get_session("session_1"))
+        request_session.set("a", 10)
+        request_session.delete("b")
+
+        session_store.merge_session("session_1", {"queued": True}, ())
+        request_session.close()
+
+        assert session_store.get_session("session_1")["data"] == {"a": 10, "queued": True}
+
+    def test_set_after_delete_restores_key(self, request_session, session_store):
+        """Test that setting a deleted key writes it instead of removing it."""
+        request_session.delete("key")
+        request_session.set("key", "new")
+
+        request_session.close()
+
+        assert session_store.get_session("session_1")["data"] == {"key": "new"}
+
+    def test_delete(self, request_session):
+        """Test that deleting an existing key marks the session dirty and missing keys are ignored."""
+        request_session.delete("missing")
+        assert request_session.dirty is False
+
+        request_session.delete("key")
+
+        assert request_session.dirty is True
+        assert request_session.get("key") is None
+
+    def test_write_after_close_is_written_through(self, session_store):
+        """Test that writes after the request finished go straight to the store."""
+        session_store.create_session(session_id="session_1", username="user1", data={})
+        request_session = RequestSession("session_1", session_store.get_session("session_1"))
+        request_session.close()
+
+        request_session.set("late", True)
+
+        assert request_session.dirty is False
+        assert session_store.get_session("session_1")["data"] == {"late": True}
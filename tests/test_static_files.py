@@ -0,0 +1,129 @@
+"""Tests for the in-memory static files."""
+
+import gzip
+import os
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from gradioapp.core import http_cache
+from gradioapp.core.static_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CachedStaticFiles,
+    SendfileResponse,
+    is_fingerprinted,
+)
+
+APP_JS = b"console.log('app');\n" * 100
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Create a static directory with a small, a fingerprinted and a large file."""
+    (tmp_path / "app.js").write_bytes(APP_JS)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-0123abcd.js").write_bytes(APP_JS)
+    (tmp_path / "large.bin").write_bytes(os.urandom(4096))
+    return tmp_path
+
+
+@pytest.fixture
+def static_files(static_dir):
+    """Create CachedStaticFiles keeping files up to 3 KiB in memory."""
+    return CachedStaticFiles(directory=static_dir, max_cached_size=3 * 1024)
+
+
+@pytest.fixture
+def client(static_files):
+    """Create a test client with the static files mounted at /static."""
+    return TestClient(Starlette(routes=[Mount("/static", app=static_files)]))
+
+
+class TestIsFingerprinted:
+    """Tests for is_fingerprinted."""
+
+    def test_is_fingerprinted(self):
+        """Test hashed and plain file names."""
+        assert is_fingerprinted("index-0123abcd.js")
+        assert is_fingerprinted("assets/style.89abcdef01.css")
+        assert not is_fingerprinted("manifest.json")
+        assert not is_fingerprinted("login-template.css")
+        assert not is_fingerprinted("report-20240101.js")
+        assert not is_fingerprinted("archive.123456789.js")
+
+
+class TestCachedStaticFiles:
+    """Tests for CachedStaticFiles."""
+
+    def test_loads_small_files_only(self, static_files):
+        """Test that small files are cached and large files are left on disk."""
+        assert set(static_files._cache) == {"app.js", os.path.join("assets", "index-0123abcd.js")}
+
+    def test_serves_cached_file_compressed(self, client):
+        """Test that a cached file is served precompressed with a strong ETag."""
+        response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.content == APP_JS
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+        assert response.headers["etag"] == http_cache.make_etag(gzip.compress(APP_JS, 9, mtime=0))
+
+    @pytest.mark.skipif(http_cache.brotli is None, reason="brotli is not installed")
+    def test_prefers_brotli(self, client):
+        """Test that brotli is chosen over gzip when both are accepted."""
+        response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+
+    def test_cached_file_not_modified(self, client):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = client.get("/static/app.js").headers["etag"]
+
+        response = client.get("/static/app.js", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_fingerprinted_file_is_immutable(self, client):
+        """Test the long-lived cache header on hashed file names."""
+        response = client.get("/static/assets/index-0123abcd.js")
+
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    def test_large_file_served_from_disk(self, client, static_dir):
+        """Test that uncached files fall back to the disk path with its own validators."""
+        response = client.get("/static/large.bin")
+
+        assert response.status_code == 200
+        assert response.content == (static_dir / "large.bin").read_bytes()
+        not_modified = client.get("/static/large.bin", headers={"If-None-Match": response.headers["etag"]})
+        assert not_modified.status_code == 304
+
+    def test_missing_file_and_method(self, client):
+        """Test that StaticFiles errors are preserved."""
+        assert client.get("/static/missing.js").status_code == 404
+        assert client.post("/static/app.js").status_code == 405
+
+
+class TestSendfileResponse:
+    """Tests for SendfileResponse."""
+
+    @pytest.mark.asyncio
+    async def test_uses_pathsend_extension(self, static_dir):
+        """Test that the path is handed to servers supporting http.response.pathsend."""
+        path = static_dir / "large.bin"
+        response = SendfileResponse(path, stat_result=os.stat(path))
+        scope = {"type": "http", "method": "GET", "headers": [], "extensions": {"http.response.pathsend": {}}}
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await response(scope, None, send)
+
+        assert messages[0]["type"] == "http.response.start"
+        assert messages[1] == {"type": "http.response.pathsend", "path": str(path)}
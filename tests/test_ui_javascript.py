@@ -18,6 +18,12 @@ class TestRedirectJS:
         assert "window.fetch" in redirect_js
         assert "originalFetch" in redirect_js
 
+    def test_redirect_js_adds_csrf_header(self):
+        """Test that redirect_js sends the csrf_token cookie as X-CSRF-Token on unsafe requests."""
+        assert "csrf_token=" in redirect_js
+        assert 'headers.set("X-CSRF-Token", csrfToken)' in redirect_js
+        assert 'method !== "GET"' in redirect_js
+
     def test_redirect_js_handles_401(self):
         """Test that redirect_js handles 401 responses."""
         assert "401" in redirect_js
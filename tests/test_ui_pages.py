@@ -5,6 +5,12 @@ from unittest.mock import MagicMock, patch
 import gradio as gr
 import pytest
 
+from gradioapp.api.middleware.admission import (
+    OTHER,
+    AdmissionController,
+    get_admission_controller,
+    initialize_admission_controller,
+)
 from gradioapp.domain.session.backends.memory import InMemorySessionStore
 from gradioapp.domain.session.store import initialize_session_store
 from gradioapp.ui.pages.home_page import HomePage, Tab1, Tab2
@@ -122,6 +128,16 @@ class TestTab2:
         assert "user1" in result
         assert "user2" in result
 
+    def test_tab2_dump_sessions_shed_when_overloaded(self, session_store):
+        """Test that the session dump is refused while the admission controller sheds low-priority work."""
+        initialize_admission_controller(AdmissionController(max_in_flight=1))
+        try:
+            get_admission_controller().enter(OTHER)
+            with pytest.raises(gr.Error, match="Server is busy"):
+                Tab2().dump_sessions()
+        finally:
+            initialize_admission_controller(None)
+
 
 class TestHomePage:
     """Tests for HomePage component."""
@@ -1,10 +1,18 @@
+import json
+from unittest.mock import patch
+
 import pytest
 
+from gradioapp.config import load_settings
+from gradioapp.domain.passwords import get_rounds, hash_password
 from gradioapp.domain.user import (
+    DEFAULT_USERS_FILE,
+    InMemoryUserRepository,
     User,
     authenticate_user,
-    hash_password,
+    get_target_rounds,
     init_user_db,
+    initialize_user_repository,
 )
 
 
@@ -84,3 +92,118 @@ class TestAuthenticateUser:
         user = authenticate_user("nonexistent@test.com", "secret")
 
         assert user is None
+
+
+class TestUserDatabase:
+    """Tests for loading users from the credentials file."""
+
+    def test_bundled_users_file(self):
+        """Test that the bundled credentials file contains the sample users."""
+        repository = InMemoryUserRepository.from_file(DEFAULT_USERS_FILE)
+
+        assert set(repository.usernames()) == {"john@test.com", "jane@test.com"}
+
+    def test_user_db_loaded_lazily(self, monkeypatch):
+        """Test that the repository is created on the first authentication, not at import."""
+        monkeypatch.setattr("gradioapp.domain.user.repository._user_repository", None)
+
+        user = authenticate_user("jane@test.com", "secret")
+
+        assert user is not None
+        assert user.username == "jane@test.com"
+
+    def test_users_file_setting(self, tmp_path, monkeypatch):
+        """Test that USERS_FILE replaces the bundled credentials file."""
+        users_file = tmp_path / "users.json"
+        users_file.write_text(json.dumps({"bob@test.com": hash_password("pw")}))
+        monkeypatch.setenv("USERS_FILE", str(users_file))
+        monkeypatch.setattr("gradioapp.domain.user.helpers.get_settings", load_settings)
+
+        init_user_db()
+        try:
+            assert authenticate_user("bob@test.com", "pw") is not None
+            assert authenticate_user("john@test.com", "secret") is None
+        finally:
+            initialize_user_repository(None)
+
+    def test_authenticate_user_uses_repository(self):
+        """Test that authenticate_user looks users up in the configured repository."""
+        repository = InMemoryUserRepository({"carol@test.com": User("carol@test.com", hash_password("pw"))})
+        initialize_user_repository(repository)
+        try:
+            assert authenticate_user("carol@test.com", "pw") is repository.get_user("carol@test.com")
+        finally:
+            initialize_user_repository(None)
+
+
+class TestRehashOnLogin:
+    """Tests for rehashing passwords to the target cost on login."""
+
+    def test_rehash_when_cost_is_lower(self, monkeypatch):
+        """Test that a successful login replaces a hash with a lower cost."""
+        repository = InMemoryUserRepository({"carol@test.com": User("carol@test.com", hash_password("pw", rounds=4))})
+        initialize_user_repository(repository)
+        monkeypatch.setattr("gradioapp.domain.user.helpers._target_rounds", 5)
+        try:
+            user = authenticate_user("carol@test.com", "pw")
+
+            assert get_rounds(user.password_hash) == 5
+            assert repository.get_user("carol@test.com") is user
+            assert authenticate_user("carol@test.com", "pw") is user
+        finally:
+            initialize_user_repository(None)
+
+    def test_no_rehash_when_cost_is_higher(self, monkeypatch):
+        """Test that a hash with a higher cost than the target is not downgraded."""
+        original = User("carol@test.com", hash_password("pw", rounds=5))
+        repository = InMemoryUserRepository({"carol@test.com": original})
+        initialize_user_repository(repository)
+        monkeypatch.setattr("gradioapp.domain.user.helpers._target_rounds", 4)
+        try:
+            assert authenticate_user("carol@test.com", "pw") is original
+            assert repository.get_user("carol@test.com") is original
+        finally:
+            initialize_user_repository(None)
+
+    def test_no_rehash_on_wrong_password(self, monkeypatch):
+        """Test that a failed login leaves the stored hash untouched."""
+        original = User("carol@test.com", hash_password("pw", rounds=5))
+        repository = InMemoryUserRepository({"carol@test.com": original})
+        initialize_user_repository(repository)
+        monkeypatch.setattr("gradioapp.domain.user.helpers._target_rounds", 4)
+        try:
+            assert authenticate_user("carol@test.com", "wrong") is None
+            assert repository.get_user("carol@test.com") is original
+        finally:
+            initialize_user_repository(None)
+
+    def test_target_rounds_from_settings(self, monkeypatch):
+        """Test that BCRYPT_ROUNDS is used instead of calibrating."""
+        monkeypatch.setenv("BCRYPT_ROUNDS", "9")
+        monkeypatch.setattr("gradioapp.domain.user.helpers.get_settings", load_settings)
+        monkeypatch.setattr("gradioapp.domain.user.helpers._target_rounds", None)
+
+        with patch("gradioapp.domain.user.helpers.calibrate_rounds") as calibrate:
+            assert get_target_rounds() == 9
+        calibrate.assert_not_called()
+
+    def test_target_rounds_calibrated_once(self, monkeypatch):
+        """Test that the cost is calibrated on first use and then reused."""
+        monkeypatch.setattr("gradioapp.domain.user.helpers._target_rounds", None)
+
+        with patch("gradioapp.domain.user.helpers.calibrate_rounds", return_value=11) as calibrate:
+            assert get_target_rounds() == 11
+            assert get_target_rounds() == 11
+        calibrate.assert_called_once_with(250.0)
+
+
+class TestUserSlots:
+    """Tests for the User memory layout."""
+
+    def test_user_has_no_instance_dict(self):
+        """Test that User uses __slots__ instead of a per-instance __dict__."""
+        user = User(username="test_user", password_hash="hash")
+
+        assert not hasattr(user, "__dict__")
+        with pytest.raises(AttributeError):
+            user.role = "admin"
@@ -0,0 +1,149 @@
+"""Tests for the user repository backends."""
+
+from dataclasses import replace
+import sqlite3
+
+import pytest
+
+from gradioapp.config import load_settings
+from gradioapp.domain.user import (
+    InMemoryUserRepository,
+    SQLiteUserRepository,
+    User,
+    create_user_repository,
+    get_user_repository,
+    initialize_user_repository,
+)
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path):
+    """Create a SQLite user repository in a temporary directory."""
+    repository = SQLiteUserRepository(tmp_path / "users.db", cache_size=4, cache_ttl=60)
+    yield repository
+    repository.close()
+
+
+class TestInMemoryUserRepository:
+    """Tests for InMemoryUserRepository."""
+
+    def test_add_and_get_user(self):
+        """Test that added users can be looked up by username."""
+        repository = InMemoryUserRepository()
+        user = User("alice@test.com", "hash")
+
+        repository.add_user(user)
+
+        assert repository.get_user("alice@test.com") is user
+        assert repository.get_user("bob@test.com") is None
+        assert repository.count_users() == 1
+
+    def test_from_credentials(self):
+        """Test building the repository from a username to hash mapping."""
+        repository = InMemoryUserRepository.from_credentials({"alice@test.com": "hash"})
+
+        assert repository.get_user("alice@test.com").password_hash == "hash"
+        assert repository.usernames() == ["alice@test.com"]
+
+
+class TestSQLiteUserRepository:
+    """Tests for SQLiteUserRepository."""
+
+    def test_add_and_get_user(self, sqlite_repository):
+        """Test that stored users are loaded from the database."""
+        sqlite_repository.add_user(User("alice@test.com", "hash"))
+
+        user = sqlite_repository.get_user("alice@test.com")
+
+        assert user.username == "alice@test.com"
+        assert user.password_hash == "hash"
+        assert sqlite_repository.get_user("bob@test.com") is None
+        assert sqlite_repository.count_users() == 1
+
+    def test_username_is_unique(self, sqlite_repository):
+        """Test that adding an existing username replaces its hash instead of adding a row."""
+        sqlite_repository.add_users([User("alice@test.com", "old"), User("bob@test.com", "hash")])
+        sqlite_repository.get_user("alice@test.com")
+
+        sqlite_repository.add_user(User("alice@test.com", "new"))
+
+        assert sqlite_repository.count_users() == 2
+        assert sqlite_repository.get_user("alice@test.com").password_hash == "new"
+
+    def test_unique_index_exists(self, tmp_path, sqlite_repository):
+        """Test that the username column has a unique index."""
+        connection = sqlite3.connect(tmp_path / "users.db")
+        try:
+            indexes = connection.execute("PRAGMA index_list(users)").fetchall()
+        finally:
+            connection.close()
+
+        assert any(index[1] == "users_username_idx" and index[2] == 1 for index in indexes)
+
+    def test_lookups_are_cached(self, tmp_path, sqlite_repository):
+        """Test that repeated lookups, including misses, do not query the database again."""
+        sqlite_repository.add_user(User("alice@test.com", "hash"))
+        first = sqlite_repository.get_user("alice@test.com")
+        assert sqlite_repository.get_user("ghost@test.com") is None
+
+        # Change the rows behind the repository's back; cached results must still be served
+        connection = sqlite3.connect(tmp_path / "users.db")
+        with connection:
+            connection.execute("UPDATE users SET password_hash = 'changed'")
+            connection.execute("INSERT INTO users (username, password_hash) VALUES ('ghost@test.com', 'x')")
+        connection.close()
+
+        assert sqlite_repository.get_user("alice@test.com") is first
+        assert sqlite_repository.get_user("ghost@test.com") is None
+
+    def test_misses_do_not_evict_users(self, sqlite_repository):
+        """Test that looking up many unknown usernames keeps loaded users cached."""
+        sqlite_repository.add_user(User("alice@test.com", "hash"))
+        first = sqlite_repository.get_user("alice@test.com")
+
+        for index in range(10):
+            assert sqlite_repository.get_user(f"ghost{index}@test.com") is None
+
+        assert sqlite_repository.get_user("alice@test.com") is first
+
+    def test_added_user_replaces_cached_miss(self, sqlite_repository):
+        """Test that a user added through the repository is found after a cached miss."""
+        assert sqlite_repository.get_user("alice@test.com") is None
+
+        sqlite_repository.add_user(User("alice@test.com", "hash"))
+
+        assert sqlite_repository.get_user("alice@test.com").password_hash == "hash"
+
+
+class TestCreateUserRepository:
+    """Tests for the user repository factory and singleton."""
+
+    def test_memory_backend_loads_bundled_users(self):
+        """Test that the default backend serves the bundled sample users."""
+        repository = create_user_repository(load_settings())
+
+        assert isinstance(repository, InMemoryUserRepository)
+        assert repository.get_user("john@test.com") is not None
+
+    def test_sqlite_backend(self, tmp_path):
+        """Test that USER_BACKEND=sqlite opens the configured database."""
+        settings = replace(load_settings(), user_backend="sqlite", user_db_path=str(tmp_path / "users.db"))
+
+        repository = create_user_repository(settings)
+
+        assert isinstance(repository, SQLiteUserRepository)
+        repository.close()
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown user backend"):
+            create_user_repository(replace(load_settings(), user_backend="ldap"))
+
+    def test_initialize_user_repository(self):
+        """Test that the initialized repository is returned by get_user_repository."""
+        repository = InMemoryUserRepository()
+        initialize_user_repository(repository)
+        try:
+            assert get_user_repository() is repository
+        finally:
+            initialize_user_repository(None)